@@ -0,0 +1,160 @@
+import itertools
+from urllib import parse
+
+import numpy as np
+import pandas as pd
+
+from yt_scraper.cleaning import (indian_units, PHONE_NUMBER_PATTERN,
+                                 clean_text_from_number, parse_link)
+
+
+# A count without its last word ('subscribers', 'views', ...), e.g. '1,234',
+# '34.7k', '1.2m' or '1.5 lakh'. Any other text is cleaned row by row.
+COUNT_PATTERN = (r'^(?P<number>[0-9][0-9,]*(?:\.[0-9]+)?|\.[0-9]+)'
+                 r'(?P<suffix>[km])?(?: (?P<unit>lakh|crore))?$')
+
+# The 'q' parameter of a redirect link's query.
+REDIRECT_PATTERN = r'^[^#?]*\?(?:[^#]*?&)??q=(?P<q>[^&#]+)'
+
+# Links that urlparse would normalize (spaces, tabs, controls) or reject
+# (brackets), and encoded parameter names, are parsed row by row.
+UNSAFE_LINK_PATTERN = r'[\x00-\x20\x7f\[\]]|%71|%51'
+
+SUFFIX_UNITS = {'k': 1_000, 'm': 1_000_000}
+
+
+def distinct_values(column: pd.Series):
+    """
+    The code of each value of the column, and the distinct values (as a
+    series), so that each distinct value is cleaned only once.
+    """
+    codes, uniques = pd.factorize(column.fillna(''))
+    return codes, pd.Series(np.asarray(uniques, dtype=object), dtype=object)
+
+
+def clean_counts(text_numbers: pd.Series, _for='subscribers') -> np.ndarray:
+    """
+    clean_text_from_number over a whole column.
+    """
+    codes, text_numbers = distinct_values(text_numbers)
+    # Lower, drop the last word and join the others with single spaces.
+    body = (text_numbers.str.lower()
+                        .str.replace(r'\s+', ' ', regex=True)
+                        .str.strip()
+                        .str.replace(r' ?\S+$', '', regex=True))
+    parts = body.str.extract(COUNT_PATTERN)
+    matched = parts['number'].notna()
+
+    cleaned = pd.Series('', index=text_numbers.index, dtype=object)
+    if matched.any():
+        numbers = (parts.loc[matched, 'number'].str.replace(',', '')
+                                               .astype(object).to_numpy()
+                                               # float(), as the row path.
+                                               .astype(float))
+        units = (parts.loc[matched, 'unit'].map(indian_units)
+                                           .fillna(1).to_numpy())
+        suffixes = parts.loc[matched, 'suffix'].map(SUFFIX_UNITS).to_numpy()
+        units = np.where(pd.notna(suffixes), suffixes, units).astype(float)
+        cleaned[matched] = (numbers * units).astype(np.int64).tolist()
+
+    # The other texts (no, malformed, ...) are cleaned row by row.
+    others = ~matched & (text_numbers != '')
+    if others.any():
+        cleaned[others] = [clean_text_from_number(text_number, _for)
+                           for text_number in text_numbers[others]]
+    return cleaned.to_numpy().take(codes)
+
+
+def split_links(links: pd.Series) -> tuple[list, list, list]:
+    """
+    extract_links over a whole column of links lists. Return the telegram,
+    instagram and other links lists of each row.
+    """
+    links_lists = [value if isinstance(value, list) else []
+                   for value in links]
+    positions = np.repeat(np.arange(len(links_lists)),
+                          [len(links_list) for links_list in links_lists])
+    codes, distinct_links = distinct_values(
+        pd.Series(list(itertools.chain.from_iterable(links_lists)),
+                  dtype=object))
+
+    # The redirect links hold their target in the 'q' parameter.
+    targets = distinct_links.str.extract(REDIRECT_PATTERN)['q']
+    parsed = distinct_links.where(
+        targets.isna(), targets.map(parse.unquote_plus, na_action='ignore'))
+    unsafe = distinct_links.str.contains(UNSAFE_LINK_PATTERN, case=False,
+                                         regex=True)
+    if unsafe.any():
+        parsed[unsafe] = distinct_links[unsafe].map(parse_link)
+
+    # 0: telegram, 1: instagram, 2: other.
+    categories = np.where(parsed.str.contains('t.me', regex=False), 0,
+                          np.where(parsed.str.contains('instagram.com',
+                                                       regex=False), 1, 2))
+
+    found_links = tuple([[] for _ in links_lists] for _ in range(3))
+    for position, category, parsed_link in zip(positions,
+                                               categories.take(codes),
+                                               parsed.to_numpy().take(codes)):
+        found_links[category][position].append(parsed_link)
+    return found_links
+
+
+def clean_channels(scrapped_channels: dict, gazetteer,
+                   items_separator='\n') -> dict:
+    """
+    Clean all the scrapped channels at once, column by column. Return the
+    cleaned fields of each channel (chid -> fields), identical to the ones
+    of Scrapper.clean_scrapped_channels row by row.
+    """
+    if not scrapped_channels:
+        return {}
+    frame = pd.DataFrame(
+        {field: pd.Series([channel_data.get(field)
+                           for channel_data in scrapped_channels.values()],
+                          dtype=object)
+         for field in ['description', 'subscriber_count', 'other_links',
+                       'videos_count', 'total_views']})
+
+    # Each distinct description is scanned once.
+    codes, descriptions = distinct_values(frame['description'])
+    phone_numbers = descriptions.str.findall(PHONE_NUMBER_PATTERN).map(
+        lambda phones: list({phone.replace(' ', '') for phone in phones}))
+    geography = descriptions.map(gazetteer.find)
+    cities = geography.map(lambda found: items_separator.join(found[0]))
+    states = geography.map(lambda found: items_separator.join(found[1]))
+
+    telegram_links, instagram_links, other_links = split_links(
+        frame['other_links'])
+
+    columns = zip(scrapped_channels,
+                  phone_numbers.to_numpy().take(codes),
+                  clean_counts(frame['subscriber_count']),
+                  clean_counts(frame['videos_count'], 'videos'),
+                  clean_counts(frame['total_views'], 'views'),
+                  telegram_links, instagram_links, other_links,
+                  cities.to_numpy().take(codes),
+                  states.to_numpy().take(codes))
+    return {chid: {'phone_numbers': list(phones),
+                   'subscriber_count': subs,
+                   'videos_count': videos_count,
+                   'total_views': total_views,
+                   'telegram_links': telegram,
+                   'instagram_links': instagram,
+                   'other_links': other,
+                   'city': city,
+                   'state': state}
+            for (chid, phones, subs, videos_count, total_views, telegram,
+                 instagram, other, city, state) in columns}
+
+
+def clean_batch(batch: dict, gazetteer, items_separator='\n'):
+    """
+    Add the cleaned copies of a streamed batch's scrapped channels under
+    batch['cleaned'] (the raw channels are kept as they are).
+    """
+    batch['cleaned'] = {chid: {**batch['scrapped'][chid], **cleaned_data}
+                        for chid, cleaned_data in clean_channels(
+                            batch['scrapped'], gazetteer,
+                            items_separator).items()}
+    return batch
@@ -0,0 +1,102 @@
+"""
+Compare the batch cleaner with the row by row cleaning.
+
+    python -m yt_scraper.benchmarks.bench_cleaning
+    python -m yt_scraper.benchmarks.bench_cleaning --channels 1000000 --skip_rows
+
+"""
+import argparse
+import random
+import time
+
+from yt_scraper.batch_cleaning import clean_channels
+from yt_scraper.cleaning import (extract_phone_numbers, clean_text_from_number,
+                                 extract_links)
+from yt_scraper.gazetteer import Gazetteer
+from yt_scraper.benchmarks.bench_gazetteer import (synthetic_states,
+                                                   synthetic_descriptions)
+
+
+COUNTS = ['34.7K subscribers', '1.2M subscribers', '336 videos',
+          '893,591 views', '1 video', 'No videos', '2.5 lakh views',
+          '1.1 crore views', '12 subscribers', '']
+
+LINKS = ['https://www.youtube.com/redirect?event=channel_description'
+         '&redir_token=x&q=https%3A%2F%2Ft.me%2Fclasses',
+         'https://www.youtube.com/redirect?event=channel_description'
+         '&q=https%3A%2F%2Fwww.instagram.com%2Fpage%2F',
+         'https://www.youtube.com/redirect?q=https%3A%2F%2Fexample.com%2Fa+b',
+         'https://www.facebook.com/page',
+         '/redirect?q=&event=x']
+
+
+def synthetic_channels(descriptions, n=10_000, seed=0):
+    """
+    Build raw scrapped channels, as saved by the scrapping.
+    """
+    rnd = random.Random(seed)
+    channels = {}
+    for i in range(n):
+        description = rnd.choice(descriptions)
+        if rnd.random() < 0.3:
+            description += ' call {} or {} {}'.format(
+                rnd.randint(6_000_000_000, 9_999_999_999),
+                rnd.randint(10_000, 99_999), rnd.randint(10_000, 99_999))
+        channels[str(i)] = {'application_name': f'application {i}',
+                            'description': description,
+                            'subscriber_count': rnd.choice(COUNTS),
+                            'videos_count': rnd.choice(COUNTS),
+                            'total_views': rnd.choice(COUNTS),
+                            'other_links': rnd.sample(LINKS, rnd.randint(0, 3))}
+    return channels
+
+
+def clean_rows(channels, gazetteer, items_separator='\n'):
+    cleaned = {}
+    for chid, channel_data in channels.items():
+        descr = channel_data.get('description')
+        found_cities, found_states = gazetteer.find(descr)
+        cleaned[chid] = {
+            'phone_numbers': extract_phone_numbers(descr),
+            'subscriber_count': clean_text_from_number(
+                channel_data.get('subscriber_count')),
+            'videos_count': clean_text_from_number(
+                channel_data.get('videos_count'), 'videos'),
+            'total_views': clean_text_from_number(
+                channel_data.get('total_views'), 'views'),
+            **extract_links(channel_data.get('other_links')),
+            'city': items_separator.join(found_cities),
+            'state': items_separator.join(found_states)}
+    return cleaned
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Cleaning benchmark')
+    parser.add_argument('--channels', type=int, default=10_000,
+                        help='Number of channels to clean')
+    parser.add_argument('--skip_rows', action='store_true',
+                        help='Do not run the row by row cleaning')
+    args = parser.parse_args()
+
+    cities_by_states = synthetic_states()
+    gazetteer = Gazetteer(cities_by_states)
+    channels = synthetic_channels(synthetic_descriptions(cities_by_states),
+                                  args.channels)
+
+    start = time.perf_counter()
+    batch_results = clean_channels(channels, gazetteer)
+    batch_time = time.perf_counter() - start
+
+    print(f"channels            : {len(channels)}")
+    print(f"batch               : {batch_time * 1000:.1f} ms")
+    if not args.skip_rows:
+        start = time.perf_counter()
+        row_results = clean_rows(channels, gazetteer)
+        row_time = time.perf_counter() - start
+        print(f"row by row          : {row_time * 1000:.1f} ms")
+        print(f"speedup             : {row_time / max(batch_time, 1e-9):.1f}x")
+        print(f"identical results   : {row_results == batch_results}")
+
+
+if __name__ == '__main__':
+    main()
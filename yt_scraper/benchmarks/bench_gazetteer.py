@@ -0,0 +1,100 @@
+"""
+Compare the Gazetteer matcher with the per-name regex loop.
+
+    python -m yt_scraper.benchmarks.bench_gazetteer
+    python -m yt_scraper.benchmarks.bench_gazetteer --states ./yt_scraper/output/cities_by_states.json
+
+"""
+import argparse
+import json
+import random
+import time
+
+from yt_scraper.gazetteer import Gazetteer, extract_city_and_state_loop
+
+
+FILLER_WORDS = ['hey', 'guys', 'welcome', 'to', 'the', 'channel', 'family',
+                'daily', 'classes', 'for', 'exams', 'contact', 'us', 'at',
+                'join', 'our', 'telegram', 'and', 'instagram', 'page']
+
+
+def synthetic_states(n_states=36, n_cities=800, seed=0):
+    """
+    Build a fake gazetteer with the size of the Indian one.
+    """
+    rnd = random.Random(seed)
+    syllables = ['pur', 'nagar', 'abad', 'gar', 'ko', 'lam', 'del', 'hi',
+                 'mum', 'bai', 'pat', 'na', 'ran', 'chi', 'sur', 'at']
+    def name():
+        return ''.join(rnd.choice(syllables) for _ in range(rnd.randint(2, 4)))
+    states = {}
+    for _ in range(n_states):
+        states[name() + ' pradesh'] = [name() if rnd.random() > 0.2
+                                       else 'new ' + name()
+                                       for _ in range(n_cities // n_states)]
+    return states
+
+
+def synthetic_descriptions(cities_by_states, n=200, seed=0):
+    """
+    Build descriptions mentioning some of the cities and states.
+    """
+    rnd = random.Random(seed)
+    names = [name for state, cities in cities_by_states.items()
+             for name in [state, *cities]]
+    descriptions = []
+    for _ in range(n):
+        words = [rnd.choice(FILLER_WORDS) for _ in range(rnd.randint(20, 120))]
+        for _ in range(rnd.randint(0, 3)):
+            words.insert(rnd.randrange(len(words) + 1),
+                         rnd.choice(names).title() + rnd.choice(['', ',', '.']))
+        descriptions.append(' '.join(words))
+    return descriptions
+
+
+def timeit(func, descriptions):
+    start = time.perf_counter()
+    results = [func(description) for description in descriptions]
+    return time.perf_counter() - start, results
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Gazetteer benchmark')
+    parser.add_argument('--states', default=None,
+                        help='Path to a cities_by_states.json file')
+    parser.add_argument('--descriptions', type=int, default=200,
+                        help='Number of descriptions to scan')
+    args = parser.parse_args()
+
+    if args.states:
+        with open(args.states, 'r', encoding='utf-8') as states_file:
+            cities_by_states = json.load(states_file)
+    else:
+        cities_by_states = synthetic_states()
+    descriptions = synthetic_descriptions(cities_by_states, args.descriptions)
+
+    start = time.perf_counter()
+    gazetteer = Gazetteer(cities_by_states)
+    build_time = time.perf_counter() - start
+
+    def with_gazetteer(description):
+        found_cities, found_states = gazetteer.find(description)
+        return {'city': found_cities, 'state': found_states}
+
+    def with_loop(description):
+        found = extract_city_and_state_loop(cities_by_states, description)
+        return {k: set(v.split('\n')) - {''} for k, v in found.items()}
+
+    loop_time, loop_results = timeit(with_loop, descriptions)
+    gazetteer_time, gazetteer_results = timeit(with_gazetteer, descriptions)
+
+    print(f"descriptions        : {len(descriptions)}")
+    print(f"gazetteer build     : {build_time * 1000:.1f} ms")
+    print(f"regex loop          : {loop_time * 1000:.1f} ms")
+    print(f"gazetteer           : {gazetteer_time * 1000:.1f} ms")
+    print(f"speedup             : {loop_time / max(gazetteer_time, 1e-9):.1f}x")
+    print(f"identical results   : {loop_results == gazetteer_results}")
+
+
+if __name__ == '__main__':
+    main()
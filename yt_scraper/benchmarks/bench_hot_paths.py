@@ -0,0 +1,309 @@
+"""
+Benchmark the parsing, cleaning and saving hot paths offline, on channels
+built from the saved fixtures (benchmarks/fixtures), and compare them with
+a baseline saved on the same machine (benchmarks/baseline.json).
+
+    python -m yt_scraper.benchmarks.bench_hot_paths
+    python -m yt_scraper.benchmarks.bench_hot_paths --sizes 1000 10000 --only to_pandas
+    python -m yt_scraper.benchmarks.bench_hot_paths --save_baseline
+
+Each benchmark prints its operations per second (best of at least --repeat
+runs, lasting --min_time seconds together) and its peak memory (traced with
+tracemalloc in one more run). The baseline is machine dependent, so none is
+shipped: save one before the changes, and compare after them.
+
+The cities and states are the real ones when they are found (--states, or
+the run's cities_by_states.json, or the states input file), the gazetteer's
+cost depending on their number. The fixture's subset is used otherwise.
+"""
+import argparse
+import json
+import os
+import platform
+import random
+import sys
+import tempfile
+import time
+import tracemalloc
+
+# locator's modules are imported from the package directory too.
+sys.path.insert(1, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from yt_scraper.batch_cleaning import clean_channels
+from yt_scraper.cleaning import (extract_phone_numbers, clean_text_from_number,
+                                 extract_links)
+from yt_scraper.inputs import states_input_name
+from yt_scraper.journal import append_to_json_object
+from yt_scraper.locator import Scrapper, channels_to_pandas, read_states_excel
+from yt_scraper.logger import Logger
+from yt_scraper.store import dump_json_object
+
+
+BENCHMARKS_DIR = os.path.dirname(os.path.abspath(__file__))
+PACKAGE_DIR = os.path.dirname(BENCHMARKS_DIR)
+FIXTURES_DIR = os.path.join(BENCHMARKS_DIR, 'fixtures')
+BASELINE_FILE = os.path.join(BENCHMARKS_DIR, 'baseline.json')
+
+SIZES = [1_000, 10_000, 100_000]
+
+COUNT_FIELDS = {'subscriber_count': 'subscribers',
+                'videos_count': 'videos',
+                'total_views': 'views'}
+
+
+def load_fixture(name):
+    with open(os.path.join(FIXTURES_DIR, name), 'r', encoding='utf-8') as fixture:
+        return json.load(fixture)
+
+
+def load_cities_by_states(states_file=None):
+    """
+    The cities by states, and where they were read from: the given file
+    (json or excel), the run's cities_by_states.json, the states input
+    file, or else the fixture's subset.
+    """
+    # The run's directories (see locator.run).
+    candidates = [states_file] if states_file else [
+        f"{PACKAGE_DIR}\\output\\cities_by_states.json",
+        f"{PACKAGE_DIR}\\input\\{states_input_name}"]
+    for file_name in candidates:
+        if not os.path.exists(file_name):
+            continue
+        if file_name.endswith('.xlsx'):
+            return read_states_excel(file_name), file_name
+        with open(file_name, 'r', encoding='utf-8') as states:
+            return json.load(states), file_name
+    if states_file:
+        raise SystemExit(f"{states_file} not found.")
+    return load_fixture('cities_by_states.json'), 'fixture subset'
+
+
+def fixture_channels(fixtures, n, seed=0):
+    """
+    Build n raw scrapped channels from the fixtures, as saved by the
+    scrapping.
+    """
+    rnd = random.Random(seed)
+    channels = {}
+    for i in range(n):
+        handle = f'@channel{i}'
+        channels[str(i)] = {
+            'application_name': f'application {i}',
+            'application_link': ('https://www.youtube.com/results?search_query='
+                                 f'application+{i}&sp=EgIQAg%253D%253D'),
+            'channel_link': f'https://www.youtube.com/{handle}',
+            'channel_name': f'Channel {i}',
+            'channel_handle': handle,
+            'description': rnd.choice(fixtures['descriptions']),
+            'other_links': list(rnd.choice(fixtures['other_links'])),
+            **{field: rnd.choice(fixtures[field])
+               for field in [*COUNT_FIELDS, 'joined_on']}}
+    return channels
+
+
+def bench_clean_text_from_number(context):
+    for channel_data in context['channels'].values():
+        for field, _for in COUNT_FIELDS.items():
+            clean_text_from_number(channel_data[field], _for)
+    return len(context['channels']) * len(COUNT_FIELDS)
+
+
+def bench_extract_phone_numbers(context):
+    for channel_data in context['channels'].values():
+        extract_phone_numbers(channel_data['description'])
+    return len(context['channels'])
+
+
+def bench_extract_links(context):
+    for channel_data in context['channels'].values():
+        extract_links(channel_data['other_links'])
+    return len(context['channels'])
+
+
+def bench_extract_city_and_state(context):
+    scrapper = context['scrapper']
+    for channel_data in context['channels'].values():
+        scrapper.extract_city_and_state(channel_data['description'])
+    return len(context['channels'])
+
+
+def bench_clean_channels(context):
+    clean_channels(context['channels'], context['scrapper']._gazetteer)
+    return len(context['channels'])
+
+
+def bench_to_pandas(context):
+    channels_to_pandas(context['cleaned'], context['logger'])
+    return len(context['cleaned'])
+
+
+def bench_append_to_json_object(context):
+    # Half the channels are in the file already, the other half is added.
+    file_name = os.path.join(context['tmp_dir'], 'append.json')
+    items = list(context['cleaned'].items())
+    half = len(items) // 2
+    dump_json_object(items[:half], file_name)
+    start = time.perf_counter()
+    append_to_json_object(file_name, dict(items[half:]))
+    context['elapsed'] = time.perf_counter() - start
+    return len(items) - half
+
+
+def bench_dump_json_object(context):
+    dump_json_object(context['cleaned'].items(),
+                     os.path.join(context['tmp_dir'], 'dump.json'))
+    return len(context['cleaned'])
+
+
+def bench_save_scrapped_channels(context):
+    # The path of run(): half the channels were saved by the previous runs,
+    # the other half is appended, cleaned, and appended again.
+    output_dir = tempfile.mkdtemp(dir=context['tmp_dir'])
+    items = list(context['channels'].items())
+    half = len(items) // 2
+    dump_json_object(items[:half],
+                     f"{output_dir}\\uncleaned_scrapped_channels.json")
+    dump_json_object(((chid, context['cleaned'][chid]) for chid, _ in items[:half]),
+                     f"{output_dir}\\cleaned_scrapped_channels.json")
+    scrapper = context['scrapper']
+    scrapper.scrapped_channels = {chid: dict(channel_data)
+                                  for chid, channel_data in items[half:]}
+    start = time.perf_counter()
+    scrapper.save_scrapped_channels(output_dir)
+    context['elapsed'] = time.perf_counter() - start
+    return len(items) - half
+
+
+BENCHMARKS = {'clean_text_from_number': bench_clean_text_from_number,
+              'extract_phone_numbers': bench_extract_phone_numbers,
+              'extract_links': bench_extract_links,
+              'extract_city_and_state': bench_extract_city_and_state,
+              'clean_channels': bench_clean_channels,
+              'to_pandas': bench_to_pandas,
+              'append_to_json_object': bench_append_to_json_object,
+              'dump_json_object': bench_dump_json_object,
+              'save_scrapped_channels': bench_save_scrapped_channels}
+
+
+def measure(benchmark, context, repeat, min_time):
+    """
+    The operations per second (best run) and the peak memory (MiB). The
+    benchmark runs at least repeat times, and until min_time seconds are
+    measured (the short runs are the noisiest).
+    """
+    best, runs, total = None, 0, 0.0
+    while runs < repeat or total < min_time:
+        context.pop('elapsed', None)
+        start = time.perf_counter()
+        ops = benchmark(context)
+        # A benchmark with a set-up times its own part.
+        elapsed = context.get('elapsed', time.perf_counter() - start)
+        best = elapsed if best is None else min(best, elapsed)
+        runs += 1
+        total += elapsed
+    tracemalloc.start()
+    try:
+        benchmark(context)
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    return {'ops_per_sec': ops / max(best, 1e-9),
+            'peak_mib': peak / 2 ** 20}
+
+
+def compare(result, baseline, tolerance):
+    """
+    The comparison of a result with its baseline, and whether it regressed.
+    """
+    if baseline is None:
+        return 'no baseline', False
+    speed = result['ops_per_sec'] / baseline['ops_per_sec']
+    memory = result['peak_mib'] / max(baseline['peak_mib'], 1e-9)
+    # Less than a MiB more is not a memory regression.
+    regressed = (speed < 1 - tolerance
+                 or result['peak_mib'] > baseline['peak_mib'] * (1 + tolerance) + 1)
+    return (f"{speed:.2f}x speed, {memory:.2f}x memory"
+            f"{'  REGRESSION' if regressed else ''}", regressed)
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Hot paths benchmarks')
+    parser.add_argument('--sizes', type=int, nargs='+', default=SIZES,
+                        help='Numbers of channels')
+    parser.add_argument('--only', nargs='+', choices=list(BENCHMARKS),
+                        default=list(BENCHMARKS),
+                        help='The benchmarks to run')
+    parser.add_argument('--repeat', type=int, default=5,
+                        help='Minimal number of timed runs of each benchmark')
+    parser.add_argument('--min_time', type=float, default=1.0,
+                        help='Minimal time (s) measured for each benchmark')
+    parser.add_argument('--tolerance', type=float, default=0.5,
+                        help='Slow down (or memory increase) reported as a regression')
+    parser.add_argument('--states', default=None,
+                        help=('The cities by states file (json, or the '
+                              'states excel input)'))
+    parser.add_argument('--save_baseline', action='store_true',
+                        help=f'Save the results to {BASELINE_FILE}')
+    parser.add_argument('--check', action='store_true',
+                        help='Exit with status 1 when a benchmark regressed')
+    args = parser.parse_args()
+
+    fixtures = load_fixture('channels.json')
+    cities_by_states, states_source = load_cities_by_states(args.states)
+    print(f"Cities and states : {states_source} ({len(cities_by_states)} "
+          f"states, {sum(map(len, cities_by_states.values()))} cities)")
+    setup = {'python': platform.python_version(),
+             'machine': platform.machine(),
+             'states': states_source}
+    try:
+        with open(BASELINE_FILE, 'r', encoding='utf-8') as baseline_file:
+            saved = json.load(baseline_file)
+    except FileNotFoundError:
+        saved = {'results': {}}
+    baseline = saved['results']
+    # Only the results of the same set-up are compared.
+    if baseline and any(saved.get(key) != value for key, value in setup.items()):
+        print(f"The baseline was saved with another set-up "
+              f"({', '.join(f'{key} {saved.get(key)}' for key in setup)}), "
+              f"it's not compared.")
+        baseline = {}
+
+    results, regressions = {}, 0
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        logger = Logger(os.path.join(tmp_dir, 'bench_hot_paths.log'))
+        scrapper = Scrapper({}, cities_by_states, logger=logger)
+        print(f"{'benchmark':<24}{'channels':>10}{'ops/sec':>14}"
+              f"{'peak MiB':>11}  vs baseline")
+        for size in args.sizes:
+            channels = fixture_channels(fixtures, size)
+            cleaned = {chid: {**channels[chid], **cleaned_data}
+                       for chid, cleaned_data in clean_channels(
+                           channels, scrapper._gazetteer).items()}
+            context = {'channels': channels, 'cleaned': cleaned,
+                       'scrapper': scrapper, 'logger': logger,
+                       'tmp_dir': tmp_dir}
+            for name in args.only:
+                key = f"{name}@{size}"
+                results[key] = measure(BENCHMARKS[name], context, args.repeat,
+                                       args.min_time)
+                comparison, regressed = compare(results[key],
+                                                baseline.get(key),
+                                                args.tolerance)
+                regressions += regressed
+                print(f"{name:<24}{size:>10}"
+                      f"{results[key]['ops_per_sec']:>14,.0f}"
+                      f"{results[key]['peak_mib']:>11.2f}  {comparison}")
+
+    if args.save_baseline:
+        with open(BASELINE_FILE, 'w', encoding='utf-8') as baseline_file:
+            json.dump({**setup, 'results': {**baseline, **results}},
+                      baseline_file, indent=3)
+        print(f"Baseline saved to {BASELINE_FILE}")
+    if regressions:
+        print(f"{regressions} regression(s)")
+        if args.check:
+            sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
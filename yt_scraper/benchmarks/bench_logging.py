@@ -0,0 +1,77 @@
+"""
+Measure what logging costs to the scrapping thread: about ten records per
+channel, written synchronously, by the background writer, or filtered out.
+The scrapping thread waits --wait ms per channel (the pages' loading), and
+only the time spent in the log calls is counted.
+
+    python -m yt_scraper.benchmarks.bench_logging
+    python -m yt_scraper.benchmarks.bench_logging --channels 5000 --wait 0 --json
+
+"""
+import argparse
+import os
+import sys
+import tempfile
+import time
+
+# locator's modules are imported from the package directory too.
+sys.path.insert(1, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from yt_scraper.logger import Logger
+
+
+SCENARIOS = {'synchronous': {'background': False},
+             'background': {'background': True},
+             'background, INFO level': {'background': True, 'level': 'INFO'}}
+
+
+def log_channel(logger, chid):
+    """
+    The records of one channel, as the scrapping logs them.
+    """
+    logger.log("Extracting channel {} : {} ...", _br=True,
+               args=(chid, f'application {chid}'), chid=chid)
+    for stage in ['search_navigation', 'result_wait', 'click_through',
+                  'about_dialog']:
+        logger.log("Channel {} :: {} took {:.3f} s", args=(chid, stage, 0.5),
+                   chid=chid, stage=stage, duration=0.5)
+    for el_name in ['channel name', 'subscriber count', 'videos count',
+                    'description']:
+        logger.log("Channel {} :: {} found : {}",
+                   args=(chid, el_name, 'Unique Civil'), chid=chid)
+    logger.log("Extracting the channel '{}' finished successfully.", 'INFO',
+               args=(f'application {chid}',), chid=chid)
+    return 10
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Logging benchmark')
+    parser.add_argument('--channels', type=int, default=2_000,
+                        help='Number of channels logged')
+    parser.add_argument('--wait', type=float, default=1.0,
+                        help='Time (ms) waited for the pages of each channel')
+    parser.add_argument('--json', action='store_true',
+                        help='Write the JSON-lines file too')
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        for name, options in SCENARIOS.items():
+            logger = Logger(os.path.join(tmp_dir, 'bench_logging.log'),
+                            json_out=(os.path.join(tmp_dir, 'bench_logging.jsonl')
+                                      if args.json else None),
+                            **options)
+            records, calls_time = 0, 0
+            start = time.perf_counter()
+            for chid in range(args.channels):
+                calls_start = time.perf_counter()
+                records += log_channel(logger, str(chid))
+                calls_time += time.perf_counter() - calls_start
+                time.sleep(args.wait / 1000)
+            logger.close()
+            total_time = time.perf_counter() - start
+            print(f"{name:<24}: {calls_time / records * 1e6:.2f} us per record "
+                  f"on the scrapping thread, {total_time:.2f} s until written")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,75 @@
+"""
+Measure the start-up of the scrapper: the import of locator, and a run with
+no channel to scrape, each in a fresh interpreter.
+
+    python -m yt_scraper.benchmarks.bench_startup
+    python -m yt_scraper.benchmarks.bench_startup --runs 10
+
+"""
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+
+
+# The modules that must not be imported unless they are used.
+HEAVY_MODULES = ['pandas', 'numpy', 'openpyxl', 'bs4', 'urllib3', 'asyncio',
+                 'selenium.webdriver.remote.webdriver']
+
+PACKAGE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+SCENARIOS = {
+    'import locator': "import yt_scraper.locator",
+    'empty run': (
+        "import yt_scraper.locator as locator\n"
+        "from yt_scraper.logger import Logger\n"
+        "scrapper = locator.Scrapper({}, {}, logger=Logger(LOG_FILE))\n"
+        "scrapper.scrape()\n"
+        "assert scrapper.driver is None, 'a browser was launched'\n"),
+}
+
+TIMED_SCRIPT = """
+import json, sys, time
+start = time.perf_counter()
+{code}
+elapsed = time.perf_counter() - start
+print(json.dumps({{'elapsed': elapsed,
+                   'loaded': [m for m in {heavy!r} if m in sys.modules]}}))
+"""
+
+
+def run_scenario(code, log_file):
+    script = TIMED_SCRIPT.format(code=code.replace('LOG_FILE', repr(log_file)),
+                                 heavy=HEAVY_MODULES)
+    env = dict(os.environ)
+    # locator's modules are imported from the package directory too.
+    env['PYTHONPATH'] = os.pathsep.join([os.path.dirname(PACKAGE_DIR),
+                                         PACKAGE_DIR,
+                                         env.get('PYTHONPATH', '')])
+    output = subprocess.run([sys.executable, '-c', script], env=env,
+                            check=True, capture_output=True, text=True).stdout
+    return json.loads(output.strip().splitlines()[-1])
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Start-up benchmark')
+    parser.add_argument('--runs', type=int, default=5,
+                        help='Number of fresh interpreters per scenario')
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        log_file = os.path.join(tmp_dir, 'bench_startup.log')
+        for name, code in SCENARIOS.items():
+            results = [run_scenario(code, log_file) for _ in range(args.runs)]
+            elapsed = [result['elapsed'] for result in results]
+            loaded = sorted({m for result in results for m in result['loaded']})
+            print(f"{name:<20}: median {statistics.median(elapsed) * 1000:.1f} ms, "
+                  f"max {max(elapsed) * 1000:.1f} ms")
+            print(f"{'':<20}  heavy modules loaded : {', '.join(loaded) or 'none'}")
+
+
+if __name__ == '__main__':
+    main()
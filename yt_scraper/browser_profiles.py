@@ -0,0 +1,69 @@
+# The resources blocked with the light profile: only the text and the links
+# of the pages are read, so the images, fonts, video preloads, ads and
+# trackers are never needed.
+BLOCKED_URLS = [
+    # Thumbnails, avatars and banners.
+    '*i.ytimg.com/*', '*yt3.ggpht.com/*', '*yt3.googleusercontent.com/*',
+    '*.jpg', '*.jpeg', '*.png', '*.gif', '*.webp', '*.ico',
+    # Fonts.
+    '*fonts.gstatic.com/*', '*.woff', '*.woff2', '*.ttf',
+    # Video preloads.
+    '*googlevideo.com/*',
+    # Ads and trackers.
+    '*doubleclick.net/*', '*googlesyndication.com/*',
+    '*googleadservices.com/*', '*google-analytics.com/*', '*/pagead/*',
+    '*/ptracking*', '*/api/stats/*', '*/youtubei/v1/log_event*']
+
+# The browser profiles, selected with --profile:
+#
+# - default : the browser as it's launched without options.
+# - light : headless, the pages are ready once their DOM is (eager page
+#   load), without images nor media, and the heavy resources are blocked
+#   through the DevTools network domain.
+PROFILES = {
+    'default': {'headless': False,
+                'page_load_strategy': 'normal',
+                'images': True,
+                'media': True,
+                'blocked_urls': []},
+    'light': {'headless': True,
+              'page_load_strategy': 'eager',
+              'images': False,
+              'media': False,
+              'blocked_urls': BLOCKED_URLS}}
+
+# The window of a headless browser (the pages' layout depends on it).
+HEADLESS_WINDOW_SIZE = '1366,768'
+
+
+def driver_options(webdriver, browser, profile='default'):
+    """
+    The options of the selenium webdriver class `browser` (e.g. 'Edge')
+    for the profile.
+    """
+    settings = PROFILES[profile]
+    options = getattr(webdriver, f'{browser}Options')()
+    options.page_load_strategy = settings['page_load_strategy']
+    if settings['headless']:
+        options.add_argument('--headless=new')
+        options.add_argument(f'--window-size={HEADLESS_WINDOW_SIZE}')
+    if not settings['images']:
+        options.add_argument('--blink-settings=imagesEnabled=false')
+        options.add_experimental_option(
+            'prefs', {'profile.managed_default_content_settings.images': 2})
+    if not settings['media']:
+        options.add_argument('--mute-audio')
+        options.add_argument('--autoplay-policy=user-gesture-required')
+    return options
+
+
+def block_resources(driver, profile='default'):
+    """
+    Block the profile's URL patterns in the launched browser (Chromium
+    browsers only).
+    """
+    blocked_urls = PROFILES[profile]['blocked_urls']
+    if not blocked_urls:
+        return
+    driver.execute_cdp_cmd('Network.enable', {})
+    driver.execute_cdp_cmd('Network.setBlockedURLs', {'urls': blocked_urls})
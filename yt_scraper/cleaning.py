@@ -0,0 +1,86 @@
+import re
+from urllib import parse
+
+
+indian_units = {'lakh': 100_000, 'crore': 10_000_000}
+
+PHONE_NUMBER_PATTERN = re.compile(r'[1-9][0-9]{9}|\b\d{5}\s\d{5}\b')
+
+
+def extract_phone_numbers(about_description):
+    phone_numbers = PHONE_NUMBER_PATTERN.findall(about_description)
+    return list({phone.replace(' ', '') for phone in phone_numbers})
+
+
+def clean_text_from_number(text_number, _for='subscribers'):
+    """
+    Clean a number provided in text with unit.
+    """
+    # If text number is empty, return it
+    if not text_number:
+        return ''
+    # Vectorize the text number.
+    text_vector: list = text_number.lower().split()[:-1]
+    # Initiate the unit with 1
+    unit = 1
+    # Remove Lakh and Crore
+    for u_label, u in indian_units.items():
+        if u_label in text_vector:
+            text_vector.remove(u_label)
+            unit = u
+    # Concatenate the remaning elements and remove commas
+    text_number = ' '.join(text_vector).replace(',', '').strip()
+    # Remove K suffix and set unit to one thousand
+    if text_number.endswith('k'):
+        text_number = text_number.removesuffix('k')
+        unit = 1_000
+    # Remove M suffix and set unit to one million
+    elif text_number.endswith('m'):
+        text_number = text_number.removesuffix('m')
+        unit = 1_000_000
+    # Try to convert the text number to a numeric number.
+    try:
+        return int(float(text_number)*unit)
+    except:
+        if text_number == 'no':
+            return 0
+        raise ValueError("{} count could not converted "
+                         "to integer.".format(_for))
+
+
+def parse_link(link):
+    """
+    The target of a redirect link (its 'q' parameter), or the link itself.
+    """
+    try:
+        return parse.parse_qs(parse.urlparse(link).query)['q'][0]
+    except KeyError:
+        return link
+
+
+def extract_links(links_list):
+    telegram_links = []
+    instagram_links = []
+    other_links = []
+    for link in links_list:
+        parsed_link = parse_link(link)
+        if 't.me' in parsed_link:
+            telegram_links.append(parsed_link)
+            continue
+        if 'instagram.com' in parsed_link:
+            instagram_links.append(parsed_link)
+            continue
+        # NOTE: any other social media link, can be detected and then added
+        # to the data in the same way.
+        # E.g. Facebook
+        ###################################################################
+        # if 'facebook.com' in parsed_link:
+        #     facebook_links.append(parsed_link)
+        #     continue
+        ###################################################################
+        other_links.append(parsed_link)
+    # Combine all the links into a ditionary.
+    found_links = {'telegram_links': telegram_links,
+                   'instagram_links': instagram_links,
+                   'other_links': other_links}
+    return found_links
@@ -0,0 +1,224 @@
+import hashlib
+import json
+import math
+import mmap
+import os
+import struct
+import sys
+from array import array
+
+
+# Compiled inputs: the cities by states and the channels' names, saved in
+# a binary form that is loaded without pandas nor json parsing:
+#
+#     MAGIC | header size (uint32) | header (json) | padding to 8 bytes
+#     | groups offsets (uint64) | strings offsets (uint64)
+#     | utf-8 strings, each one followed by a NUL byte
+#
+# A group is a list of strings (a state and its cities, or a chid and its
+# channel's name). The header holds the source's path, size and mtime: a
+# cache whose source changed is stale.
+MAGIC = b'YTCI'
+# 2 : the numeric channels' names are saved (they were dropped).
+VERSION = 2
+
+
+def source_key(source) -> dict:
+    """
+    What identifies a version of the source file.
+    """
+    stat = os.stat(source)
+    return {'source': os.path.abspath(source),
+            'size': stat.st_size,
+            'mtime_ns': stat.st_mtime_ns}
+
+
+def compiled_file_name(cache_dir, kind, source):
+    """
+    The compiled cache of a source file.
+    """
+    digest = hashlib.sha1(os.path.abspath(source).encode('utf-8')).hexdigest()
+    return os.path.join(cache_dir, f"{kind}_{digest[:16]}.bin")
+
+
+def write_compiled(file_name, key: dict, groups: list[list[str]]):
+    """
+    Save the groups of strings, with the source's key.
+    """
+    encoded = [string.encode('utf-8') + b'\0'
+               for group in groups for string in group]
+    groups_offsets = array('Q', [0])
+    for group in groups:
+        groups_offsets.append(groups_offsets[-1] + len(group))
+    strings_offsets = array('Q', [0])
+    for string in encoded:
+        strings_offsets.append(strings_offsets[-1] + len(string))
+    header = json.dumps({**key,
+                         'version': VERSION,
+                         'byteorder': sys.byteorder,
+                         'groups': len(groups),
+                         'strings': len(encoded)}).encode('utf-8')
+    padding = b'\0' * (-(len(MAGIC) + 4 + len(header)) % 8)
+    # Replace the cache at once, a reader never sees half a file.
+    temporary_file_name = file_name + '.tmp'
+    with open(temporary_file_name, 'wb') as compiled_file:
+        compiled_file.write(MAGIC + struct.pack('<I', len(header))
+                            + header + padding)
+        compiled_file.write(groups_offsets.tobytes())
+        compiled_file.write(strings_offsets.tobytes())
+        compiled_file.write(b''.join(encoded))
+    os.replace(temporary_file_name, file_name)
+
+
+class CompiledGroups():
+    """
+    Memory-mapped groups of strings of a compiled cache, decoded on access.
+    """
+
+    def __init__(self, file_name) -> None:
+        self.file_name = file_name
+        with open(file_name, 'rb') as compiled_file:
+            self._mmap = mmap.mmap(compiled_file.fileno(), 0,
+                                   access=mmap.ACCESS_READ)
+        view = memoryview(self._mmap)
+        if view[:len(MAGIC)] != MAGIC:
+            self.close()
+            raise ValueError(f"{file_name} is not a compiled input.")
+        start = len(MAGIC) + 4
+        header_size, = struct.unpack('<I', view[len(MAGIC):start])
+        self.header = json.loads(bytes(view[start:start + header_size]))
+        start += header_size + (-(start + header_size) % 8)
+        groups_end = start + 8 * (self.header['groups'] + 1)
+        strings_end = groups_end + 8 * (self.header['strings'] + 1)
+        self._groups_offsets = view[start:groups_end].cast('Q')
+        self._strings_offsets = view[groups_end:strings_end].cast('Q')
+        self._strings = view[strings_end:]
+
+    def __len__(self):
+        return self.header['groups']
+
+    def string(self, i) -> str:
+        return str(self._strings[self._strings_offsets[i]:
+                                 self._strings_offsets[i + 1] - 1], 'utf-8')
+
+    def group(self, i) -> list[str]:
+        return [self.string(j) for j in range(self._groups_offsets[i],
+                                              self._groups_offsets[i + 1])]
+
+    def __iter__(self):
+        for i in range(len(self)):
+            yield self.group(i)
+
+    def groups(self) -> list[list[str]]:
+        """
+        All the groups, decoded at once.
+        """
+        strings = str(self._strings, 'utf-8').split('\0')[:-1]
+        # A string holding a NUL byte is decoded on its own.
+        if len(strings) != self.header['strings']:
+            return list(self)
+        offsets = self._groups_offsets.tolist()
+        return [strings[start:end] for start, end in zip(offsets, offsets[1:])]
+
+    def close(self):
+        for view in ('_groups_offsets', '_strings_offsets', '_strings'):
+            if hasattr(self, view):
+                getattr(self, view).release()
+        self._mmap.close()
+
+
+def read_compiled(file_name, key: dict = None):
+    """
+    Load all the groups of a compiled cache, or None if it's missing,
+    corrupted, or stale (its key differs from the source's key).
+    """
+    try:
+        compiled = CompiledGroups(file_name)
+    except (OSError, ValueError):
+        return None
+    try:
+        header = compiled.header
+        if (header.get('version') != VERSION
+                or header.get('byteorder') != sys.byteorder
+                or (key is not None
+                    and any(header.get(k) != v for k, v in key.items()))):
+            return None
+        return compiled.groups()
+    finally:
+        compiled.close()
+
+
+def load_compiled(source, cache_dir, kind, read_source, logger):
+    """
+    The groups of the source file, from its compiled cache when it's up to
+    date. Otherwise, read_source() reads the groups from the source, and the
+    cache is compiled again.
+    """
+    key = source_key(source)
+    file_name = compiled_file_name(cache_dir, kind, source)
+    groups = read_compiled(file_name, key)
+    if groups is not None:
+        logger.log("Read the compiled {} from {}.", args=(kind, file_name))
+        return groups
+    groups = read_source()
+    os.makedirs(cache_dir, exist_ok=True)
+    write_compiled(file_name, key, groups)
+    logger.log("Compiled the {} of {} to {}.", args=(kind, source, file_name))
+    return groups
+
+
+def states_to_groups(cities_by_states: dict) -> list[list[str]]:
+    return [[state, *cities] for state, cities in cities_by_states.items()]
+
+
+def groups_to_states(groups) -> dict[str, list[str]]:
+    return {group[0]: group[1:] for group in groups}
+
+
+def channel_name(value):
+    """
+    The name of a channel as a string (the excel file gives a numeric name
+    as a number, and as a float in a column with empty cells), or None when
+    it's missing (None or NaN).
+    """
+    if value is None or isinstance(value, str):
+        return value
+    if isinstance(value, float):
+        if math.isnan(value):
+            return None
+        if value.is_integer():
+            value = int(value)
+    return str(value)
+
+
+def channels_to_groups(channels: dict) -> list[list[str]]:
+    # A channel without a name is saved with its chid only.
+    groups = []
+    for chid, channel in channels.items():
+        name = channel_name(channel.get('channel'))
+        groups.append([chid] if name is None else [chid, name])
+    return groups
+
+
+def groups_to_channels(groups) -> dict[str, dict]:
+    return {group[0]: {'channel': group[1] if len(group) > 1 else None}
+            for group in groups}
+
+
+def load_states(source, cache_dir, read_source, logger) -> dict[str, list[str]]:
+    """
+    The cities by states of the source file (excel or json), through its
+    compiled cache.
+    """
+    return groups_to_states(load_compiled(
+        source, cache_dir, 'states',
+        lambda: states_to_groups(read_source()), logger))
+
+
+def load_channels(source, cache_dir, read_source, logger) -> dict[str, dict]:
+    """
+    The channels' names of the source file, through its compiled cache.
+    """
+    return groups_to_channels(load_compiled(
+        source, cache_dir, 'channels',
+        lambda: channels_to_groups(read_source()), logger))
@@ -0,0 +1,146 @@
+import threading
+
+
+# Read the whole channel page in one round-trip. A field is null when its
+# element is not displayed, and the absent containers are listed in
+# `missing`.
+EXTRACTION_SCRIPT = """
+const visible = el => !!el && el.getClientRects().length > 0
+                      && getComputedStyle(el).visibility !== 'hidden';
+const text = el => visible(el) ? el.innerText : null;
+const missing = [];
+const find = (selector, name) => {
+    const el = document.querySelector(selector);
+    if (!el && name) { missing.push(name); }
+    return el;
+};
+const header = find('#inner-header-container', 'header');
+const handles = [...document.querySelectorAll('#channel-handle')].filter(visible);
+const description = find('div#description-container', 'description');
+const links = find('div#links-container', 'links');
+const stats = find('div#right-column', 'stats');
+const statsStrings = stats ? stats.querySelectorAll('yt-formatted-string') : [];
+const joinedSpans = statsStrings.length > 1
+                    ? statsStrings[1].querySelectorAll('span') : [];
+return {
+    channel_name: header ? text(header.querySelector('#text.style-scope.ytd-channel-name')) : null,
+    subscriber_count: text(document.querySelector('#subscriber-count')),
+    videos_count: text(document.querySelector('#videos-count')),
+    channel_handle: handles.length ? handles[0].innerText : null,
+    description: text(description),
+    other_links: visible(links)
+                 ? [...links.querySelectorAll('a.yt-simple-endpoint')].map(a => a.getAttribute('href'))
+                 : null,
+    joined_on: joinedSpans.length ? text(joinedSpans[joinedSpans.length - 1]) : null,
+    total_views: statsStrings.length > 2 ? text(statsStrings[2]) : null,
+    missing: missing
+};
+"""
+
+# The failure message of each container, as in Scrapper._extract_channel.
+MISSING_MESSAGES = {'header': "Metadata extraction failure",
+                    'description': "Description extraction failure",
+                    'links': "Links extraction failure",
+                    'stats': "Stats extraction failure"}
+
+# Field -> name used in the logs.
+FIELD_NAMES = {'channel_name': 'channel name',
+               'subscriber_count': 'subscriber count',
+               'videos_count': 'videos count',
+               'channel_handle': 'channel handle',
+               'description': 'description',
+               'joined_on': 'joined date',
+               'total_views': 'total views'}
+
+
+class ExtractionScriptException(Exception):
+
+     def __init__(self, *args: object, message="Script extraction failure") -> None:
+         self.message = message
+         super().__init__(*args)
+
+
+def extract_with_script(chid, driver, logger) -> dict:
+    """
+    Extract the channel's page with one execute_script call, and log the
+    found (or missing) fields as the find_* functions do.
+    """
+    values = driver.execute_script(EXTRACTION_SCRIPT)
+    if values['missing']:
+        raise ExtractionScriptException(
+            message=MISSING_MESSAGES[values['missing'][0]])
+    channel_data = {}
+    for field, el_name in FIELD_NAMES.items():
+        value = values[field]
+        if value is None:
+            logger.log("Channel {} :: {} not found : ''",
+                       'WARNING', args=(chid, el_name), chid=chid)
+            value = ""
+        else:
+            logger.log("Channel {} :: {} found : {}",
+                       args=(chid, el_name, value[:40].replace('\n', '\\n')),
+                       chid=chid)
+        channel_data[field] = value
+    if values['other_links'] is None:
+        logger.log("Channel {} :: No link found.", 'WARNING', args=(chid,),
+                   chid=chid)
+        channel_data['other_links'] = []
+    else:
+        logger.log("Channel {} :: links found : {}",
+                   args=(chid, values['other_links']), chid=chid)
+        channel_data['other_links'] = values['other_links']
+    return channel_data
+
+
+class DriverCommandCounter():
+    """
+    Count the commands (http round-trips) sent to the drivers. Every
+    driver and element call goes through driver.execute, which is wrapped.
+
+    The page loads are counted too: the driver.get calls, and the
+    navigations by a click (see count_page_load).
+    """
+
+    def __init__(self) -> None:
+        self._counts = {}
+        self._page_loads = {}
+        self._lock = threading.Lock()
+
+    def wrap(self, driver):
+        execute = driver.execute
+        key = id(driver)
+        self._counts[key] = 0
+        self._page_loads[key] = 0
+
+        def counted_execute(driver_command, *args, **kwargs):
+            with self._lock:
+                self._counts[key] += 1
+                if driver_command == 'get':
+                    self._page_loads[key] += 1
+            return execute(driver_command, *args, **kwargs)
+
+        driver.execute = counted_execute
+        return driver
+
+    def count(self, driver=None):
+        """
+        The commands sent by a driver, or by all of them.
+        """
+        if driver is None:
+            return sum(self._counts.values())
+        return self._counts.get(id(driver), 0)
+
+    def count_page_load(self, driver):
+        """
+        Count a page loaded by a click of the driver.
+        """
+        with self._lock:
+            self._page_loads[id(driver)] = self._page_loads.get(id(driver), 0) + 1
+
+    def page_loads(self, driver=None):
+        """
+        The pages loaded by a driver, or by all of them.
+        """
+        if driver is None:
+            return sum(self._page_loads.values())
+        return self._page_loads.get(id(driver), 0)
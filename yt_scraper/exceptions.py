@@ -0,0 +1,23 @@
+class NoResultsException(Exception):
+
+     def __init__(self, *args: object) -> None:
+         self.message = "No Results Found"
+         super().__init__(*args)
+
+
+class PageRequestException(Exception):
+
+     def __init__(self, *args: object, message="Page request failure",
+                  transient=False) -> None:
+         self.message = message
+         # Whether the request may succeed when retried (network failure,
+         # time out, server busy).
+         self.transient = transient
+         super().__init__(*args)
+
+
+class SnapshotExtractionException(Exception):
+
+     def __init__(self, *args: object, message="Snapshot extraction failure") -> None:
+         self.message = message
+         super().__init__(*args)
@@ -0,0 +1,123 @@
+import re
+
+
+# Punctuation that may trail a city or state name in a description.
+TRAILING_PUNCTUATION = '.,;:!?'
+
+WORD_PATTERN = re.compile(r'\w+')
+
+
+def extract_city_and_state_loop(cities_by_states: dict[str, list[str]],
+                                about_description: str,
+                                items_separator='\n'):
+    """
+    Reference implementation: one regex scan per state and per city.
+    Kept for benchmarking and for checking the Gazetteer against it.
+    """
+    about_description = about_description.lower()
+    found_states = set()
+    found_cities = set()
+    for state, cities in cities_by_states.items():
+        state_pattern = '\\b{}[.,;:!?]*\\b'.format(state)
+        _states = re.findall(state_pattern, about_description)
+        for city in cities:
+            city_pattern = '\\b{}[.,;:!?]*\\b'.format(city)
+            _cities = re.findall(city_pattern, about_description)
+            if _cities:
+                found_cities.update(_cities)
+        if _states:
+            found_states.update(_states)
+    return {'city': items_separator.join(found_cities),
+            'state': items_separator.join(found_states)}
+
+
+def _is_plain_name(name: str):
+    """
+    Whether a name is matched literally by the reference pattern, i.e. it
+    has no regex metacharacter and starts and ends with a word character.
+    """
+    return (bool(name)
+            and re.escape(name).replace('\\ ', ' ') == name
+            and bool(WORD_PATTERN.fullmatch(name[0]))
+            and bool(WORD_PATTERN.fullmatch(name[-1])))
+
+
+class Gazetteer():
+    """
+    Prebuilt matcher of the cities and states names.
+
+    The plain names are indexed by their first word, and a description is
+    scanned once, word by word, checking only the names starting with the
+    current word. The few names holding regex metacharacters keep their
+    (precompiled) reference pattern, so that the result is exactly the
+    one of `extract_city_and_state_loop`.
+    """
+
+    def __init__(self, cities_by_states: dict[str, list[str]]) -> None:
+        # first word -> [(name, is_state, is_city), ...]
+        self._by_first_word: dict[str, list[tuple[str, bool, bool]]] = {}
+        # Patterns of the names that can't be matched literally.
+        self._state_patterns = []
+        self._city_patterns = []
+        # Collect the names, a state can also be a city.
+        states, cities = set(), set()
+        for state, state_cities in cities_by_states.items():
+            states.add(state)
+            cities.update(state_cities)
+        for name in sorted(states | cities):
+            is_state, is_city = name in states, name in cities
+            if not _is_plain_name(name):
+                pattern = re.compile('\\b{}[.,;:!?]*\\b'.format(name))
+                if is_state:
+                    self._state_patterns.append(pattern)
+                if is_city:
+                    self._city_patterns.append(pattern)
+                continue
+            first_word = WORD_PATTERN.match(name).group()
+            (self._by_first_word.setdefault(first_word, [])
+                                .append((name, is_state, is_city)))
+
+    def _match_at(self, text: str, name: str, pos: int):
+        """
+        Return what `\\bname[.,;:!?]*\\b` matches at pos, or None.
+        """
+        if not text.startswith(name, pos):
+            return None
+        end = pos + len(name)
+        # Trailing punctuation is kept only when a word follows it.
+        p_end = end
+        while p_end < len(text) and text[p_end] in TRAILING_PUNCTUATION:
+            p_end += 1
+        if p_end > end:
+            if p_end < len(text) and WORD_PATTERN.match(text, p_end):
+                return text[pos:p_end]
+            return text[pos:end]
+        # Otherwise, the name must end on a word boundary.
+        if end < len(text) and WORD_PATTERN.match(text, end):
+            return None
+        return text[pos:end]
+
+    def find(self, about_description: str):
+        """
+        Return the sets of the cities and the states found.
+        """
+        text = about_description.lower()
+        found_states = set()
+        found_cities = set()
+        for word in WORD_PATTERN.finditer(text):
+            candidates = self._by_first_word.get(word.group())
+            if not candidates:
+                continue
+            for name, is_state, is_city in candidates:
+                found = self._match_at(text, name, word.start())
+                if found is None:
+                    continue
+                if is_state:
+                    found_states.add(found)
+                if is_city:
+                    found_cities.add(found)
+        for pattern in self._state_patterns:
+            found_states.update(pattern.findall(text))
+        for pattern in self._city_patterns:
+            found_cities.update(pattern.findall(text))
+        return found_cities, found_states
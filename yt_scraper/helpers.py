@@ -1,8 +1,8 @@
 import time
 
 
-def datem():
-    return time.strftime("[%b %d, %Y %H:%M:%S] ~ $")
+def datem(timestamp=None):
+    return time.strftime("[%b %d, %Y %H:%M:%S] ~ $", time.localtime(timestamp))
 
 
 def file_name_timer():
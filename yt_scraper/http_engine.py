@@ -0,0 +1,267 @@
+import json
+import re
+from urllib.parse import quote_plus
+
+from yt_scraper.exceptions import NoResultsException, PageRequestException
+from yt_scraper.search_cache import NO_RESULTS
+
+
+YOUTUBE_URL = "https://www.youtube.com"
+
+# Ask for the english pages, and skip the cookies consent page.
+HTTP_HEADERS = {'User-Agent': ('Mozilla/5.0 (Windows NT 10.0; Win64; x64) '
+                               'AppleWebKit/537.36 (KHTML, like Gecko) '
+                               'Chrome/113.0.0.0 Safari/537.36 Edg/113.0.1774.42'),
+                'Accept-Language': 'en-US,en;q=0.9',
+                'Cookie': 'CONSENT=YES+1'}
+
+INITIAL_DATA_PATTERN = re.compile(r'(?:var\s+ytInitialData|window\["ytInitialData"\])\s*=\s*')
+
+
+def search_link(channel, base_url=YOUTUBE_URL):
+    """
+    The link used to search for a channel (channels only).
+    """
+    return ("{}/results?search_query={}&sp=EgIQAg%253D%253D"
+            "".format(base_url, quote_plus(channel)))
+
+
+def extract_initial_data(html: str) -> dict:
+    """
+    Read the ytInitialData JSON embedded in a YouTube page.
+    """
+    match = INITIAL_DATA_PATTERN.search(html)
+    if match is None:
+        raise PageRequestException(message="ytInitialData not found")
+    data, _ = json.JSONDecoder().raw_decode(html, match.end())
+    return data
+
+
+def find_key(data, key):
+    """
+    Yield every value stored under key, anywhere in the JSON data.
+    """
+    if isinstance(data, dict):
+        for k, v in data.items():
+            if k == key:
+                yield v
+            yield from find_key(v, key)
+    elif isinstance(data, list):
+        for item in data:
+            yield from find_key(item, key)
+
+
+def first_key(data, *keys, default=None):
+    """
+    Return the first value found under any of the keys.
+    """
+    for key in keys:
+        for value in find_key(data, key):
+            return value
+    return default
+
+
+def to_text(value) -> str:
+    """
+    Flatten a YouTube text object (simpleText, runs or content) to a string.
+    """
+    if value is None:
+        return ""
+    if isinstance(value, str):
+        return value
+    if 'simpleText' in value:
+        return value['simpleText']
+    if 'runs' in value:
+        return ''.join(run.get('text', '') for run in value['runs'])
+    if 'content' in value:
+        return value['content']
+    return ""
+
+
+def parse_search_page(html: str, chid, base_url=YOUTUBE_URL) -> str:
+    """
+    Return the link of the first channel in the search results.
+    """
+    data = extract_initial_data(html)
+    renderer = first_key(data, 'channelRenderer')
+    if renderer is None:
+        # "No results found" is shown by a promo renderer.
+        promo = first_key(data, 'backgroundPromoRenderer', default={})
+        if to_text(promo.get('title')) == 'No results found':
+            raise NoResultsException("no results found four channel {}"
+                                     "".format(chid))
+        raise PageRequestException(message="Channel searching failure")
+    base_path = first_key(renderer, 'canonicalBaseUrl')
+    if not base_path:
+        base_path = "/channel/{}".format(renderer.get('channelId'))
+    return base_url + base_path
+
+
+def log_field(chid, el_name, value, logger):
+    """
+    Log a found (or missing) field, as find_meta_description does.
+    """
+    if value:
+        text = value if isinstance(value, str) else str(value)
+        logger.log("Channel {} :: {} found : {}",
+                   args=(chid, el_name, text[:40].replace('\n', '\\n')),
+                   chid=chid)
+    else:
+        logger.log("Channel {} :: {} not found : ''",
+                   'WARNING', args=(chid, el_name), chid=chid)
+    return value
+
+
+def parse_about_page(html: str, chid, channel_link, logger) -> dict:
+    """
+    Read the channel's header, description, links and stats from
+    the about page.
+    """
+    data = extract_initial_data(html)
+    about = first_key(data, 'aboutChannelViewModel',
+                      'channelAboutFullMetadataRenderer', default={})
+    header = first_key(data, 'c4TabbedHeaderRenderer', default={})
+    metadata = first_key(data, 'channelMetadataRenderer', default={})
+
+    channel_name = to_text(metadata.get('title') or header.get('title'))
+    subscriber_count = to_text(about.get('subscriberCountText')
+                               or header.get('subscriberCountText'))
+    videos_count = to_text(about.get('videoCountText')
+                           or header.get('videosCountText'))
+    channel_handle = to_text(header.get('channelHandleText'))
+    if not channel_handle and '/@' in channel_link:
+        channel_handle = '@' + channel_link.split('/@')[-1]
+    description = to_text(about.get('description')
+                          or metadata.get('description'))
+    # Only the link's target: its navigation url repeats it, and its
+    # favicon is an image url.
+    links = list(dict.fromkeys(
+        endpoint['url']
+        for link in about.get('links', about.get('primaryLinks', []))
+        for endpoint in find_key(link, 'urlEndpoint')
+        if endpoint.get('url')))
+    joined_on = to_text(about.get('joinedDateText')).removeprefix('Joined ')
+    total_views = to_text(about.get('viewCountText'))
+
+    channel_data = {
+        'channel_name': log_field(chid, 'channel name', channel_name, logger),
+        'subscriber_count': log_field(chid, 'subscriber count',
+                                      subscriber_count, logger),
+        'videos_count': log_field(chid, 'videos count', videos_count, logger),
+        'channel_handle': log_field(chid, 'channel handle',
+                                    channel_handle, logger),
+        'description': log_field(chid, 'description', description, logger),
+        'other_links': links,
+        'joined_on': log_field(chid, 'joined date', joined_on, logger),
+        'total_views': log_field(chid, 'total views', total_views, logger)}
+    if links:
+        logger.log("Channel {} :: links found : {}", args=(chid, links),
+                   chid=chid)
+    else:
+        logger.log("Channel {} :: No link found.", 'WARNING', args=(chid,),
+                   chid=chid)
+    return channel_data
+
+
+class HttpEngine():
+    """
+    Browserless extraction: fetch the search and the about pages with a
+    pooled keep-alive client, and read the channel's data from the JSON
+    embedded in them.
+    """
+
+    def __init__(self, logger, base_url=YOUTUBE_URL, pool_size=1,
+                 timeout=10, search_cache=None) -> None:
+        self.logger = logger
+        self.base_url = base_url.rstrip('/')
+        self.search_cache = search_cache
+        # urllib3 is imported only by the http engines (search_link is
+        # also used with the browser).
+        import urllib3
+        self.http = urllib3.PoolManager(maxsize=pool_size,
+                                        block=True,
+                                        headers=HTTP_HEADERS,
+                                        timeout=urllib3.Timeout(total=timeout),
+                                        retries=urllib3.Retry(total=2,
+                                                              redirect=5))
+
+    def fetch(self, url) -> str:
+        """
+        GET a page and return its html.
+        """
+        import urllib3
+        try:
+            response = self.http.request('GET', url)
+        except urllib3.exceptions.HTTPError as e:
+            raise PageRequestException(
+                message="Page request failure ( {} )".format(type(e).__name__),
+                transient=True)
+        if response.status != 200:
+            raise PageRequestException(
+                message="Page request failure ( HTTP {} )".format(response.status),
+                transient=response.status == 429 or response.status >= 500)
+        return response.data.decode('utf-8', errors='replace')
+
+    def cached_link(self, chid, channel):
+        """
+        The cached link of the channel, or None. A cached search without
+        results raises NoResultsException.
+        """
+        if self.search_cache is None:
+            return None
+        cached_link = self.search_cache.get(channel)
+        if cached_link == NO_RESULTS:
+            raise NoResultsException("no results found four channel {} (cached)"
+                                     "".format(chid))
+        return cached_link
+
+    def cache_search(self, channel, channel_link):
+        if self.search_cache is not None:
+            self.search_cache.put(channel, channel_link)
+
+    def resolve_channel(self, chid, channel) -> str:
+        """
+        Return the link of the channel found when searching for channel.
+        """
+        channel_link = self.cached_link(chid, channel)
+        if channel_link is None:
+            try:
+                channel_link = parse_search_page(
+                    self.fetch(search_link(channel, self.base_url)),
+                    chid, self.base_url)
+            except PageRequestException as e:
+                e.message = "Channel searching failure ( {} )".format(e.message)
+                raise e
+            except NoResultsException:
+                self.cache_search(channel, NO_RESULTS)
+                raise
+            self.cache_search(channel, channel_link)
+        self.logger.log("Channel {} :: Targeting link : {}",
+                        args=(chid, channel_link), chid=chid)
+        return channel_link
+
+    def extract_channel_page(self, chid, channel_link) -> dict:
+        """
+        Extract the data of the channel from its about page.
+        """
+        channel_data = {'channel_link': channel_link}
+        try:
+            about_html = self.fetch(channel_link + '/about')
+            channel_data.update(parse_about_page(about_html, chid,
+                                                 channel_link, self.logger))
+        except PageRequestException as e:
+            e.message = "Metadata extraction failure ( {} )".format(e.message)
+            raise e
+        return channel_data
+
+    def extract_channel(self, chid, channel) -> dict:
+        """
+        Search for the channel and extract its data, the same way
+        Scrapper._extract_channel does with the browser.
+        """
+        # Save the channel name and the search link.
+        channel_data = {'application_name': channel,
+                        'application_link': search_link(channel, self.base_url)}
+        channel_link = self.resolve_channel(chid, channel)
+        channel_data.update(self.extract_channel_page(chid, channel_link))
+        return channel_data
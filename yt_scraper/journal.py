@@ -0,0 +1,230 @@
+import json
+import os
+import re
+import threading
+
+
+class Journal():
+    """
+    Append-only journal of the finished channels, one JSON line each:
+
+        {"chid": "3", "bucket": "scrapped", "data": {...}}
+
+    The lines are flushed right away and fsynced every `batch_size`
+    records, so that a crash loses at most the last batch.
+    """
+
+    def __init__(self, path, batch_size=10) -> None:
+        self.path = path
+        self.batch_size = batch_size
+        self._file = None
+        self._pending = 0
+        self._lock = threading.Lock()
+
+    def load(self) -> dict[str, tuple[str, dict]]:
+        """
+        Rebuild chid -> (bucket, data) from the journal, the last record of
+        a channel wins. A line cut by a crash is ignored.
+        """
+        records = {}
+        try:
+            with open(self.path, 'r', encoding='utf-8') as journal_file:
+                for line in journal_file:
+                    try:
+                        record = json.loads(line)
+                    except json.JSONDecodeError:
+                        continue
+                    records[record['chid']] = (record['bucket'], record['data'])
+        except FileNotFoundError:
+            pass
+        return records
+
+    def append(self, chid, bucket, data):
+        """
+        Journal a finished channel.
+        """
+        line = json.dumps({'chid': chid, 'bucket': bucket, 'data': data},
+                          ensure_ascii=False)
+        with self._lock:
+            if self._file is None:
+                self._file = open(self.path, 'a', encoding='utf-8')
+                # End the line cut by a crash, not to lose the next one.
+                if self._file.tell() and not _ends_with_newline(self.path):
+                    self._file.write('\n')
+            self._file.write(line + '\n')
+            self._file.flush()
+            self._pending += 1
+            if self._pending >= self.batch_size:
+                os.fsync(self._file.fileno())
+                self._pending = 0
+
+    def close(self):
+        """
+        Fsync the last batch and close the journal.
+        """
+        with self._lock:
+            if self._file is not None:
+                self._file.flush()
+                os.fsync(self._file.fileno())
+                self._file.close()
+                self._file = None
+                self._pending = 0
+
+    def clear(self):
+        """
+        Empty the journal, once its records are saved to the outputs.
+        """
+        self.close()
+        with open(self.path, 'w', encoding='utf-8'):
+            pass
+
+
+def _ends_with_newline(file_name) -> bool:
+    with open(file_name, 'rb') as binary_file:
+        binary_file.seek(-1, os.SEEK_END)
+        return binary_file.read(1) == b'\n'
+
+
+def append_to_json_object(file_name, items: dict):
+    """
+    Add items to the JSON object saved (with indent=3) in file_name,
+    writing only the new items. Keys already in the file are written
+    again, and json.load keeps the last value, as dict.update does.
+    """
+    body = json.dumps(items, indent=3, ensure_ascii=False)
+    try:
+        output_file = open(file_name, 'r+b')
+    except FileNotFoundError:
+        output_file = None
+    if output_file is None or os.path.getsize(file_name) == 0:
+        if output_file is not None:
+            output_file.close()
+        with open(file_name, 'w', encoding='utf-8') as new_file:
+            new_file.write(body)
+        return
+    with output_file:
+        # Find the closing brace of the object, and what precedes it.
+        end = output_file.seek(0, os.SEEK_END)
+        tail_size = min(end, 4096)
+        output_file.seek(end - tail_size)
+        tail = output_file.read(tail_size).rstrip()
+        if not tail.endswith(b'}'):
+            raise ValueError("{} is not a JSON object.".format(file_name))
+        closing = end - tail_size + len(tail) - 1
+        is_empty = tail[:-1].rstrip().endswith(b'{')
+        if not items:
+            return
+        inner = body[1:-1].strip('\n')
+        output_file.seek(closing)
+        output_file.write((('\n' if is_empty else ',\n') + inner + '\n}')
+                          .encode('utf-8'))
+        output_file.truncate()
+
+
+_WHITESPACE = re.compile(r'[ \t\n\r]*')
+# What may follow a value of the object.
+_DELIMITER = re.compile(r'[ \t\n\r,:\]}]')
+
+
+class _JsonObjectReader():
+    """
+    Read the items of the JSON object saved in a file, a chunk of the file
+    at a time.
+    """
+
+    def __init__(self, json_file, file_name, chunk_size) -> None:
+        self.file = json_file
+        self.file_name = file_name
+        self.chunk_size = chunk_size
+        self.decoder = json.JSONDecoder()
+        self.text = ''
+        self.position = 0
+
+    def _read(self) -> bool:
+        """
+        Add the next chunk of the file to the text left to read.
+        """
+        chunk = self.file.read(self.chunk_size)
+        if not chunk:
+            return False
+        self.text = self.text[self.position:] + chunk
+        self.position = 0
+        return True
+
+    def _invalid(self):
+        return ValueError("{} is not a JSON object.".format(self.file_name))
+
+    def _skip_whitespace(self):
+        while True:
+            self.position = _WHITESPACE.match(self.text, self.position).end()
+            if self.position < len(self.text) or not self._read():
+                return
+
+    def expect(self, char) -> bool:
+        """
+        Read char if it's next.
+        """
+        self._skip_whitespace()
+        if self.text.startswith(char, self.position):
+            self.position += 1
+            return True
+        return False
+
+    def decode(self):
+        """
+        Read the next JSON value.
+        """
+        self._skip_whitespace()
+        while True:
+            try:
+                value, end = self.decoder.raw_decode(self.text, self.position)
+            except json.JSONDecodeError:
+                # The value may end in the next chunk.
+                if self._read():
+                    continue
+                raise self._invalid()
+            # So may a number, even when its start is a number too ('12.'
+            # of '12.5'), until it's followed by a delimiter.
+            if (isinstance(value, (int, float))
+                    and not _DELIMITER.search(self.text, end)
+                    and self._read()):
+                continue
+            self.position = end
+            return value
+
+    def items(self):
+        if not self.expect('{'):
+            raise self._invalid()
+        if self.expect('}'):
+            return
+        while True:
+            key = self.decode()
+            if not self.expect(':'):
+                raise self._invalid()
+            yield key, self.decode()
+            if self.expect('}'):
+                return
+            if not self.expect(','):
+                raise self._invalid()
+
+
+def _iter_items(file_name, chunk_size):
+    with open(file_name, 'r', encoding='utf-8') as json_file:
+        yield from _JsonObjectReader(json_file, file_name, chunk_size).items()
+
+
+def iter_json_object(file_name, chunk_size=1 << 20):
+    """
+    Yield the (key, value) items of the JSON object saved in file_name, one
+    at a time, without building the whole dict nor reading the whole file.
+
+    A key written several times (see append_to_json_object) is yielded once,
+    with its last value as json.load keeps it, in the place of its last
+    occurrence. The file is read twice: the first pass keeps only the keys.
+    """
+    last_index = {}
+    for index, (key, _) in enumerate(_iter_items(file_name, chunk_size)):
+        last_index[key] = index
+    for index, (key, value) in enumerate(_iter_items(file_name, chunk_size)):
+        if last_index[key] == index:
+            yield key, value
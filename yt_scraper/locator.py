@@ -1,37 +1,81 @@
 import argparse
 import traceback
 import os
-import time
+import threading
+import functools
+import shutil
 
-from selenium import webdriver
+# NOTE: selenium's webdriver, bs4, pandas, urllib3 and asyncio are imported
+# where they are used, so that the commands which don't scrape (status,
+# export, ...) start fast.
 from selenium.webdriver.common.by import By
-from selenium.webdriver.support.ui import WebDriverWait
-from selenium.webdriver.support import expected_conditions as ec
-from selenium.common.exceptions import TimeoutException
+from selenium.common.exceptions import (TimeoutException,
+                                        WebDriverException,
+                                        InvalidSessionIdException,
+                                        NoSuchWindowException)
 
-from urllib3.exceptions import MaxRetryError, ProtocolError
-
-from urllib import parse
-from bs4 import BeautifulSoup
-import re
-
-import pandas as pd
 import json
 
 from yt_scraper.logger import Logger
+from yt_scraper.gazetteer import Gazetteer
+from yt_scraper.cleaning import (extract_phone_numbers, clean_text_from_number,
+                                 extract_links)
+from yt_scraper.exceptions import NoResultsException
+from yt_scraper.search_cache import NO_RESULTS, SearchCache
+from yt_scraper.http_engine import YOUTUBE_URL, search_link
+from yt_scraper.dom_script import DriverCommandCounter, extract_with_script
+from yt_scraper.waits import AdaptiveWaits, all_present
+from yt_scraper.journal import (Journal, append_to_json_object,
+                                iter_json_object)
+from yt_scraper.store import ResultStore, dump_json_object
+from yt_scraper.partitions import (PARTITION_FORMATS, PartitionWriter,
+                                   write_partition, list_partitions,
+                                   compact_partitions)
+from yt_scraper.pipeline import StreamPipeline
+from yt_scraper.metrics import RunMetrics
+from yt_scraper.retries import RetryScheduler, backoff_delay
+from yt_scraper.browser_profiles import (PROFILES, driver_options,
+                                         block_resources)
+from yt_scraper.compiled_inputs import (load_states, load_channels,
+                                        compiled_file_name)
+from yt_scraper.shards import (parse_shard, shard_of, shard_channels,
+                               shard_output_dir)
+from yt_scraper.work_queue import WorkQueue
+from yt_scraper.snapshots import SnapshotArchive
 from yt_scraper.helpers import file_name_timer
 from yt_scraper.inputs import input_data_name, states_input_name
 
 
 EXTRACTION_FAILURE_MSG = "EXTRACTION_FAILED"
 
-WEB_DRIVER = webdriver.Edge
+# The selenium webdriver class used to launch the browsers.
+WEB_DRIVER = 'Edge'
+
+# The messages of the webdriver's errors raised by a dead browser.
+DEAD_DRIVER_MESSAGES = ('chrome not reachable', 'disconnected',
+                        'invalid session id', 'session deleted',
+                        'target window already closed')
 
 WORDS_IN_NUMBERS = ['views', 'view',
                     'subscribers', 'subscriber',
                     'videos', 'video']
 
-indian_units = {'lakh': 100_000, 'crore': 10_000_000}
+# The parts of the channel page to wait for after opening the about dialog,
+# by the name used in the failure messages.
+ABOUT_DIALOG_LOCATORS = {
+    'Metadata': (By.XPATH, '//div[@id="inner-header-container"]'),
+    'Description': (By.XPATH, '//div[@id="description-container"]'),
+    'Links': (By.XPATH, '//div[@id="links-container"]'),
+    'Stats': (By.XPATH, '(//div[@id="right-column"]//yt-formatted-string)[3]')}
+
+# YouTube's error page, shown instead of the about dialog when the about URL
+# of a channel is a 404.
+ERROR_PAGE_LOCATOR = (By.CSS_SELECTOR, '#error-page')
+ERROR_PAGE_TITLE = '404 Not Found'
+
+# The consecutive failures of the direct navigation after which the channel
+# pages are opened by clicks only.
+DIRECT_FAILURES_LIMIT = 5
 
 def find_meta_description(chid, _in: WEB_DRIVER, _id, logger, xpath='*'):
     # Search for element in _in
@@ -42,9 +86,8 @@ def find_meta_description(chid, _in: WEB_DRIVER, _id, logger, xpath='*'):
         if element_list:
             element = element_list[0]
         else :
-            logger.log("Channel {} :: channel handle not found : ''"
-                    "".format(chid),
-                    'WARNING')
+            logger.log("Channel {} :: channel handle not found : ''",
+                       'WARNING', args=(chid,), chid=chid)
             return ""
     elif _id == 'channel-name':
         element = _in.find_element(By.CSS_SELECTOR, '#text.style-scope.ytd-channel-name')
@@ -55,13 +98,13 @@ def find_meta_description(chid, _in: WEB_DRIVER, _id, logger, xpath='*'):
     if element.is_displayed():
         value = element.text
         limit = min(40, len(value))
-        logger.log("Channel {} :: {} found : {}"
-                   "".format(chid, el_name, value[:limit].replace('\n', '\\n')))
+        logger.log("Channel {} :: {} found : {}",
+                   args=(chid, el_name, value[:limit].replace('\n', '\\n')),
+                   chid=chid)
         return value
     # Otherwise use an empty string.
-    logger.log("Channel {} :: {} not found : ''"
-               "".format(chid,el_name),
-               'WARNING')
+    logger.log("Channel {} :: {} not found : ''",
+               'WARNING', args=(chid, el_name), chid=chid)
     return ""
 
 
@@ -72,16 +115,17 @@ def find_links(chid, _in:WEB_DRIVER, _id, logger, xpath='div'):
     el_name = _id.replace('container', '').replace('-', ' ').strip()
     # If it's diplayed, get value.
     if element.is_displayed():
+        from bs4 import BeautifulSoup
         _html = element.get_attribute('innerHTML')
         _soup = BeautifulSoup(_html, 'html.parser')
         _values = _soup.find_all('a', class_='yt-simple-endpoint')
         values = [value['href'] for value in _values]
-        logger.log("Channel {} :: {} found : {}"
-                   "".format(chid, el_name, values))
+        logger.log("Channel {} :: {} found : {}",
+                   args=(chid, el_name, values), chid=chid)
         return values
     # Otherwise use an empty list.
-    logger.log("Channel {} :: No link found."
-                        "".format(chid), 'WARNING')
+    logger.log("Channel {} :: No link found.", 'WARNING', args=(chid,),
+               chid=chid)
     return []
 
 def find_stats(chid, _in: WEB_DRIVER , _id, logger, xpath='div'):
@@ -93,144 +137,145 @@ def find_stats(chid, _in: WEB_DRIVER , _id, logger, xpath='div'):
     joined_on = elements[1].find_elements(By.TAG_NAME, 'span')[-1]
     if joined_on.is_displayed():
         joined_on = joined_on.text
-        logger.log("Channel {} :: joined date found : {}"
-                   "".format(chid, joined_on))
+        logger.log("Channel {} :: joined date found : {}",
+                   args=(chid, joined_on), chid=chid)
     else:
-        logger.log("Channel {} :: joined date not found."
-                   "".format(chid), 'WARNING')
+        logger.log("Channel {} :: joined date not found.", 'WARNING',
+                   args=(chid,), chid=chid)
         joined_on = ""
     # Extract the total views
     ttl_views = elements[2]
     if ttl_views.is_displayed():
         ttl_views = ttl_views.text
-        logger.log("Channel {} :: total views found : {}"
-                   "".format(chid, ttl_views))
+        logger.log("Channel {} :: total views found : {}",
+                   args=(chid, ttl_views), chid=chid)
     else:
-        logger.log("Channel {} :: total views not found."
-                   "".format(chid), 'WARNING')
+        logger.log("Channel {} :: total views not found.", 'WARNING',
+                   args=(chid,), chid=chid)
         ttl_views = ""
     # Return the joined date and the total views as a tuple
     return joined_on, ttl_views
 
 
-class NoResultsException(Exception):
-     
-     def __init__(self, *args: object) -> None:
-         self.message = "No Results Found"
-         super().__init__(*args)
-
-
-
 class Scrapper():
 
     def __init__(self,
                  to_scrape_channels: dict[str, dict],
                  cities_by_states: dict[str, list[str]],
-                 logger=None) -> None:
+                 logger=None,
+                 workers=1,
+                 engine='browser',
+                 concurrency=200,
+                 per_host=None,
+                 rate=20.0,
+                 journal=None,
+                 extraction='dom',
+                 search_cache=None,
+                 dedupe=False,
+                 pipeline=None,
+                 metrics=None,
+                 max_attempts=3,
+                 backoff=2.0,
+                 max_backoff=60.0,
+                 profile='default',
+                 navigation='direct',
+                 snapshots=None,
+                 base_url=YOUTUBE_URL,
+                 waits=None) -> None:
         # Logging configuration.
         self.logger = logger or Logger()
         self.logger.log("Initiate the scrapper object.", _br=True)
         # Scrapper configuartion
-        self.driver = WEB_DRIVER()
-        self.long_wait = WebDriverWait(self.driver, 10)
-        self.short_wait = WebDriverWait(self.driver, 2)
+        self.engine = engine
+        # The site the http engines fetch the pages from (a local server
+        # serving saved pages, when testing).
+        self.base_url = base_url
+        # Cache of the searches (application name -> channel link).
+        self.search_cache = search_cache
+        # Read the channel page element by element (dom), or with one
+        # injected script (script).
+        self.extraction = extraction
+        # Open the channel's about dialog from its URL (direct, falling back
+        # to the clicks), or by clicking the search result and the tagline
+        # (click).
+        self.navigation = navigation
+        self._direct_failures = 0
+        self._navigation_lock = threading.Lock()
+        # The archive of the rendered channel pages (see replay).
+        self.snapshots = snapshots
+        # Count the round-trips to the drivers.
+        self.command_counter = DriverCommandCounter()
+        # Waits adapting their timeouts to the recorded durations (shared by
+        # the scrappers of a work queue's batches).
+        self.waits = waits or AdaptiveWaits()
+        # Timings of the stages, and counts of the channels and failures.
+        self.metrics = metrics or RunMetrics(self.logger)
+        # The browser is launched when the first channel is fetched, with
+        # the options of the profile.
+        self.driver = None
+        self.profile = profile
+        if engine == 'browser':
+            self.metrics.browser_profile = {'name': profile,
+                                            **PROFILES[profile]}
+        if engine == 'http':
+            from yt_scraper.http_engine import HttpEngine
+            # No browser is needed, the pages are fetched directly.
+            self.http_engine = HttpEngine(self.logger, base_url=base_url,
+                                          pool_size=workers,
+                                          search_cache=search_cache)
+        elif engine == 'async':
+            from yt_scraper.scheduler import FetchScheduler
+            self.scheduler = FetchScheduler(self.logger,
+                                            concurrency=concurrency,
+                                            per_host=per_host,
+                                            rate=rate,
+                                            base_url=base_url,
+                                            search_cache=search_cache)
+        # The browsers of the workers.
+        self._drivers = {}
+        self._drivers_lock = threading.Lock()
         self.items_separator = '\n'
+        # Number of workers scrapping in parallel.
+        self.workers = workers
+        # Resolve all the channels first, then scrape each distinct one once.
+        self.dedupe = dedupe
+        # Stream the finished channels to the outputs while scrapping (only
+        # the unscrapped channels are then kept in memory).
+        self.pipeline = pipeline
+        # Journal of the finished channels (to resume after a crash).
+        self.journal = journal
+        # The channels failing for a transient reason (time out, dead
+        # driver) are retried within the run, after an exponential backoff
+        # of `backoff` seconds (doubled at each attempt, up to max_backoff).
+        self.max_attempts = max_attempts
+        self.backoff = backoff
+        self.max_backoff = max_backoff
         # Scarpper initial data
         self._f_to_scrape_channels = to_scrape_channels
         self._f_cities_by_states = cities_by_states
+        # Build the cities and states matcher once.
+        self._gazetteer = Gazetteer(cities_by_states)
         # ...
         self.unscrapped_channels = {}
         self.scrapped_channels = {}
         self.ignored_channels = {}
 
     def extract_phone_numbers(self, about_description):
-        phone_number_pattern = r'[1-9][0-9]{9}|\b\d{5}\s\d{5}\b'
-        phone_numbers = re.findall(phone_number_pattern, about_description)
-        return list({phone.replace(' ', '') for phone in phone_numbers})
-            
-    
+        return extract_phone_numbers(about_description)
+
     def clean_text_from_number(self, text_number, _for='subscribers'):
         """
         Clean a number provided in text with unit.
         """
-        # If text number is empty, return it
-        if not text_number:
-            return ''
-        # Vectorize the text number.
-        text_vector: list = text_number.lower().split()[:-1]
-        # Initiate the unit with 1
-        unit = 1
-        # Remove Lakh and Crore
-        for u_label, u in indian_units.items():
-            if u_label in text_vector:
-                text_vector.remove(u_label)
-                unit = u
-        # Concatenate the remaning elements and remove commas
-        text_number = ' '.join(text_vector).replace(',', '').strip()
-        # Remove K suffix and set unit to one thousand
-        if text_number.endswith('k'):
-            text_number = text_number.removesuffix('k')
-            unit = 1_000
-        # Remove M suffix and set unit to one million
-        elif text_number.endswith('m'):
-            text_number = text_number.removesuffix('m')
-            unit = 1_000_000
-        # Try to convert the text number to a numeric number.
-        try:
-            return int(float(text_number)*unit)
-        except:
-            if text_number == 'no':
-                return 0
-            raise ValueError("{} count could not converted "
-                             "to integer.".format(_for))
+        return clean_text_from_number(text_number, _for)
 
     def extract_city_and_state(self, about_description: str):
-        about_description = about_description.lower()
-        found_states = set()
-        found_cities = set()
-        for state, cities in self._f_cities_by_states.items():
-            state_pattern = '\\b{}[.,;:!?]*\\b'.format(state)
-            _states = re.findall(state_pattern, about_description)
-            for city in cities:
-                city_pattern = '\\b{}[.,;:!?]*\\b'.format(city)
-                _cities = re.findall(city_pattern, about_description)
-                if _cities:
-                    found_cities.update(_cities)
-            if _states:
-                found_states.update(_states)
+        found_cities, found_states = self._gazetteer.find(about_description)
         return {'city': self.items_separator.join(found_cities),
                 'state': self.items_separator.join(found_states)}
 
     def extract_links(self, links_list):
-        telegram_links = []
-        instagram_links = []
-        other_links = []
-        for link in links_list:
-            try:
-                parsed_link = parse.parse_qs(parse.urlparse(link)
-                                                  .query)['q'][0]
-            except KeyError:
-                parsed_link = link
-            if 't.me' in parsed_link:
-                telegram_links.append(parsed_link)
-                continue
-            if 'instagram.com' in parsed_link:
-                instagram_links.append(parsed_link)
-                continue
-            # NOTE: any other social media link, can be detected and then added
-            # to the data in the same way.
-            # E.g. Facebook
-            ###################################################################
-            # if 'facebook.com' in parsed_link:
-            #     facebook_links.append(parsed_link)
-            #     continue
-            ###################################################################
-            other_links.append(parsed_link)
-        # Combine all the links into a ditionary.
-        found_links = {'telegram_links': telegram_links,
-                       'instagram_links': instagram_links,
-                       'other_links': other_links}
-        return found_links
+        return extract_links(links_list)
 
     def save_unscrapped_channels(self, output_dir):
         # output files.
@@ -242,430 +287,1010 @@ class Scrapper():
                       indent=3,
                       ensure_ascii=False)
         # Inform success of saving
-        self.logger.log("Unscrapped channels ({}) saved to {}"
-                        "".format(len(self.unscrapped_channels),
-                                  output_filename),
-                        'INFO')
+        self.logger.log("Unscrapped channels ({}) saved to {}", 'INFO',
+                        args=(len(self.unscrapped_channels), output_filename))
         
     def save_ignored_channels(self, output_dir):
         # output files.
         output_filename = f"{output_dir}\\ignored_channels.json"
 
-        # Read previously ignored_channels
-        try:
-            with open(output_filename, 'r+', encoding='utf-8') as output_file:
-                prev_ignored_channels = json.load(output_file)
-
-            prev_ignored_channels.update(self.ignored_channels)
-        except FileNotFoundError as e:
-            prev_ignored_channels = self.ignored_channels
-
-        # Save the uncleaned data to a json file.
-        with open(output_filename, 'w+', encoding='utf-8') as output_file:
-            json.dump(prev_ignored_channels,
-                      output_file,
-                      indent=3,
-                      ensure_ascii=False)
+        # Add the ignored channels to the previous ones (only the new
+        # channels are written).
+        append_to_json_object(output_filename, self.ignored_channels)
         # Inform success of saving
-        self.logger.log("Channels with no results ({}) saved to {}"
-                        "".format(len(self.ignored_channels),
-                                  output_filename),
-                        'INFO')
+        self.logger.log("Channels with no results ({}) saved to {}", 'INFO',
+                        args=(len(self.ignored_channels), output_filename))
 
     def save_scrapped_channels(self, output_dir):
         # output files.
         uncleaned_output_file = f"{output_dir}\\uncleaned_scrapped_channels.json"
         cleaned_output_file = f"{output_dir}\\cleaned_scrapped_channels.json"
 
-        # Read previously scrapped_channels (uncleaned)
-        try:
-            with open(uncleaned_output_file, 'r+', encoding='utf-8') as output_file:
-                prev_scrapped_channels = json.load(output_file)
-
-            prev_scrapped_channels.update(self.scrapped_channels)
-        except FileNotFoundError as e:
-            prev_scrapped_channels = self.scrapped_channels
-
-        # Save the uncleaned data to a json file.
-        with open(uncleaned_output_file, 'w+', encoding='utf-8') as output_file:
-            json.dump(prev_scrapped_channels,
-                      output_file,
-                      indent=3,
-                      ensure_ascii=False)
+        # Add the uncleaned data to the previous ones (only the new
+        # channels are written).
+        append_to_json_object(uncleaned_output_file, self.scrapped_channels)
 
         # Inform success of saving
-        self.logger.log("Uncleaned scrapped channels saved to {}"
-                        "".format(uncleaned_output_file), 'INFO')
+        self.logger.log("Uncleaned scrapped channels saved to {}", 'INFO',
+                        args=(uncleaned_output_file,))
 
         # Clean the data
-        for chid, channel_data in self.scrapped_channels.items():
-
-            descr = channel_data.get('description')
-            subs = channel_data.get('subscriber_count')
-            links = channel_data.get('other_links')
-            videos = channel_data.get('videos_count')
-            views = channel_data.get('total_views')
-            phone_numbers = self.extract_phone_numbers(descr)
-            found_links = self.extract_links(links)
-            geography = self.extract_city_and_state(descr)
-            subs = self.clean_text_from_number(subs)
-            videos_count = self.clean_text_from_number(videos, 'videos')
-            total_views = self.clean_text_from_number(views, 'views')
-            self.scrapped_channels[chid].update({'phone_numbers': phone_numbers,
-                                                 'subscriber_count': subs,
-                                                 'videos_count': videos_count,
-                                                 'total_views': total_views,
-                                                 **found_links,
-                                                 **geography})
-
-        # Inform the success of cleaning
-        self.logger.log("The scrapped channels ({}) cleaned."
-                        "".format(len(self.scrapped_channels)), 'INFO')
+        self.clean_scrapped_channels()
 
-        try:
-            # Read previously scrapped_channels (cleaned)
-            with open(cleaned_output_file, 'r+', encoding='utf-8') as output_file:
-                prev_scrapped_channels = json.load(output_file)
+        # Add the cleaned data to the previous ones.
+        append_to_json_object(cleaned_output_file, self.scrapped_channels)
+        self.logger.log("The clean scrapped channels saved to {}", 'INFO',
+                        args=(cleaned_output_file,))
 
-            prev_scrapped_channels.update(self.scrapped_channels)
+    def save_to_store(self, store: ResultStore):
+        """
+        Save the results to the store instead of the json files.
+        """
+        store.mark(self.unscrapped_channels, 'unscrapped')
+        store.mark(self.ignored_channels, 'ignored')
+        store.upsert_raw(self.scrapped_channels)
+        self.clean_scrapped_channels()
+        store.upsert_cleaned(self.scrapped_channels)
+        self.logger.log("The scrapped ({}), unscrapped ({}) and ignored ({}) "
+                        "channels saved to {}", 'INFO',
+                        args=(len(self.scrapped_channels),
+                              len(self.unscrapped_channels),
+                              len(self.ignored_channels), store.path))
+
+    def clean_scrapped_channels(self, batch=True):
+        """
+        Clean the scrapped channels in place, all at once (batch), or one
+        channel at a time.
+        """
+        with self.metrics.stage('clean'):
+            if batch:
+                from yt_scraper.batch_cleaning import clean_channels
+                for chid, cleaned_data in clean_channels(self.scrapped_channels,
+                                                         self._gazetteer,
+                                                         self.items_separator).items():
+                    self.scrapped_channels[chid].update(cleaned_data)
+            else:
+                for chid, channel_data in self.scrapped_channels.items():
+                    self.scrapped_channels[chid].update(
+                        self.clean_channel(channel_data))
 
-        except FileNotFoundError as e:
-            prev_scrapped_channels = self.scrapped_channels
+        # Inform the success of cleaning
+        self.logger.log("The scrapped channels ({}) cleaned.", 'INFO',
+                        args=(len(self.scrapped_channels),))
 
-        with open(cleaned_output_file, 'w+', encoding='utf-8') as json_file:
-            json.dump(prev_scrapped_channels,
-                      json_file,
-                      indent=3,
-                      ensure_ascii=False)
-            self.logger.log("The clean scrapped channels saved to {}"
-                            "".format(cleaned_output_file),
-                            'INFO')
+    def clean_channel(self, channel_data):
+        """
+        The cleaned fields of one channel.
+        """
+        descr = channel_data.get('description')
+        subs = channel_data.get('subscriber_count')
+        links = channel_data.get('other_links')
+        videos = channel_data.get('videos_count')
+        views = channel_data.get('total_views')
+        phone_numbers = self.extract_phone_numbers(descr)
+        found_links = self.extract_links(links)
+        geography = self.extract_city_and_state(descr)
+        subs = self.clean_text_from_number(subs)
+        videos_count = self.clean_text_from_number(videos, 'videos')
+        total_views = self.clean_text_from_number(views, 'views')
+        return {'phone_numbers': phone_numbers,
+                'subscriber_count': subs,
+                'videos_count': videos_count,
+                'total_views': total_views,
+                **found_links,
+                **geography}
 
     def to_pandas(self):
         """
         to_pandas
         """
-        # Inform the starting of converting the channels to dataframe.
-        self.logger.log("Converting the scrapped data to a pandas "
-                        "dataframe ...")
-        # intiate a new dictionary to save the data in.
-        new_channels_data, i = {}, 0
-
-        # Loop over all channels, and double any with mupltiple numbers.
-        for index, channel_data in self.scrapped_channels.items():
-
-            # Get all th channel's data except the phone numbers.
-            new_channel_data = {'Application number': index,
-                                'Application name': channel_data.get('application_name'),
-                                'Channel name': channel_data.get('channel_name'),
-                                'Channel ID': channel_data.get('channel_handle'),
-                                'Link': channel_data.get('application_link'),
-                                'Downloads': channel_data.get('downloads', None),
-                                'Console': channel_data.get('console', None),
-                                'Channel Link': channel_data.get('channel_link'),
-                                'Telegram Channel': self.items_separator.join(channel_data.get('telegram_links')),
-                                'Instagram Page': self.items_separator.join(channel_data.get('instagram_links')),
-                                'Subscribers Number': channel_data.get('subscriber_count'),
-                                'Videos Count': channel_data.get('videos_count'),
-                                'Joined Date': channel_data.get('joined_on'),
-                                'Total Views': channel_data.get('total_views'),
-                                'City': channel_data.get('city'),
-                                'State': channel_data.get('state'),
-                                'Websites': self.items_separator.join(channel_data.get('other_links'))}
-
-            # replace phone_numbers, if it an empty list, with ['']
-            phone_numbers = channel_data.get('phone_numbers')
-            if not phone_numbers:
-                phone_numbers = ['']
-
-            # Otherwise, iterate over all phone numbers, and add a new element
-            # (that must used to create a row in the dataframe) for each.
-            for phone_number in phone_numbers:
-                new_channel_data.update({'Contact Number': phone_number})
-                new_channels_data.update({i: new_channel_data.copy()})
-                i += 1
-
-        # return the dataframe.
-        return pd.DataFrame.from_dict(new_channels_data, orient='index')
+        return channels_to_pandas(self.scrapped_channels, self.logger,
+                                  self.items_separator)
 
-    def scrape(self):
+    def _search_channel(self, chid, channel, application_link, driver):
         """
-        scrape
+        Search for the channel, and return the links of the found channels.
         """
-        # Inform starting scrapping the channels.
-        self.logger.log("Start scrapping ...", 'INFO', _br=True)
+        from selenium.webdriver.support import expected_conditions as ec
+        # Get the results to the driver.
+        with self.metrics.stage('search_navigation', chid):
+            driver.get(application_link)
+
+        # Wait the visibility of the list of related channels (or of
+        # the absence of results).
+        with self.metrics.stage('result_wait', chid):
+            try:
+                self.waits.until(driver, 'search_results',
+                                 ec.visibility_of_element_located(
+                                     (By.CLASS_NAME, 'channel-link')))
 
-        if not self._f_to_scrape_channels:
-            self.logger.log("No channel to scrape.", 'INFO', _br=True)
+            # If the time is out, check if the results is not found or
+            # there is another issue.
+            except Exception as e:
 
-        # start scrapping
-        for chid, channel in self._f_to_scrape_channels.items():
+                # Check if the error is raised because of there is no
+                # results to find.
+                try:
+                    # NOTE: promo-title is the class that's displaying "No results found"
+                    self.waits.until(driver, 'no_results',
+                                     ec.visibility_of_element_located(
+                                         (By.CLASS_NAME, 'promo-title')))
+
+                    # find the element whose class name is 'promo-title'
+                    result = driver.find_element(By.CLASS_NAME,
+                                                 'promo-title')
+
+                    # Ensure that the results == 'No results found', and
+                    # if so, raise a NoResultsException exception.
+                    if result.text == 'No results found':
+                        if self.search_cache is not None:
+                            self.search_cache.put(channel, NO_RESULTS)
+                        raise NoResultsException("no results found four channel {}"
+                                                 "".format(chid))
+
+                    # Otherwise, raise the old exception.
+                    e.message = "Channel searching failure ( Time out )"
+                    raise e
+
+                # If the NoResultsException is raise, re-raise it to the outer exception
+                except NoResultsException as e:
+                    raise e
+
+                # If the promo-title class is not found, then the issue was not
+                # a time out.
+                except Exception as e:
+                    e.message = "Time out"
+                    raise e
 
-            # get the channel name
-            channel = channel.get('channel')
+        # If no exception is raised, then search results were found.
+        # Hence, search for the list of dound channels.
+        found_channels_link = driver.find_elements(By.CLASS_NAME,
+                                                   'channel-link')
+        return found_channels_link
 
-            # Use try except to avoid code breaking.
-            self.logger.log(f"Extracting channel {chid} : {channel} ...", _br=True)
+    def _extract_channel(self, chid, channel, driver):
+        """
+        Search for the channel, and extract its data using the given
+        driver. Any failure is raised to the caller.
+        """
+        # The link to use for searching.
+        application_link = search_link(channel)
+
+        # Save the channel name and the search link.
+        channel_data = {'application_name': channel,
+                        'application_link': application_link}
+
+        # Skip the search if its result is cached.
+        cached_link = (self.search_cache.get(channel)
+                       if self.search_cache is not None else None)
+        if cached_link == NO_RESULTS:
+            raise NoResultsException("no results found four channel {} (cached)"
+                                     "".format(chid))
+
+        if cached_link:
+            # Go straight to the channel's page.
+            self.logger.log("Channel {} :: Cached link : {}",
+                            args=(chid, cached_link), chid=chid)
+            self._open_channel_page(chid, driver, cached_link)
+            found_channel = True
+        else:
+            found_channels_link = self._search_channel(chid, channel,
+                                                       application_link,
+                                                       driver)
+            found_channel = bool(found_channels_link)
+            if found_channel and self._direct_route():
+                # Open the first channel from its link, without clicking.
+                self._open_channel_page(
+                    chid, driver,
+                    found_channels_link[0].get_attribute('href')
+                    .removesuffix('/'))
+            elif found_channel:
+                # Click the first element in the list.
+                with self.metrics.stage('click_through', chid):
+                    found_channels_link[0].click()
+                self.command_counter.count_page_load(driver)
+                self.metrics.count_route('click')
+                self._open_about_dialog(chid, driver)
+
+        # If a channel is found, extract its page.
+        if found_channel:
+            self._read_channel_page(chid, driver, channel_data)
+
+            # Cache the result of the search.
+            if self.search_cache is not None and not cached_link:
+                self.search_cache.put(channel, channel_data['channel_link'])
+
+        # Return the final channel's data.
+        return channel_data
+
+    def _direct_route(self):
+        """
+        Whether the channel pages are opened from their URL, until the
+        direct navigation fails DIRECT_FAILURES_LIMIT times in a row.
+        """
+        return (self.navigation == 'direct'
+                and self._direct_failures < DIRECT_FAILURES_LIMIT)
+
+    def _open_channel_page(self, chid, driver, channel_link):
+        """
+        Load the channel's page with its about dialog open: in one load from
+        the about URL (direct navigation), or by loading the channel's page
+        and clicking its tagline (the fallback).
+        """
+        if self._direct_route():
+            from selenium.webdriver.support import expected_conditions as ec
             try:
+                with self.metrics.stage('direct_navigation', chid):
+                    driver.get(channel_link + '/about')
+                    # Stop waiting as soon as the error page shows up.
+                    opened = self.waits.until(
+                        driver, 'direct_about',
+                        ec.any_of(all_present(*ABOUT_DIALOG_LOCATORS.values()),
+                                  ec.presence_of_element_located(
+                                      ERROR_PAGE_LOCATOR),
+                                  ec.title_contains(ERROR_PAGE_TITLE)))
+                # The about dialog's elements, or the error page.
+                failure = None if isinstance(opened, list) else "Error page"
+            except TimeoutException:
+                failure = "Time out"
+            if failure is None:
+                with self._navigation_lock:
+                    self._direct_failures = 0
+                self.metrics.count_route('direct')
+                return
+            with self._navigation_lock:
+                self._direct_failures += 1
+                failures = self._direct_failures
+            self.logger.log("Channel {} :: The direct navigation failed ( {} ), "
+                            "falling back to the clicks.", 'WARNING',
+                            args=(chid, failure), chid=chid)
+            if failures == DIRECT_FAILURES_LIMIT:
+                self.logger.log("The direct navigation failed {} times in a "
+                                "row, the channel pages are opened by clicks "
+                                "from now on.", 'WARNING', args=(failures,))
+        with self.metrics.stage('channel_navigation', chid):
+            driver.get(channel_link)
+        self.metrics.count_route('fallback' if self.navigation == 'direct'
+                                 else 'click')
+        self._open_about_dialog(chid, driver)
+
+    def _open_about_dialog(self, chid, driver):
+        """
+        Click the tagline of the channel's page loaded in the driver, and
+        wait for its about dialog.
+        """
+        from selenium.webdriver.support import expected_conditions as ec
 
-                # The link to use for searching.
-                application_link = ("https://www.youtube.com/results?"
-                               "search_query={}&sp=EgIQAg%253D%253D"
-                               "".format(channel.replace(' ', '+')))
+        ######### UPDATE : AVOID YTB 404 ERROR on about pages
 
-                # Get the results to the driver.
-                self.driver.get(application_link)
+        show_more_locator = (By.CSS_SELECTOR, '.style-scope.ytd-channel-tagline-renderer')
 
-                # Save the channel name and the search link.
-                channel_data = {'application_name': channel,
-                                'application_link': application_link}
+        # Open the about dialog.
+        with self.metrics.stage('about_dialog', chid):
+            show_more_a = self.waits.until(driver, 'tagline',
+                                           ec.presence_of_element_located(show_more_locator))
 
-                # Wait the visibility of the list of related channels.
-                try:
-                    self.long_wait.until(ec.visibility_of_element_located(
-                        (By.CLASS_NAME, 'channel-link')))
+            show_more_a.click()
 
-                # If the time is out, check if the results is not found or
-                # there is another issue.
-                except Exception as e:
+            # Wait for the header and the about dialog together (instead of
+            # sleeping, then waiting for each of them).
+            try:
+                self.waits.until_all(driver, 'about_dialog',
+                                     *ABOUT_DIALOG_LOCATORS.values())
+            except TimeoutException as e:
+                # Report the first part that is still missing.
+                for part, locator in ABOUT_DIALOG_LOCATORS.items():
+                    if not driver.find_elements(*locator):
+                        e.message = ("{} extraction failure ( Time out )"
+                                     "".format(part))
+                        break
+                raise e
+
+    def _read_channel_page(self, chid, driver, channel_data):
+        """
+        Add the data of the channel's about dialog, open in the driver, to
+        channel_data.
+        """
+        # The channel's link, without the about section (direct navigation).
+        targeted_channel_link = driver.current_url.removesuffix('/about')
 
-                    # Check if the error is raised because of there is no
-                    # results to find.
-                    try:
-                        # NOTE: promo-title is the class that's displaying "No results found"
-                        self.short_wait.until(ec.visibility_of_element_located(
-                            (By.CLASS_NAME, 'promo-title')))
-
-                        # find the element whose class name is 'promo-title'
-                        result = self.driver.find_element(By.CLASS_NAME,
-                                                          'promo-title')
-
-                        # Ensure that the results == 'No results found', and
-                        # if so, raise a NoResultsException exception.
-                        if result.text == 'No results found':
-                            raise NoResultsException("no results found four channel {}"
-                                                     "".format(chid))
-
-                        # Otherwise, raise the old exception.
-                        e.message = "Channel searching failure ( Time out )"
-                        raise e
-
-                    # If the NoResultsException is raise, re-raise it to the outer exception
-                    except NoResultsException as e:
-                        raise e
-                    
-                    # If the promo-title class is not found, then the issue was not
-                    # a time out.
-                    except Exception as e:
-                        e.message = "Time out"
-                        raise e
-
-                # If no exception is raised, then search results were found.
-                # Hence, search for the list of dound channels.
-                found_channels_link = self.driver.find_elements(By.CLASS_NAME,
-                                                                'channel-link')
-
-                # If the list is not empty, target the first element in it.
-                if found_channels_link:
-
-                    ######### UPDATE : AVOID YTB 404 ERROR on about pages
-
-                    found_channel = found_channels_link[0]
-                    found_channel.click()
-
-                    show_more_locator = (By.CSS_SELECTOR, '.style-scope.ytd-channel-tagline-renderer')
-
-                    self.long_wait.until(ec.presence_of_element_located(show_more_locator))
-
-                    show_more_a = self.driver.find_element(*show_more_locator)
-
-                    show_more_a.click()
-
-                    time.sleep(0.5)
-
-                    #####################################################
-
-                    # Target the first channel found, and extract its link to use it
-                    # as the targeted link.
-                    # targeted_channel_link = (found_channels_link[0]
-                    #                          .get_attribute('href'))
-
-                    targeted_channel_link = self.driver.current_url.removesuffix('/about')
-
-                    self.logger.log("Channel {} :: Targeting link : {}"
-                                    "".format(chid, targeted_channel_link))
-
-                    # Add this link to the channel's scrapped data.
-                    channel_data.update(
-                        {'channel_link': targeted_channel_link})
-                    
-                    # Direct the self.driver to the channel's about section.
-                    # self.driver.get(targeted_channel_link + '/about')
-
-                    try: # Extract channel's metadata ################################
-
-                        # Locate channel's header
-                        header_locator = (By.XPATH, '//div[@id="inner-header-container"]')
-                        # Wait for the presence of the header.
-                        self.long_wait.until(ec.presence_of_element_located(header_locator))
-                        # Get the header content
-                        header_container = self.driver.find_element(*header_locator)
-                        
-                        # Search in the header for the channel's name
-                        channel_name = find_meta_description(chid, header_container,
-                                                        "channel-name",
-                                                        self.logger)
-
-                        # Search in the header for the channel's subscriber count
-                        subscriber_count = find_meta_description(chid, header_container,
-                                                            "subscriber-count",
-                                                            self.logger)
-                        
-                        # Search in the header for the channel's videos count
-                        videos_count = find_meta_description(chid, header_container,
-                                                        "videos-count",
-                                                        self.logger)
-
-                        # Search in the header for the channel's handle
-                        channel_handle = find_meta_description(chid, header_container,
-                                                          "channel-handle",
-                                                          self.logger)
-                        
-                        # Add channel name to the channel's scrapped data.
-                        channel_data.update({'channel_name': channel_name})
-                        # Add channel's subscriber count to the channel's scrapped data.
-                        channel_data.update({'subscriber_count': subscriber_count})
-                        # Add channel's videos count to the channel's scrapped data.
-                        channel_data.update({'videos_count': videos_count})
-                        # Add channel handle to the channel's scrapped data.
-                        channel_data.update({'channel_handle': channel_handle})
-
-                    # If failed, raise an exception
-                    except Exception as e:
-                        # Customize the exception message
-                        e.message = ("Metadata extraction failure ( Time out )"
-                                     if isinstance(e, TimeoutException)
-                                     else "Metadata extraction failure")
-                        # Raise the exception
-                        raise e
-                    
-                    try: # Extract channel's description ################################
-
-                        # Locate channel's description
-                        description_locator = (By.XPATH, '//div[@id="description-container"]')
-                        # Wait for the presence of the description.
-                        self.short_wait.until(ec.presence_of_element_located(description_locator))
-                        # Get the description content
-                        description = find_meta_description(chid, self.driver,
-                                                       'description-container',
-                                                       self.logger, 'div')
-                        # Add description to the channel's scrapped data.
-                        channel_data.update({'description': description})
+        self.logger.log("Channel {} :: Targeting link : {}",
+                        args=(chid, targeted_channel_link), chid=chid)
 
-                    except Exception as e:
-                        # Customize the exception message
-                        e.message = ("Description extraction failure ( Time out )"
-                                     if isinstance(e, TimeoutException)
-                                     else "Description extraction failure")
-                        # Raise the exception
-                        raise e
-                    
-                    try:  # Extract channel's related links ################################
-
-                        # Locate channel's related links
-                        links_locator = (By.XPATH, '//div[@id="links-container"]')
-                        # Wait for the presence of the links-container
-                        self.short_wait.until(ec.presence_of_element_located(links_locator))
-                        # Get the links.
-                        links = find_links(chid, self.driver,
-                                           'links-container',
-                                           self.logger)
-                        # Add found links to the channel's scrapped data.
-                        channel_data.update({'other_links': links})
+        # Add this link to the channel's scrapped data.
+        channel_data.update(
+            {'channel_link': targeted_channel_link})
 
-                    except Exception as e:
-                        # Customize the exception message
-                        e.message = ("Links extraction failure ( Time out )"
-                                     if isinstance(e, TimeoutException)
-                                     else "Links extraction failure")
-                        # Raise the exception
-                        raise e
-                    
-                    try:  # Extract channel's stats ################################
-
-                        # Locate channel's stats
-                        stats_locator = (By.XPATH, '//div[@id="right-column"]')
-                        # Wait for the presence of the right-column
-                        self.short_wait.until(ec.presence_of_element_located(stats_locator))
-                        # Get the total views and the joined date.
-                        joined_on, total_views = find_stats(chid, self.driver,
-                                                            'right-column',
-                                                            self.logger)
-                        # Add found stats to the channel's scrapped data.
-                        channel_data.update({'joined_on': joined_on,
-                                             'total_views': total_views})
+        # Save the rendered page, to extract it again offline.
+        if self.snapshots is not None:
+            with self.metrics.stage('snapshot', chid):
+                self.snapshots.put(chid, targeted_channel_link,
+                                   driver.page_source)
+
+        if self.extraction == 'script':
+            try:
+                # The page is ready, read it at once.
+                with self.metrics.stage('script', chid):
+                    channel_data.update(extract_with_script(chid, driver,
+                                                            self.logger))
+            except TimeoutException as e:
+                e.message = "Metadata extraction failure ( Time out )"
+                raise e
+            return channel_data
+
+        try: # Extract channel's metadata ################################
+
+            with self.metrics.stage('header', chid):
+                # Get the header content (already present)
+                header_container = driver.find_element(
+                    *ABOUT_DIALOG_LOCATORS['Metadata'])
+
+                # Search in the header for the channel's name
+                channel_name = find_meta_description(chid, header_container,
+                                                "channel-name",
+                                                self.logger)
+
+                # Search in the header for the channel's subscriber count
+                subscriber_count = find_meta_description(chid, header_container,
+                                                    "subscriber-count",
+                                                    self.logger)
+
+                # Search in the header for the channel's videos count
+                videos_count = find_meta_description(chid, header_container,
+                                                "videos-count",
+                                                self.logger)
+
+                # Search in the header for the channel's handle
+                channel_handle = find_meta_description(chid, header_container,
+                                                  "channel-handle",
+                                                  self.logger)
+
+                # Add channel name to the channel's scrapped data.
+                channel_data.update({'channel_name': channel_name})
+                # Add channel's subscriber count to the channel's scrapped data.
+                channel_data.update({'subscriber_count': subscriber_count})
+                # Add channel's videos count to the channel's scrapped data.
+                channel_data.update({'videos_count': videos_count})
+                # Add channel handle to the channel's scrapped data.
+                channel_data.update({'channel_handle': channel_handle})
+
+        # If failed, raise an exception
+        except Exception as e:
+            # Customize the exception message
+            e.message = ("Metadata extraction failure ( Time out )"
+                         if isinstance(e, TimeoutException)
+                         else "Metadata extraction failure")
+            # Raise the exception
+            raise e
+
+        try: # Extract channel's description ################################
+
+            with self.metrics.stage('description', chid):
+                # Get the description content
+                description = find_meta_description(chid, driver,
+                                                    'description-container',
+                                                    self.logger, 'div')
+                # Add description to the channel's scrapped data.
+                channel_data.update({'description': description})
+
+        except Exception as e:
+            # Customize the exception message
+            e.message = ("Description extraction failure ( Time out )"
+                         if isinstance(e, TimeoutException)
+                         else "Description extraction failure")
+            # Raise the exception
+            raise e
+
+        try:  # Extract channel's related links ################################
+
+            with self.metrics.stage('links', chid):
+                # Get the links.
+                links = find_links(chid, driver,
+                                   'links-container',
+                                   self.logger)
+                # Add found links to the channel's scrapped data.
+                channel_data.update({'other_links': links})
+
+        except Exception as e:
+            # Customize the exception message
+            e.message = ("Links extraction failure ( Time out )"
+                         if isinstance(e, TimeoutException)
+                         else "Links extraction failure")
+            # Raise the exception
+            raise e
+
+        try:  # Extract channel's stats ################################
+
+            with self.metrics.stage('stats', chid):
+                # Get the total views and the joined date.
+                joined_on, total_views = find_stats(chid, driver,
+                                                    'right-column',
+                                                    self.logger)
+                # Add found stats to the channel's scrapped data.
+                channel_data.update({'joined_on': joined_on,
+                                     'total_views': total_views})
+
+        except Exception as e:
+            # Customize the exception message
+            e.message = ("Stats extraction failure ( Time out )"
+                         if isinstance(e, TimeoutException)
+                         else "Stats extraction failure")
+            # Raise the exception
+            raise e
+
+        #####################################################################################################
+
+        # Return the final channel's data.
+        return channel_data
+
+    def _scrape_channel(self, chid, channel, extract):
+        """
+        Scrape one channel using the extract function, and return the name
+        of the bucket it falls in ('scrapped', 'ignored', 'unscrapped',
+        'timed_out' or 'aborted') with its data.
+        """
+        # Use try except to avoid code breaking.
+        self.logger.log("Extracting channel {} : {} ...", _br=True,
+                        args=(chid, channel), chid=chid)
+        try:
+            with self.metrics.stage('channel', chid):
+                channel_data = extract(chid, channel)
+
+            # Inform the success of scrapping.
+            self.logger.log("Extracting the channel '{}' finished "
+                            "successfully.", 'INFO', args=(channel,),
+                            chid=chid)
+            return 'scrapped', channel_data
+
+        except Exception as e:
+            return self._failed_channel(chid, channel, e)
+
+    async def _scrape_channel_async(self, chid, channel, extract):
+        """
+        Same as _scrape_channel, for an asynchronous extract function.
+        """
+        self.logger.log("Extracting channel {} : {} ...", _br=True,
+                        args=(chid, channel), chid=chid)
+        try:
+            with self.metrics.stage('channel', chid):
+                channel_data = await extract(chid, channel)
+
+            # Inform the success of scrapping.
+            self.logger.log("Extracting the channel '{}' finished "
+                            "successfully.", 'INFO', args=(channel,),
+                            chid=chid)
+            return 'scrapped', channel_data
+
+        except Exception as e:
+            return self._failed_channel(chid, channel, e)
+
+    def _failed_channel(self, chid, channel, e):
+        """
+        Log the failure of a channel (must be called while handling e), and
+        return the bucket it falls in with its data.
+        """
+        from urllib3.exceptions import MaxRetryError, ProtocolError
+        # The driver is dead (the browser is closed or crashed).
+        if (isinstance(e, (MaxRetryError, ProtocolError,
+                           InvalidSessionIdException, NoSuchWindowException))
+                or (isinstance(e, WebDriverException)
+                    and not isinstance(e, TimeoutException)
+                    and any(message in str(e.msg).lower()
+                            for message in DEAD_DRIVER_MESSAGES))):
+            self.metrics.count_failure(type(e).__name__)
+            # Log the error
+            self.logger.log(traceback.format_exc(limit=10), 'ERROR', True)
+            return 'aborted', {'channel': channel,
+                               'reason': "Driver failure ( {} )"
+                                         "".format(type(e).__name__)}
+
+        # If any exception or error is raized, skip the channel.
+        elif isinstance(e, NoResultsException):
+            self.metrics.count_failure("No results found")
+            # Log a warning message to inform that no results found.
+            self.logger.log("Channel '{}' is ignored : {}.", 'WARNING',
+                            args=(channel, e.message), chid=chid)
+            return 'ignored', {'channel': channel}
+
+        else:
+            # Ensure the message
+            if hasattr(e, 'message'):
+                msg = e.message
+            else:
+                msg = type(e).__name__
+            self.metrics.count_failure(msg)
+            # Log the error
+            self.logger.log(traceback.format_exc(limit=10), 'ERROR', True)
+            # Log a warning message to inform that a TimeoutException
+            # raised.
+            self.logger.log("Channel '{}' is skipped : {}.", 'WARNING',
+                            args=(channel, msg), chid=chid, reason=msg)
+            # A time out may not happen again.
+            bucket = ('timed_out'
+                      if (isinstance(e, (TimeoutException, TimeoutError))
+                          or getattr(e, 'transient', False))
+                      else 'unscrapped')
+            return bucket, {'channel': channel, 'reason': msg}
+
+    def _new_driver(self):
+        """
+        Launch a new browser.
+        """
+        from selenium import webdriver
+        driver = getattr(webdriver, WEB_DRIVER)(
+            options=driver_options(webdriver, WEB_DRIVER, self.profile))
+        block_resources(driver, self.profile)
+        return self.command_counter.wrap(driver)
+
+    def _worker_driver(self, worker_id):
+        """
+        The browser of a worker, launched on its first use. The first
+        worker's browser is the scrapper's driver.
+        """
+        with self._drivers_lock:
+            driver = self._drivers.get(worker_id)
+        if driver is None:
+            driver = self._new_driver()
+            with self._drivers_lock:
+                self._drivers[worker_id] = driver
+            if worker_id == 0:
+                self.driver = driver
+        return driver
+
+    def _drop_driver(self, worker_id):
+        """
+        Quit the dead browser of a worker, a new one is launched for its
+        next channel.
+        """
+        with self._drivers_lock:
+            driver = self._drivers.pop(worker_id, None)
+        if worker_id == 0:
+            self.driver = None
+        if driver is not None:
+            try:
+                driver.quit()
+            except Exception:
+                pass
+        self.logger.log("Worker {} :: The browser is replaced by a new one.",
+                        'WARNING', args=(worker_id,))
+
+    def _failed_launch(self, chid, channel, e):
+        """
+        Log the failure to launch a worker's browser (must be called while
+        handling e). The channel is aborted: it's retried like the ones of
+        a dead browser.
+        """
+        msg = "Browser launch failure ( {} )".format(type(e).__name__)
+        self.metrics.count_failure(msg)
+        self.logger.log(traceback.format_exc(limit=10), 'ERROR', True)
+        self.logger.log("Channel '{}' is skipped : {}.", 'WARNING',
+                        args=(channel, msg), chid=chid, reason=msg)
+        return 'aborted', {'channel': channel, 'reason': msg}
+
+    def _quit_drivers(self):
+        """
+        Close all the browsers.
+        """
+        with self._drivers_lock:
+            drivers, self._drivers = list(self._drivers.values()), {}
+        self.driver = None
+        for driver in drivers:
+            driver.quit()
+
+    def _resolve_channel(self, chid, channel, driver):
+        """
+        Return the link of the channel found when searching for channel
+        (None if the results hold no channel link).
+        """
+        cached_link = (self.search_cache.get(channel)
+                       if self.search_cache is not None else None)
+        if cached_link == NO_RESULTS:
+            raise NoResultsException("no results found four channel {} (cached)"
+                                     "".format(chid))
+        if cached_link:
+            return cached_link
+        application_link = search_link(channel)
+        found_channels_link = self._search_channel(chid, channel,
+                                                   application_link, driver)
+        if not found_channels_link:
+            return None
+        channel_link = (found_channels_link[0].get_attribute('href')
+                        .removesuffix('/'))
+        if self.search_cache is not None:
+            self.search_cache.put(channel, channel_link)
+        self.logger.log("Channel {} :: Resolved link : {}",
+                        args=(chid, channel_link), chid=chid)
+        return channel_link
+
+    def _extract_page(self, chid, channel_link, driver):
+        """
+        Load the channel's page, and return its data.
+        """
+        self._open_channel_page(chid, driver, channel_link)
+        return self._read_channel_page(chid, driver, {})
 
+    def _task_function(self, task, driver=None):
+        """
+        The function running a task ('channel', 'resolve' or 'page') with
+        the scrapper's engine.
+        """
+        if self.engine == 'async':
+            return {'channel': self.scheduler.extract_channel,
+                    'resolve': self.scheduler.resolve_channel,
+                    'page': self.scheduler.extract_channel_page}[task]
+        if self.engine == 'http':
+            return {'channel': self.http_engine.extract_channel,
+                    'resolve': self.http_engine.resolve_channel,
+                    'page': self.http_engine.extract_channel_page}[task]
+        function = {'channel': self._extract_channel,
+                    'resolve': self._resolve_channel,
+                    'page': self._extract_page}[task]
+        return functools.partial(function, driver=driver)
+
+    def _retry_later(self, key, value, attempt, delay):
+        """
+        Log the retry of a transient failure in delay seconds, and return
+        whether it's retried (the delay is None at the last attempt).
+        """
+        if delay is None:
+            return False
+        self.metrics.count_retry()
+        self.logger.log("Channel '{}' is retried in {:.1f} s (attempt {}/{}).",
+                        'WARNING', args=(value, delay, attempt + 2,
+                                         self.max_attempts), chid=key)
+        return True
+
+    def _worker(self, worker_id, scheduler: RetryScheduler, record, task):
+        """
+        Pull items from the shared scheduler and run the task on them, until
+        they are all done. The transient failures are put back in the
+        scheduler, and a dead browser is replaced by a new one (a browser
+        failing to launch aborts the channel, which is retried too).
+        """
+        driver, extract = None, None
+        while (item := scheduler.get()) is not None:
+            chid, channel, attempt = item
+            try:
+                # Launch the browser for the first channel only (the http
+                # workers share the engine's connections pool).
+                if extract is None:
+                    try:
+                        driver = (self._worker_driver(worker_id)
+                                  if self.engine == 'browser' else None)
                     except Exception as e:
-                        # Customize the exception message
-                        e.message = ("Stats extraction failure ( Time out )"
-                                     if isinstance(e, TimeoutException)
-                                     else "Stats extraction failure")
-                        # Raise the exception
-                        raise e
-                    
-                    #####################################################################################################
-
-                # Add the final channel's data to channels_data.
-                self.scrapped_channels.update({chid: channel_data})
-
-                # Inform the success of scrapping.
-                self.logger.log("Extracting the channel '{}' finished "
-                                "successfully.".format(channel), 'INFO')
-                
-            except (MaxRetryError, ProtocolError) as e:
-                # Log the error
-                self.logger.log(traceback.format_exc(limit=10), 'ERROR', True)
-                break
-
-
-            # If any exception or error is raized, skip the channel.
-            except NoResultsException as e:
-                # Log a warning message to inform that no results found.
-                self.logger.log("Channel '{}' is ignored : {}."
-                                "".format(channel, e.message), 'WARNING')
-                # Add the channels to ignored_channels channels.
-                self.ignored_channels.update({chid: {'channel': channel}})
+                        bucket, channel_data = self._failed_launch(chid,
+                                                                   channel, e)
+                    else:
+                        extract = self._task_function(task, driver)
+                if extract is not None:
+                    commands = self.command_counter.count(driver)
+                    page_loads = self.command_counter.page_loads(driver)
+                    bucket, channel_data = self._scrape_channel(chid, channel,
+                                                                extract)
+                    if driver is not None:
+                        page_loads = (self.command_counter.page_loads(driver)
+                                      - page_loads)
+                        self.logger.log(
+                            "Channel {} :: {} driver round-trips, {} page "
+                            "load(s)",
+                            args=(chid,
+                                  self.command_counter.count(driver) - commands,
+                                  page_loads),
+                            chid=chid, page_loads=page_loads)
+                    # A dead browser is replaced for the next channel.
+                    if bucket == 'aborted' and driver is not None:
+                        self._drop_driver(worker_id)
+                        driver, extract = None, None
+                # A transient failure is final at the last attempt only.
+                if bucket in ('timed_out', 'aborted'):
+                    if self._retry_later(chid, channel, attempt,
+                                         scheduler.retry(chid, channel,
+                                                         attempt)):
+                        continue
+                    bucket = 'unscrapped'
+                record(chid, bucket, channel_data)
+            finally:
+                scheduler.task_done()
+
+    def _run_workers(self, items: dict, task, record):
+        """
+        Run the task on every item (key -> value) with the workers, and call
+        record(key, bucket, data) with the final result of each.
+        """
+        # The asyncio scheduler keeps many lookups in flight on one thread.
+        if self.engine == 'async':
+            import asyncio
+            extract = self._task_function(task)
+
+            async def on_item(key, value):
+                for attempt in range(self.max_attempts):
+                    bucket, data = await self._scrape_channel_async(
+                        key, value, extract)
+                    if bucket not in ('timed_out', 'aborted'):
+                        break
+                    delay = (backoff_delay(attempt, self.backoff,
+                                           self.max_backoff)
+                             if attempt + 1 < self.max_attempts else None)
+                    if not self._retry_later(key, value, attempt, delay):
+                        bucket = 'unscrapped'
+                        break
+                    await asyncio.sleep(delay)
+                record(key, bucket, data)
+
+            asyncio.run(self.scheduler.run(items, on_item))
+            return
+
+        scheduler = RetryScheduler(items, self.max_attempts, self.backoff,
+                                   self.max_backoff)
+
+        # Never launch more browsers than items.
+        workers = max(1, min(self.workers, len(items)))
+        if workers == 1:
+            self._worker(0, scheduler, record, task)
+        else:
+            threads = [threading.Thread(target=self._worker,
+                                        args=(worker_id, scheduler, record,
+                                              task),
+                                        name=f"scrapper-worker-{worker_id}")
+                       for worker_id in range(workers)]
+            for thread in threads:
+                thread.start()
+            for thread in threads:
+                thread.join()
+        if scheduler.retries:
+            self.logger.log("{} retry(ies) of the transient failures.", 'INFO',
+                            args=(scheduler.retries,))
+
+    def _scrape_deduplicated(self, channels: dict, results):
+        """
+        Resolve every application name to its channel link first, then
+        scrape each distinct channel once, and copy its data to every
+        application pointing at it.
+        """
+        # Resolve the links.
+        resolved = {}
+
+        def record_link(chid, bucket, channel_link):
+            if bucket == 'scrapped':
+                resolved[chid] = channel_link
+            else:
+                self._record(results, chid, bucket, channel_link)
+
+        self._run_workers(channels, 'resolve', record_link)
+
+        # Group the applications by channel.
+        applications_by_link = {}
+        for chid, channel_link in resolved.items():
+            if channel_link is None:
+                # No channel to scrape, keep only the search.
+                channel = channels[chid]
+                self._record(results, chid, 'scrapped',
+                             {'application_name': channel,
+                              'application_link': search_link(channel)})
                 continue
-
-            except Exception as e:
-                # Ensure the message
-                if hasattr(e, 'message'):
-                    msg = e.message
+            applications_by_link.setdefault(channel_link, []).append(chid)
+        self.logger.log("{} application(s) resolved to {} distinct "
+                        "channel(s).", 'INFO',
+                        args=(len(resolved), len(applications_by_link)))
+
+        # Scrape each channel once.
+        def record_page(channel_link, bucket, page_data):
+            for chid in applications_by_link[channel_link]:
+                channel = channels[chid]
+                if bucket == 'scrapped':
+                    channel_data = {'application_name': channel,
+                                    'application_link': search_link(channel),
+                                    **page_data}
+                elif bucket == 'unscrapped':
+                    channel_data = {'channel': channel,
+                                    'reason': page_data['reason']}
                 else:
-                    msg = type(e).__name__
-                # Log the error
-                self.logger.log(traceback.format_exc(limit=10), 'ERROR', True)
-                # Log a warning message to inform that a TimeoutException
-                # raised.
-                self.logger.log("Channel '{}' is skipped : {}."
-                                "".format(channel, msg, 'WARNING'))
-                # Add the channels to unscrapped_channels channels.
-                self.unscrapped_channels.update({chid: {'channel': channel,
-                                                        'reason': msg}})
-
-        # Close the browser.
-        self.driver.quit()
+                    channel_data = {'channel': channel}
+                self._record(results, chid, bucket, channel_data)
+
+        self._run_workers({channel_link: channel_link
+                           for channel_link in applications_by_link},
+                          'page', record_page)
+
+    def _record(self, results, chid, bucket, channel_data):
+        """
+        Save the result of a channel, and journal it right away.
+        """
+        if self.journal is not None:
+            self.journal.append(chid, bucket, channel_data)
+        self.metrics.count_channel(bucket)
+        self._keep(results, chid, bucket, channel_data)
+
+    def _keep(self, results, chid, bucket, channel_data):
+        """
+        Keep the result of a channel, or send it down the pipeline.
+        """
+        # dict item assignment is atomic, no lock is needed.
+        if self.pipeline is None or bucket == 'unscrapped':
+            results[chid] = (bucket, channel_data)
+        else:
+            results[chid] = (bucket, None)
+        if self.pipeline is not None:
+            self.pipeline.put(chid, bucket, channel_data)
+
+    def _resume(self, results):
+        """
+        Load the channels already done from the journal into results,
+        and return the number of channels resumed.
+        """
+        if self.journal is None:
+            return 0
+        resumed = 0
+        for chid, (bucket, channel_data) in self.journal.load().items():
+            # Only the failed channels are scrapped again.
+            if chid in self._f_to_scrape_channels and bucket != 'unscrapped':
+                self._keep(results, chid, bucket, channel_data)
+                resumed += 1
+        self.logger.log("{} channel(s) resumed from {}", 'INFO',
+                        args=(resumed, self.journal.path))
+        return resumed
+
+    def _merge_results(self, results):
+        """
+        Add the workers' results to the scrapped, unscrapped and ignored
+        channels, in the order of the channels to scrape.
+        """
+        # Inform the use of the searches cache.
+        if self.search_cache is not None:
+            self.logger.log("Searches cache : {} hit(s), {} miss(es)", 'INFO',
+                            args=(self.search_cache.hits,
+                                  self.search_cache.misses))
+        buckets = {'scrapped': self.scrapped_channels,
+                   'unscrapped': self.unscrapped_channels,
+                   'ignored': self.ignored_channels}
+        for chid, channel in self._f_to_scrape_channels.items():
+            if chid in results:
+                bucket, channel_data = results[chid]
+                # The streamed channels are already saved.
+                if channel_data is not None:
+                    buckets[bucket].update({chid: channel_data})
+            else:
+                # Keep the channels left by an aborted scrapping.
+                self._keep(results, chid, 'unscrapped',
+                           {'channel': channel.get('channel'),
+                            'reason': "Scrapping aborted"})
+                self.unscrapped_channels.update({chid: results[chid][1]})
+
+    def scrape(self):
+        """
+        scrape
+        """
+        # Inform starting scrapping the channels.
+        self.logger.log("Start scrapping ...", 'INFO', _br=True)
+
+        if not self._f_to_scrape_channels:
+            self.logger.log("No channel to scrape.", 'INFO', _br=True)
+
+        # Skip the channels already journaled by a previous run.
+        results = {}
+        resumed = self._resume(results)
+        channels = {chid: channel.get('channel')
+                    for chid, channel in self._f_to_scrape_channels.items()
+                    if chid not in results}
+
+        if self.engine == 'async':
+            self.logger.log("Scrapping with up to {} lookups in flight.",
+                            'INFO', args=(self.scheduler.concurrency,))
+        else:
+            self.logger.log("Scrapping with {} worker(s).", 'INFO',
+                            args=(max(1, min(self.workers, len(channels))),))
+
+        # start scrapping
+        self.metrics.start()
+        commands = self.command_counter.count()
+        page_loads = self.command_counter.page_loads()
+        try:
+            if self.dedupe:
+                self._scrape_deduplicated(channels, results)
+            else:
+                self._run_workers(channels, 'channel',
+                                  functools.partial(self._record, results))
+        finally:
+            # Fsync the last journaled channels.
+            if self.journal is not None:
+                self.journal.close()
+            # Close the browsers.
+            self._quit_drivers()
+            self.metrics.stop()
+            self.metrics.driver_commands += (self.command_counter.count()
+                                             - commands)
+            self.metrics.page_loads += (self.command_counter.page_loads()
+                                        - page_loads)
+
+        # Merge the results, whatever the worker that handled each channel.
+        self._merge_results(results)
+
+        # Inform the number of round-trips to the drivers.
+        if self.engine == 'browser':
+            self.logger.log("Driver round-trips ({} extraction) : {} for {} "
+                            "channel(s)", 'INFO',
+                            args=(self.extraction,
+                                  self.command_counter.count(),
+                                  len(results) - resumed))
+            self.logger.log("Page loads ({} navigation) : {} for {} "
+                            "channel(s)", 'INFO',
+                            args=(self.navigation,
+                                  self.command_counter.page_loads(),
+                                  len(results) - resumed))
+        if self.snapshots is not None:
+            self.logger.log("Snapshots : {} page(s) saved to {}, {} already "
+                            "archived", 'INFO',
+                            args=(self.snapshots.saved, self.snapshots.path,
+                                  self.snapshots.deduplicated))
 
         # Inform the end of scrapping.
         self.logger.log("Scrapping finished.\n", 'INFO', _br=True)
 
 
+def channels_to_pandas(scrapped_channels, logger, items_separator='\n'):
+    """
+    Convert the cleaned channels to a dataframe, with a row for each
+    phone number.
+    """
+    # Inform the starting of converting the channels to dataframe.
+    logger.log("Converting the scrapped data to a pandas "
+               "dataframe ...")
+    import pandas as pd
+    # intiate a new dictionary to save the data in.
+    new_channels_data, i = {}, 0
+
+    # Loop over all channels, and double any with mupltiple numbers.
+    for index, channel_data in scrapped_channels.items():
+
+        # Get all th channel's data except the phone numbers.
+        new_channel_data = {'Application number': index,
+                            'Application name': channel_data.get('application_name'),
+                            'Channel name': channel_data.get('channel_name'),
+                            'Channel ID': channel_data.get('channel_handle'),
+                            'Link': channel_data.get('application_link'),
+                            'Downloads': channel_data.get('downloads', None),
+                            'Console': channel_data.get('console', None),
+                            'Channel Link': channel_data.get('channel_link'),
+                            'Telegram Channel': items_separator.join(channel_data.get('telegram_links')),
+                            'Instagram Page': items_separator.join(channel_data.get('instagram_links')),
+                            'Subscribers Number': channel_data.get('subscriber_count'),
+                            'Videos Count': channel_data.get('videos_count'),
+                            'Joined Date': channel_data.get('joined_on'),
+                            'Total Views': channel_data.get('total_views'),
+                            'City': channel_data.get('city'),
+                            'State': channel_data.get('state'),
+                            'Websites': items_separator.join(channel_data.get('other_links'))}
+
+        # replace phone_numbers, if it an empty list, with ['']
+        phone_numbers = channel_data.get('phone_numbers')
+        if not phone_numbers:
+            phone_numbers = ['']
+
+        # Otherwise, iterate over all phone numbers, and add a new element
+        # (that must used to create a row in the dataframe) for each.
+        for phone_number in phone_numbers:
+            new_channel_data.update({'Contact Number': phone_number})
+            new_channels_data.update({i: new_channel_data.copy()})
+            i += 1
+
+    # return the dataframe.
+    return pd.DataFrame.from_dict(new_channels_data, orient='index')
+
+
+def inputs_cache_dir(output_dir):
+    """
+    The directory of the compiled inputs (package/cache).
+    """
+    return '\\'.join(output_dir.split('\\')[:-1]) + "\\cache"
+
+
 def read_unscrapped_channels(output_dir, logger) -> dict:
     """
     Read the unscrapped channels' names from unscrapped_channels.json
     """
     channels_file_name = f"{output_dir}\\unscrapped_channels.json"
-    logger.log(f"Reading the channels' names from {channels_file_name}.")
+    logger.log("Reading the channels' names from {}.",
+               args=(channels_file_name,))
     with open(channels_file_name,
               'r+', encoding='utf-8') as unscrapped_channels_file:
         unscrapped_channels: dict = json.load(unscrapped_channels_file)
@@ -678,14 +1303,32 @@ def read_cleaned_states(output_dir, logger):
     Read the cleaned cities by states from cities_by_states.json
     """
     states_file_name = f"{output_dir}\\cities_by_states.json"
-    logger.log(f"Reading the states and cities from {states_file_name}.")
-    with open(states_file_name,
-              'r+', encoding='utf-8') as states_file:
-        states: dict = json.load(states_file)
+    logger.log("Reading the states and cities from {}.",
+               args=(states_file_name,))
+
+    def read_json():
+        with open(states_file_name,
+                  'r+', encoding='utf-8') as states_file:
+            return json.load(states_file)
+
+    # The states are read from the compiled cache, while the file is the same.
+    states: dict = load_states(states_file_name, inputs_cache_dir(output_dir),
+                               read_json, logger)
     # Return the unscrapped channels names.
     return states
 
 
+def read_states_excel(input_file_name) -> dict[str, list[str]]:
+    """
+    Read the cities by states from the states excel file (lower case).
+    """
+    import pandas as pd
+    states = (pd.read_excel(input_file_name, usecols=[1, 2])
+              .iloc[:-2, :].applymap(str.lower)
+              .rename(columns={'Name of City': 'City'}))
+    return states.groupby('State').agg(list).squeeze().to_dict()
+
+
 def output_states_to_json(output_dir, logger):
     """
     Read states and cities from the excel file, and save
@@ -695,11 +1338,12 @@ def output_states_to_json(output_dir, logger):
     input_file_name = ('\\'.join(output_dir.split('\\')[:-1])
                        + f"\\input\\{states_input_name}")
     # Log
-    logger.log(f"Reading the states and cities from {input_file_name} ...")
-    states = (pd.read_excel(input_file_name, usecols=[1, 2])
-              .iloc[:-2, :].applymap(str.lower)
-              .rename(columns={'Name of City': 'City'}))
-    states = states.groupby('State').agg(list).squeeze().to_dict()
+    logger.log("Reading the states and cities from {} ...",
+               args=(input_file_name,))
+
+    # The excel file is parsed again only when it changes.
+    states = load_states(input_file_name, inputs_cache_dir(output_dir),
+                         lambda: read_states_excel(input_file_name), logger)
     # Save it under the name cities_by_states.json
     output_file = f"{output_dir}\\cities_by_states.json"
     with open(output_file, 'w+', encoding='utf-8') as o_file:
@@ -721,12 +1365,21 @@ def output_channels_to_json(output_dir, logger):
     input_file_name = ('\\'.join(output_dir.split('\\')[:-1])
                        + f"\\input\\{input_data_name}")
     # Log
-    logger.log(f"Reading the channels' names from {input_file_name} ...")
-    excel_data = (pd.read_excel(input_file_name)
-                  .rename(columns={'Application name': 'channel'}))
-    excel_data.index = excel_data.index.astype(str)
-    # Convert it to a dictionary (json)
-    unscrapped_channels = excel_data.loc[:, ['channel']].to_dict('index')
+    logger.log("Reading the channels' names from {} ...",
+               args=(input_file_name,))
+
+    def read_excel():
+        import pandas as pd
+        excel_data = (pd.read_excel(input_file_name)
+                      .rename(columns={'Application name': 'channel'}))
+        excel_data.index = excel_data.index.astype(str)
+        # Convert it to a dictionary (json)
+        return excel_data.loc[:, ['channel']].to_dict('index')
+
+    # The excel file is parsed again only when it changes.
+    unscrapped_channels = load_channels(input_file_name,
+                                        inputs_cache_dir(output_dir),
+                                        read_excel, logger)
     # Save it under the name unscrapped_channels.json
     output_file = f"{output_dir}\\unscrapped_channels.json"
     with open(output_file, 'w+', encoding='utf-8') as o_file:
@@ -737,6 +1390,459 @@ def output_channels_to_json(output_dir, logger):
     return unscrapped_channels
 
 
+def export_store(store: ResultStore, output_dir, logger):
+    """
+    Export the store to the json files and to output.xlsx.
+    """
+    logger.log("Exporting {} ...", 'INFO', args=(store.path,))
+    exports = {'uncleaned_scrapped_channels.json': store.iter_channels(cleaned=False),
+               'cleaned_scrapped_channels.json': store.iter_channels(cleaned=True),
+               'unscrapped_channels.json': store.iter_queue('todo', 'unscrapped'),
+               'ignored_channels.json': store.iter_queue('ignored')}
+    for file_name, items in exports.items():
+        dump_json_object(items, f"{output_dir}\\{file_name}")
+        logger.log("{} exported.", 'INFO', args=(file_name,))
+    # Save the dataframe into excel file.
+    xl_output_file = f"{output_dir}\\output.xlsx"
+    channels_dataframe = channels_to_pandas(dict(store.iter_channels()), logger)
+    channels_dataframe.to_excel(xl_output_file,
+                                sheet_name='main',
+                                index=False)
+    logger.log("The cleaned dataframe saved to {}", 'INFO',
+               args=(xl_output_file,))
+
+
+def reclean_outputs(output_dir, logger, store=None, output='excel',
+                    partition_format='csv', processes=None, chunk_size=1_000):
+    """
+    Clean all the raw scrapped channels again, over a pool of processes,
+    and rewrite the cleaned outputs, without scrapping: the store's cleaned
+    channels, or cleaned_scrapped_channels.json and output.xlsx (or the
+    output partitions).
+    """
+    from yt_scraper.reclean import reclean_channels
+    # The workers read the states from their compiled cache.
+    read_cleaned_states(output_dir, logger)
+    compiled_states_file = compiled_file_name(
+        inputs_cache_dir(output_dir), 'states',
+        f"{output_dir}\\cities_by_states.json")
+
+    if store is not None:
+        raw_channels = store.iter_channels(cleaned=False)
+        logger.log("Recleaning the channels of {} ...", 'INFO',
+                   args=(store.path,))
+    else:
+        uncleaned_file = f"{output_dir}\\uncleaned_scrapped_channels.json"
+        raw_channels = iter_json_object(uncleaned_file)
+        logger.log("Recleaning the channels of {} ...", 'INFO',
+                   args=(uncleaned_file,))
+    cleaned_chunks = reclean_channels(raw_channels, compiled_states_file,
+                                      processes, chunk_size)
+
+    count = 0
+    if store is not None:
+        for cleaned_channels in cleaned_chunks:
+            store.upsert_cleaned(cleaned_channels)
+            count += len(cleaned_channels)
+        logger.log("{} channel(s) recleaned to {} (see export)", 'INFO',
+                   args=(count, store.path))
+        return count
+
+    # The new rows are written to their own directory first, the previous
+    # outputs are replaced at the end only.
+    reclean_dir = f"{output_dir}\\reclean"
+    os.makedirs(reclean_dir, exist_ok=True)
+    for file_name in list_partitions(reclean_dir):
+        os.remove(file_name)
+    partitions = PartitionWriter(reclean_dir, partition_format)
+
+    def cleaned_items():
+        nonlocal count
+        for cleaned_channels in cleaned_chunks:
+            partitions.write(channels_to_pandas(cleaned_channels, logger))
+            count += len(cleaned_channels)
+            yield from cleaned_channels.items()
+
+    cleaned_file = f"{output_dir}\\cleaned_scrapped_channels.json"
+    dump_json_object(cleaned_items(), f"{cleaned_file}.tmp")
+    partitions.close()
+    os.replace(f"{cleaned_file}.tmp", cleaned_file)
+    logger.log("{} channel(s) recleaned to {}", 'INFO',
+               args=(count, cleaned_file))
+
+    replace_tabular_output(output_dir, reclean_dir, output, logger)
+    return count
+
+
+def replace_tabular_output(output_dir, work_dir, output, logger):
+    """
+    Replace output.xlsx (or the output partitions) by the partitions written
+    to work_dir, and remove it.
+    """
+    if output == 'excel':
+        compact_partitions(work_dir, f"{output_dir}\\output.xlsx", logger)
+        for file_name in list_partitions(work_dir):
+            os.remove(file_name)
+    else:
+        for file_name in list_partitions(output_dir):
+            os.remove(file_name)
+        for file_name in list_partitions(work_dir):
+            os.replace(file_name, os.path.join(output_dir,
+                                               os.path.basename(file_name)))
+    os.rmdir(work_dir)
+
+
+def replay_outputs(output_dir, archive: SnapshotArchive, logger, store=None,
+                   output='excel', partition_format='csv', processes=None,
+                   chunk_size=1_000):
+    """
+    Extract the archived channel pages again, over a pool of processes,
+    update the raw scrapped channels with their fields (the store's, or
+    uncleaned_scrapped_channels.json), then clean them again (see
+    reclean_outputs). The channels without a snapshot are left as they are.
+    """
+    from yt_scraper.reclean import iter_chunks
+    from yt_scraper.replay import PARSER, replay_snapshots
+    snapshots = archive.latest()
+    logger.log("Replaying the {} snapshot(s) of {} (parser : {}) ...", 'INFO',
+               args=(len(snapshots), archive.path, PARSER))
+    digest_by_key = {key: snapshot['digest']
+                     for key, snapshot in snapshots.items()}
+    digest_by_link = {snapshot['url']: snapshot['digest']
+                      for snapshot in snapshots.values()}
+    extracted, failures = {}, {}
+    for chunk in replay_snapshots(archive.path, digest_by_key.values(),
+                                  processes):
+        for digest, (channel_data, reason) in chunk.items():
+            if channel_data is None:
+                failures[reason] = failures.get(reason, 0) + 1
+            else:
+                extracted[digest] = channel_data
+    if failures:
+        logger.log("Snapshots not extracted : {}", 'WARNING', args=(failures,))
+
+    replayed = 0
+
+    def replayed_channels(raw_channels):
+        nonlocal replayed
+        for chid, channel_data in raw_channels:
+            # A deduplicated channel is archived under its link.
+            digest = (digest_by_key.get(chid)
+                      or digest_by_link.get(channel_data.get('channel_link')))
+            if digest in extracted:
+                channel_data = {**channel_data, **extracted[digest]}
+                replayed += 1
+            yield chid, channel_data
+
+    if store is not None:
+        for chunk in iter_chunks(replayed_channels(
+                store.iter_channels(cleaned=False)), chunk_size):
+            store.upsert_raw(dict(chunk))
+    else:
+        uncleaned_file = f"{output_dir}\\uncleaned_scrapped_channels.json"
+        dump_json_object(replayed_channels(iter_json_object(uncleaned_file)),
+                         f"{uncleaned_file}.tmp")
+        os.replace(f"{uncleaned_file}.tmp", uncleaned_file)
+    logger.log("{} channel(s) replayed from the snapshots", 'INFO',
+               args=(replayed,))
+    reclean_outputs(output_dir, logger, store, output, partition_format,
+                    processes, chunk_size)
+    return replayed
+
+
+def init_shard_output(output_dir, shard_dir, shard, logger):
+    """
+    Copy the channels of the shard, and the cities and states, from the
+    output directory to the shard's one, before its first run.
+    """
+    channels_file = f"{shard_dir}\\unscrapped_channels.json"
+    if not os.path.exists(channels_file):
+        count = dump_json_object(
+            ((chid, channel) for chid, channel
+             in iter_json_object(f"{output_dir}\\unscrapped_channels.json")
+             if shard_of(chid, shard[1]) == shard[0]),
+            channels_file)
+        logger.log("{} channel(s) of the shard {}/{} copied to {}", 'INFO',
+                   args=(count, *shard, channels_file))
+    states_file = f"{shard_dir}\\cities_by_states.json"
+    if not os.path.exists(states_file):
+        shutil.copyfile(f"{output_dir}\\cities_by_states.json", states_file)
+
+
+# The json outputs of the shards, merged by the merge command.
+MERGED_FILES = ['uncleaned_scrapped_channels.json',
+                'unscrapped_channels.json',
+                'ignored_channels.json']
+
+
+def merge_shards(output_dir, shards, logger, output='excel',
+                 partition_format='csv'):
+    """
+    Merge the outputs of the shards (see --shard) into the output directory,
+    in one streaming pass: the shards' json files are read one after the
+    other, an item at a time, and output.xlsx (or the output partitions) is
+    built from the merged cleaned channels.
+    """
+    shard_dirs = [shard_output_dir(output_dir, index, shards)
+                  for index in range(shards)]
+    for shard_dir in shard_dirs:
+        if not os.path.isdir(shard_dir):
+            logger.log("The shard {} is missing.", 'WARNING',
+                       args=(shard_dir,))
+
+    def merged_items(file_name):
+        for shard_dir in shard_dirs:
+            shard_file = f"{shard_dir}\\{file_name}"
+            if os.path.exists(shard_file):
+                yield from iter_json_object(shard_file)
+
+    counts = {}
+    for file_name in MERGED_FILES:
+        merged_file = f"{output_dir}\\{file_name}"
+        counts[file_name] = dump_json_object(merged_items(file_name),
+                                             f"{merged_file}.tmp")
+        os.replace(f"{merged_file}.tmp", merged_file)
+        logger.log("{} channel(s) merged to {}", 'INFO',
+                   args=(counts[file_name], merged_file))
+
+    # The cities and states, needed by reclean.
+    states_file = f"{shard_dirs[0]}\\cities_by_states.json"
+    if os.path.exists(states_file):
+        shutil.copyfile(states_file, f"{output_dir}\\cities_by_states.json")
+
+    # The rows are written to their own directory first.
+    merge_dir = f"{output_dir}\\merge"
+    os.makedirs(merge_dir, exist_ok=True)
+    for file_name in list_partitions(merge_dir):
+        os.remove(file_name)
+    partitions = PartitionWriter(merge_dir, partition_format)
+
+    def cleaned_items(chunk_size=1_000):
+        chunk = {}
+        for chid, channel_data in merged_items('cleaned_scrapped_channels.json'):
+            chunk[chid] = channel_data
+            if len(chunk) >= chunk_size:
+                partitions.write(channels_to_pandas(chunk, logger))
+                yield from chunk.items()
+                chunk = {}
+        if chunk:
+            partitions.write(channels_to_pandas(chunk, logger))
+            yield from chunk.items()
+
+    cleaned_file = f"{output_dir}\\cleaned_scrapped_channels.json"
+    counts['cleaned_scrapped_channels.json'] = dump_json_object(
+        cleaned_items(), f"{cleaned_file}.tmp")
+    partitions.close()
+    os.replace(f"{cleaned_file}.tmp", cleaned_file)
+    logger.log("{} channel(s) merged to {}", 'INFO',
+               args=(counts['cleaned_scrapped_channels.json'], cleaned_file))
+    replace_tabular_output(output_dir, merge_dir, output, logger)
+    return counts
+
+
+def print_status(output_dir, store_file, logger):
+    """
+    Print the number of channels left to scrape, scrapped, unscrapped and
+    ignored, from the store or from the json files.
+    """
+    counts = {}
+    if os.path.exists(store_file):
+        store = ResultStore(store_file)
+        counts.update(store.status_counts())
+        store.close()
+    else:
+        files = {'todo or unscrapped': 'unscrapped_channels.json',
+                 'ignored': 'ignored_channels.json',
+                 'scrapped': 'uncleaned_scrapped_channels.json'}
+        for status, file_name in files.items():
+            try:
+                with open(f"{output_dir}\\{file_name}",
+                          'r', encoding='utf-8') as json_file:
+                    counts[status] = len(json.load(json_file))
+            except FileNotFoundError:
+                counts[status] = 0
+    # The channels finished, but not saved yet.
+    journal = Journal(f"{output_dir}\\journal.jsonl")
+    counts['journaled'] = len(journal.load())
+    counts['partitions'] = len(list_partitions(output_dir))
+    # The channels of the shared work queue, by status.
+    work_queue_file = f"{output_dir}\\work_queue.sqlite3"
+    if os.path.exists(work_queue_file):
+        work_queue = WorkQueue(work_queue_file, logger=logger)
+        counts.update({f"queue {status}": count
+                       for status, count in work_queue.counts().items()})
+        work_queue.close()
+    for status, count in counts.items():
+        print(f"{status:<20}: {count}")
+    logger.log("Status : {}", 'INFO', args=(counts,))
+    return counts
+
+
+def stream_saver(output_dir, logger, store=None, partitions=None,
+                 items_separator='\n'):
+    """
+    The function saving each streamed batch, to the store, or to the json
+    files and the output partitions. The unscrapped channels are saved at
+    the end of the run, as without streaming.
+    """
+    def save(batch):
+        if store is not None:
+            store.mark(batch['unscrapped'], 'unscrapped')
+            store.mark(batch['ignored'], 'ignored')
+            store.upsert_raw(batch['scrapped'])
+            store.upsert_cleaned(batch['cleaned'])
+            return
+        append_to_json_object(f"{output_dir}\\ignored_channels.json",
+                              batch['ignored'])
+        append_to_json_object(f"{output_dir}\\uncleaned_scrapped_channels.json",
+                              batch['scrapped'])
+        append_to_json_object(f"{output_dir}\\cleaned_scrapped_channels.json",
+                              batch['cleaned'])
+        if batch['cleaned']:
+            partitions.write(channels_to_pandas(batch['cleaned'], logger,
+                                                items_separator))
+    return save
+
+
+def save_results(scrapper: Scrapper, output_dir, journal: Journal, logger,
+                 output='excel', partition_format='csv', restart=False,
+                 store=None, partitions=None):
+    """
+    Save the results of the scrapping to the outputs (the json files and
+    output.xlsx or a partition, or the store), then clear the journal.
+    """
+    # The streamed channels are saved, only the unscrapped ones are left.
+    if scrapper.pipeline is not None:
+        if store is None:
+            scrapper.save_unscrapped_channels(output_dir)
+            for partition_file in partitions.close():
+                logger.log("The cleaned dataframe saved to {}", 'INFO',
+                           args=(partition_file,))
+        else:
+            store.close()
+        journal.clear()
+        return
+
+    # Save the results to the store, they are exported with the export
+    # command.
+    if store is not None:
+        scrapper.save_to_store(store)
+        store.close()
+        journal.clear()
+        return
+
+    # Save unscrapped channels it to a json file.
+    scrapper.save_unscrapped_channels(output_dir)
+    
+    # Save channels with no results it to a json file.
+    scrapper.save_ignored_channels(output_dir)
+
+    # Save unscrapped channels it to a json file.
+    scrapper.save_scrapped_channels(output_dir)
+
+    # Convert the cleaned data into a pandas dataframe.
+    channels_dataframe = scrapper.to_pandas()
+
+    # Save only this run's rows, the excel file is built by compact.
+    if output == 'partitions':
+        partition_file = write_partition(channels_dataframe, output_dir,
+                                         partition_format)
+        logger.log("The cleaned dataframe saved to {}", 'INFO',
+                   args=(partition_file,))
+        journal.clear()
+        return
+
+    # Save the dataframe into excel file.
+    xl_output_file = f"{output_dir}\\output.xlsx"
+
+    # First, check if current run is the starting one,
+    # i.g. the file is already exists, and the new results
+    # must be concatenated to it.
+    if not restart:
+        import pandas as pd
+        # If so, read the file.
+        prev_channels_dataframe = pd.read_excel(xl_output_file,
+                                                sheet_name='main')
+        # And then concatenate it with the new results.
+        channels_dataframe = pd.concat([prev_channels_dataframe,
+                                        channels_dataframe])
+    # Save the final results to the file.
+    channels_dataframe.to_excel(xl_output_file,
+                                sheet_name='main',
+                                index=False)
+
+    # Inform the success of saving to excel.
+    logger.log("The cleaned dataframe saved to {}", 'INFO',
+               args=(xl_output_file,))
+
+    # All the journaled channels are saved now.
+    journal.clear()
+
+
+def scrape_work_queue(work_queue: WorkQueue, store: ResultStore, new_scrapper,
+                      logger, lease_size=100):
+    """
+    Lease batches of channels from the shared queue, scrape them with a new
+    scrapper (new_scrapper(to_scrape_channels=...)), save them to the store
+    and acknowledge them (the unscrapped ones are set aside as failed), until
+    the queue is empty. The leases are renewed while the batch is scrapped,
+    and the ones left are released at the end.
+    """
+    logger.log("Leasing the channels from {} as {} ...", 'INFO',
+               args=(work_queue.path, work_queue.owner))
+    work_queue.start_heartbeat()
+    batches = 0
+    try:
+        while channels := work_queue.lease(lease_size):
+            logger.log("{} channel(s) leased (batch {}).", 'INFO',
+                       args=(len(channels), batches + 1))
+            scrapper = new_scrapper(to_scrape_channels=channels)
+            scrapper.scrape()
+            scrapper.save_to_store(store)
+            acked = (work_queue.ack([*scrapper.scrapped_channels,
+                                     *scrapper.ignored_channels])
+                     + work_queue.fail(scrapper.unscrapped_channels))
+            if acked < len(channels):
+                logger.log("{} channel(s) of the batch were taken over by "
+                           "another process (expired lease).", 'WARNING',
+                           args=(len(channels) - acked,))
+            batches += 1
+    finally:
+        work_queue.release()
+        logger.log("{} batch(es) done, {} expired lease(s) taken over, "
+                   "queue : {}", 'INFO',
+                   args=(batches, work_queue.reclaimed, work_queue.counts()))
+        work_queue.close()
+    return batches
+
+
+def save_wait_stats(waits: AdaptiveWaits, output_dir, logger):
+    """
+    Save the statistics of the waits.
+    """
+    wait_stats_file = f"{output_dir}\\wait_stats_{file_name_timer()}.json"
+    waits.save(wait_stats_file)
+    logger.log("The waits statistics saved to {}", 'INFO',
+               args=(wait_stats_file,))
+
+
+def save_run_report(metrics: RunMetrics, output_dir, logger, timer=None):
+    """
+    Save the report of the run, as json and as a Prometheus text file.
+    """
+    timer = timer or file_name_timer()
+    report_file = f"{output_dir}\\run_report_{timer}.json"
+    metrics.save(report_file)
+    prometheus_file = f"{output_dir}\\run_metrics_{timer}.prom"
+    metrics.save_prometheus(prometheus_file)
+    report = metrics.report()
+    logger.log("{} channel(s) in {:.0f} s ({:.1f} per minute), report saved "
+               "to {} and {}", 'INFO',
+               args=(report['channels'], report['scrapping_seconds'] or 0,
+                     report['channels_per_minute'] or 0, report_file,
+                     prometheus_file))
+
+
 def truncate_output_directory(output_dir, logger):
     """
     Truncate the output directory and re-create the json
@@ -746,7 +1852,7 @@ def truncate_output_directory(output_dir, logger):
     """
     # get all the file names in the directory
     file_names = os.listdir(output_dir)
-    logger.log("Truncating the {} directory ...".format(output_dir))
+    logger.log("Truncating the {} directory ...", args=(output_dir,))
     # loop through each file name and remove it
     for file_name in file_names:
         if not file_name.endswith('.log'):
@@ -765,6 +1871,31 @@ def parse_arguments():
     Arguments parser.
     """
     parser = argparse.ArgumentParser(description='YouTube scrapping')
+    # Add the command argument.
+    parser.add_argument('command', nargs='?', default='scrape',
+                        choices=['scrape', 'export', 'compact', 'status',
+                                 'reclean', 'merge', 'replay'],
+                        help=('Scrape the channels (default), export the '
+                              'results store to the json and excel files, '
+                              'compact the output partitions into output.xlsx, '
+                              'show the progress of the scrapping, clean '
+                              'the raw scrapped channels again, merge the '
+                              'outputs of the shards, or extract the archived '
+                              'pages again'))
+    # Add output argument.
+    parser.add_argument('--output', choices=['excel', 'partitions'],
+                        default='excel',
+                        help=('Rewrite output.xlsx with the new rows, or save '
+                              'them as a new partition (see compact)'))
+    parser.add_argument('--partition_format', choices=PARTITION_FORMATS,
+                        default='csv',
+                        help='The format of the output partitions')
+    # Add backend argument.
+    parser.add_argument('--backend', choices=['json', 'sqlite'],
+                        default='json',
+                        help=('Save the results to the json and excel files, '
+                              'or to a sqlite store (exported with the '
+                              'export command)'))
     # Add restart argument.
     parser.add_argument('--restart', action='store_true',
                         help=('Indicates whether to restart the scrapping '
@@ -778,6 +1909,103 @@ def parse_arguments():
     # Add end channel argument.
     parser.add_argument('--end_with', type=int, default=None,
                         help='The index of channel to end with (used only in testing mode)')
+    # Add the sharding arguments.
+    parser.add_argument('--shard', type=parse_shard, default=None,
+                        help=('Scrape only the shard i of N (given as i/N, '
+                              'with 0 <= i < N) of the channels, to the '
+                              'output_shard_i_of_N directory'))
+    parser.add_argument('--shards', type=int, default=None,
+                        help='The number of shards to merge (merge)')
+    # Add the work queue arguments.
+    parser.add_argument('--work_queue', action='store_true',
+                        help=('Lease the channels in batches from a queue '
+                              'shared with the other scrapper processes '
+                              '(sqlite backend)'))
+    parser.add_argument('--lease_size', type=int, default=100,
+                        help='The number of channels leased at once (work queue)')
+    parser.add_argument('--lease_seconds', type=float, default=300.0,
+                        help=('The time after which the channels of a '
+                              'process that stopped renewing its lease are '
+                              'leased again (work queue)'))
+    # Add workers argument.
+    parser.add_argument('--workers', type=int, default=1,
+                        help='The number of workers scrapping in parallel')
+    # Add retries arguments.
+    parser.add_argument('--max_attempts', type=int, default=3,
+                        help=('The number of attempts of a channel failing '
+                              'for a transient reason (time out, dead browser)'))
+    parser.add_argument('--backoff', type=float, default=2.0,
+                        help=('The delay (seconds) before the first retry of '
+                              'a channel, doubled at each attempt'))
+    parser.add_argument('--max_backoff', type=float, default=60.0,
+                        help='The longest delay (seconds) before a retry')
+    # Add navigation argument.
+    parser.add_argument('--navigation', choices=['direct', 'click'],
+                        default='direct',
+                        help=('Open the channel pages from their about URL '
+                              '(falling back to the clicks), or by clicking '
+                              'the search result and the tagline (browser '
+                              'engine)'))
+    # Add profile argument.
+    parser.add_argument('--profile', choices=list(PROFILES), default='default',
+                        help=('The browser profile : as launched without '
+                              'options (default), or headless without images, '
+                              'media and heavy resources (light)'))
+    # Add refresh cache argument.
+    parser.add_argument('--refresh_cache', '--refresh-cache',
+                        action='store_true',
+                        help=('Search for all the channels again, without '
+                              'reading the searches cache'))
+    # Add stream argument.
+    parser.add_argument('--stream', action='store_true',
+                        help=('Clean and save the channels while the next '
+                              'ones are scrapped (the rows are saved as '
+                              'partitions)'))
+    # Add dedupe argument.
+    parser.add_argument('--dedupe', action='store_true',
+                        help=('Resolve all the channels first, then scrape '
+                              'each distinct channel only once'))
+    # Add extraction argument.
+    parser.add_argument('--extraction', choices=['dom', 'script'],
+                        default='dom',
+                        help=('Read the channel page element by element, or '
+                              'with one injected script (browser engine)'))
+    # Add engine argument.
+    parser.add_argument('--engine', choices=['browser', 'http', 'async'],
+                        default='browser',
+                        help=('Scrape with the browser, or fetch the pages '
+                              'and read their embedded data (http), with '
+                              'many lookups in flight (async)'))
+    # Add the asyncio scheduler arguments.
+    parser.add_argument('--concurrency', type=int, default=200,
+                        help='The number of lookups in flight (async engine)')
+    parser.add_argument('--per_host', type=int, default=None,
+                        help=('The number of requests in flight per host, '
+                              'the number of lookups in flight by default '
+                              '(async engine)'))
+    parser.add_argument('--rate', type=float, default=20.0,
+                        help='The number of requests per second (async engine)')
+    parser.add_argument('--base_url', default=YOUTUBE_URL,
+                        help=('The site the pages are fetched from (http and '
+                              'async engines), e.g. a local server serving '
+                              'saved pages'))
+    # Add snapshots argument.
+    parser.add_argument('--snapshots', action='store_true',
+                        help=('Save the rendered channel pages to the '
+                              'snapshots archive, to extract them again '
+                              'offline (replay)'))
+    # Add the reclean arguments.
+    parser.add_argument('--processes', type=int, default=None,
+                        help='The number of cleaning processes (reclean, replay)')
+    parser.add_argument('--chunk_size', type=int, default=1_000,
+                        help='The number of channels per cleaning task (reclean, replay)')
+    # Add the logging arguments.
+    parser.add_argument('--log_level', choices=list(Logger.levels),
+                        default='DEBUG',
+                        help='The records under this level are not written')
+    parser.add_argument('--json_log', action='store_true',
+                        help=('Write the records to a JSON-lines file too, '
+                              'with their chid, stage and duration'))
     # Parse the arguments.
     args = parser.parse_args()
     # Retuen them.
@@ -809,10 +2037,80 @@ def run():
     output_dir = (f"{curr_dir}\\output_test"
                   if is_test
                   else f"{curr_dir}\\output")
-
-    log_output = f"{output_dir}\\log_output_{file_name_timer()}.log"
-
-    logger = Logger(out=log_output)
+    # The output directory of the whole input (a shard's first run reads its
+    # channels from it, and the shards' outputs are merged to it).
+    main_output_dir = output_dir
+    # Each shard has its own output directory.
+    if args.shard is not None and args.command != 'merge':
+        output_dir = shard_output_dir(output_dir, *args.shard)
+        os.makedirs(output_dir, exist_ok=True)
+
+    # The processes sharing the work queue write their own logs and reports.
+    timer = (f"{file_name_timer()}_{os.getpid()}" if args.work_queue
+             else file_name_timer())
+    log_output = f"{output_dir}\\log_output_{timer}.log"
+    json_log_output = (f"{output_dir}\\log_output_{timer}.jsonl"
+                       if args.json_log else None)
+
+    logger = Logger(out=log_output, level=args.log_level,
+                    json_out=json_log_output)
+
+    # The results store (sqlite backend only).
+    store_file = f"{output_dir}\\results.sqlite3"
+
+    # Build output.xlsx from the partitions, without scrapping.
+    if args.command == 'compact':
+        compact_partitions(output_dir, f"{output_dir}\\output.xlsx", logger)
+        return
+
+    # Show the progress, without scrapping.
+    if args.command == 'status':
+        print_status(output_dir, store_file, logger)
+        return
+
+    # Clean the raw results again, without scrapping.
+    if args.command == 'reclean':
+        store = ResultStore(store_file) if args.backend == 'sqlite' else None
+        try:
+            reclean_outputs(output_dir, logger, store, args.output,
+                            args.partition_format, args.processes,
+                            args.chunk_size)
+        finally:
+            if store is not None:
+                store.close()
+        return
+
+    # The archive of the rendered channel pages, kept across the restarts.
+    snapshots_dir = f"{curr_dir}\\snapshots"
+
+    # Extract the archived pages again, without scrapping.
+    if args.command == 'replay':
+        store = ResultStore(store_file) if args.backend == 'sqlite' else None
+        try:
+            replay_outputs(output_dir, SnapshotArchive(snapshots_dir), logger,
+                           store, args.output, args.partition_format,
+                           args.processes, args.chunk_size)
+        finally:
+            if store is not None:
+                store.close()
+        return
+
+    # Merge the outputs of the shards, without scrapping.
+    if args.command == 'merge':
+        shards = args.shards or (args.shard[1] if args.shard else None)
+        if not shards:
+            raise SystemExit("The merge command needs the number of shards "
+                             "(--shards N).")
+        merge_shards(main_output_dir, shards, logger, args.output,
+                     args.partition_format)
+        return
+
+    # Export the store, without scrapping.
+    if args.command == 'export':
+        store = ResultStore(store_file)
+        export_store(store, output_dir, logger)
+        store.close()
+        return
 
     # Initial data
     channels = None
@@ -823,9 +2121,36 @@ def run():
     # and hence all the files needed to be truncated.
     if args.restart:
         channels, states = truncate_output_directory(output_dir, logger)
+        # Keep only the channels of the shard.
+        if args.shard is not None:
+            channels = shard_channels(channels, *args.shard)
+            dump_json_object(channels.items(),
+                             f"{output_dir}\\unscrapped_channels.json")
+    elif args.shard is not None:
+        init_shard_output(main_output_dir, output_dir, args.shard, logger)
+
+    store = None
+    if args.backend == 'sqlite':
+        store = ResultStore(store_file)
+        # The channels are read from the store's queue. An empty store is
+        # filled from unscrapped_channels.json first, as the json backend
+        # reads it.
+        if not channels and not store.status_counts():
+            unscrapped_file = f"{output_dir}\\unscrapped_channels.json"
+            if not os.path.exists(unscrapped_file):
+                raise SystemExit(f"The store {store_file} is empty and "
+                                 f"{unscrapped_file} is missing, fill the "
+                                 f"store with --restart.")
+            channels = read_unscrapped_channels(output_dir, logger)
+            logger.log("The empty store is filled with {} channel(s).", 'INFO',
+                       args=(len(channels),))
+        if channels:
+            store.enqueue(channels)
+        logger.log("Read the channels' names from {}.\n", args=(store_file,))
+        channels = store.pending_channels()
 
     # Ensure channels' names are loaded.
-    if not channels:
+    if store is None and not channels:
         logger.log("Read the channels' names.\n")
         channels = read_unscrapped_channels(output_dir, logger)
 
@@ -843,49 +2168,113 @@ def run():
                     if channels.get(str(i))}
     #######################################################################
 
-    # Initiate the scrapper
-    scrapper = Scrapper(to_scrape_channels=channels,
-                        cities_by_states=states,
-                        logger=logger)
+    # Cache of the searches, kept across the restarts.
+    cache_dir = f"{curr_dir}\\cache"
+    os.makedirs(cache_dir, exist_ok=True)
+    search_cache = SearchCache(f"{cache_dir}\\search_cache.sqlite3",
+                               refresh=args.refresh_cache)
+
+    # Journal of the finished channels, to resume after a crash.
+    journal = Journal(f"{output_dir}\\journal.jsonl")
+
+    # Timings of the stages of the run.
+    metrics = RunMetrics(logger)
+    # The waits' statistics of the run.
+    waits = AdaptiveWaits()
+
+    # Lease the channels from the queue shared with the other processes.
+    work_queue = None
+    if args.work_queue:
+        if store is None:
+            raise SystemExit("The work queue needs the sqlite backend "
+                             "(--backend sqlite).")
+        work_queue = WorkQueue(f"{output_dir}\\work_queue.sqlite3",
+                               args.lease_seconds, logger=logger)
+        work_queue.enqueue(channels)
+        if args.stream:
+            logger.log("The leased batches are saved to the store when they "
+                       "are done, --stream is ignored.", 'WARNING')
+
+    # Clean and save the channels while scrapping.
+    pipeline, partitions = None, None
+    if args.stream and work_queue is None:
+        from yt_scraper.batch_cleaning import clean_batch
+        if store is None:
+            if args.output == 'excel':
+                logger.log("The streamed rows are saved as partitions, build "
+                           "output.xlsx with the compact command.", 'WARNING')
+            partitions = PartitionWriter(output_dir, args.partition_format)
+        pipeline = StreamPipeline(
+            metrics.timed('clean', functools.partial(clean_batch,
+                                                     gazetteer=Gazetteer(states))),
+            metrics.timed('save', stream_saver(output_dir, logger, store,
+                                               partitions)),
+            logger)
+
+    # Initiate the scrapper (of each leased batch, with the work queue: the
+    # expired leases replace the journal).
+    new_scrapper = functools.partial(Scrapper,
+                                     cities_by_states=states,
+                                     logger=logger,
+                                     workers=args.workers,
+                                     engine=args.engine,
+                                     concurrency=args.concurrency,
+                                     per_host=args.per_host,
+                                     rate=args.rate,
+                                     journal=journal if work_queue is None else None,
+                                     extraction=args.extraction,
+                                     search_cache=search_cache,
+                                     dedupe=args.dedupe,
+                                     pipeline=pipeline,
+                                     metrics=metrics,
+                                     max_attempts=args.max_attempts,
+                                     backoff=args.backoff,
+                                     max_backoff=args.max_backoff,
+                                     profile=args.profile,
+                                     navigation=args.navigation,
+                                     snapshots=(SnapshotArchive(snapshots_dir)
+                                                if args.snapshots else None),
+                                     base_url=args.base_url,
+                                     waits=waits)
+
+    # Scrape the leased batches until the queue is empty.
+    if work_queue is not None:
+        try:
+            scrape_work_queue(work_queue, store, new_scrapper, logger,
+                              args.lease_size)
+        finally:
+            search_cache.close()
+            store.close()
+            if args.engine == 'browser':
+                save_wait_stats(waits, output_dir, logger)
+            save_run_report(metrics, output_dir, logger, timer)
+        return
+
+    scrapper = new_scrapper(to_scrape_channels=channels)
 
     # return
 
     # Start scrapping
-    scrapper.scrape()
-
-    # Save unscrapped channels it to a json file.
-    scrapper.save_unscrapped_channels(output_dir)
-    
-    # Save channels with no results it to a json file.
-    scrapper.save_ignored_channels(output_dir)
-
-    # Save unscrapped channels it to a json file.
-    scrapper.save_scrapped_channels(output_dir)
-
-    # Convert the cleaned data into a pandas dataframe.
-    channels_dataframe = scrapper.to_pandas()
-
-    # Save the dataframe into excel file.
-    xl_output_file = f"{output_dir}\\output.xlsx"
-
-    # First, check if current run is the starting one,
-    # i.g. the file is already exists, and the new results
-    # must be concatenated to it.
-    if not args.restart:
-        # If so, read the file.
-        prev_channels_dataframe = pd.read_excel(xl_output_file,
-                                                sheet_name='main')
-        # And then concatenate it with the new results.
-        channels_dataframe = pd.concat([prev_channels_dataframe,
-                                        channels_dataframe])
-    # Save the final results to the file.
-    channels_dataframe.to_excel(xl_output_file,
-                                sheet_name='main',
-                                index=False)
-
-    # Inform the success of saving to excel.
-    logger.log("The cleaned dataframe saved to {}"
-               "".format(xl_output_file), 'INFO')
+    try:
+        scrapper.scrape()
+    finally:
+        # Save the last streamed batches.
+        if pipeline is not None:
+            pipeline.close()
+    search_cache.close()
+
+    # Save the statistics of the waits.
+    if args.engine == 'browser':
+        save_wait_stats(waits, output_dir, logger)
+
+    # Save the results, and the report of the run.
+    try:
+        with metrics.stage('save'):
+            save_results(scrapper, output_dir, journal, logger, args.output,
+                         args.partition_format, args.restart, store,
+                         partitions)
+    finally:
+        save_run_report(metrics, output_dir, logger)
 
 
 if __name__ == '__main__':
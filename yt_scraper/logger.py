@@ -1,4 +1,10 @@
+import atexit
+import json
 import logging
+import queue
+import threading
+import time
+from logging.handlers import QueueHandler, QueueListener
 # import colorlog
 
 from helpers import datem
@@ -12,6 +18,11 @@ LEVELS_INT = {10: 'DEBUG',
 
 LEVELS_STR = {v: k for k, v in LEVELS_INT.items()}
 
+# The fields of the records (written to the JSON-lines output): the channel,
+# the timed stage and its duration, the failure's reason, and the channel's
+# page loads.
+FIELDS = frozenset({'chid', 'stage', 'duration', 'reason', 'page_loads'})
+
 
 def adjust_level(level):
     if not isinstance(level, str):
@@ -19,7 +30,96 @@ def adjust_level(level):
     return level.ljust(9)
 
 
+class LazyMessage():
+    """
+    A message formatted (with str.format) only when it's written.
+    """
+
+    __slots__ = ('template', 'args')
+
+    def __init__(self, template, args) -> None:
+        self.template = template
+        self.args = args
+
+    def __str__(self) -> str:
+        return self.template.format(*self.args)
+
+
+class TextFormatter(logging.Formatter):
+    """
+    The lines of the log file: "[date] ~ $ [LEVEL    ] message".
+    """
+
+    def format(self, record):
+        message = record.getMessage()
+        if not getattr(record, 'exclude_datetime', False):
+            message = (f"{datem(record.created)} "
+                       f"[{adjust_level(record.levelno)}] {message}")
+        if getattr(record, 'br', False):
+            message = "\n" + message
+        return message
+
+
+class JsonLinesFormatter(logging.Formatter):
+    """
+    One JSON object per record, with the fields given to Logger.log (chid,
+    stage, duration, ...).
+    """
+
+    def format(self, record):
+        return json.dumps({'time': record.created,
+                           'level': LEVELS_INT.get(record.levelno,
+                                                   record.levelname),
+                           'thread': record.threadName,
+                           'message': record.getMessage(),
+                           **getattr(record, 'fields', {})},
+                          ensure_ascii=False, default=str)
+
+
+class _LocalQueueHandler(QueueHandler):
+    """
+    Put the records to the queue as they are: they are formatted by the
+    listener's thread, not by the scrapping one.
+    """
+
+    def prepare(self, record):
+        return record
+
+
+class _RecordsListener(QueueListener):
+    """
+    Build the records put to the queue by Logger.log, as tuples, in the
+    listener's thread.
+    """
+
+    def __init__(self, name, records, *handlers) -> None:
+        self.name = name
+        super().__init__(records, *handlers)
+
+    def prepare(self, item):
+        if isinstance(item, logging.LogRecord):
+            return item
+        level, created, thread_name, message, extra = item
+        record = logging.LogRecord(self.name, level, '', 0, message, None, None)
+        record.created = created
+        record.threadName = thread_name
+        record.__dict__.update(extra)
+        return record
+
+
 class Logger():
+    """
+    Wrapper of the scrapping logger, writing to the log file (and to a
+    JSON-lines file, with json_out).
+
+    With background=True, log only puts the record to a queue, and a
+    listener thread formats and writes it. The records under `level` are
+    dropped before any formatting, and a message given with args is only
+    formatted when it's written:
+
+        logger.log("Channel {} :: {} found : {}", args=(chid, name, text),
+                   chid=chid)
+    """
 
     levels = {'DEBUG': 10,
               'INFO': 20,
@@ -27,12 +127,22 @@ class Logger():
               'ERROR': 40,
               'CRITICAL': 50}
 
-    def __init__(self, out=None) -> None:
+    def __init__(self, out=None, level='DEBUG', json_out=None,
+                 background=True) -> None:
         self._logger = logging.getLogger('scrapping_logger')
-        self._customize(out)
+        self._listener = None
+        self._handlers = []
+        self._customize(out, level, json_out, background)
+        # The queue of the background writer (shared by the instances).
+        self._records = next((handler.queue
+                              for handler in self._logger.handlers
+                              if isinstance(handler, _LocalQueueHandler)),
+                             None)
 
-    def _customize(self, out):
-        self._logger.setLevel(logging.DEBUG)
+    def _customize(self, out, level, json_out, background):
+        if isinstance(level, str):
+            level = LEVELS_STR.get(level, 10)
+        self._logger.setLevel(level)
         if out is None:
             out = './log.log'
         # formatter = colorlog.ColoredFormatter(
@@ -46,14 +156,63 @@ class Logger():
         #                 'CRITICAL': 'red,bg_white'})
         if not self._logger.handlers:
             handler = logging.FileHandler(out, encoding='utf-8', mode='w')
-            logging.Formatter(fmt='%(message)s')
-            self._logger.addHandler(handler)
+            handler.setFormatter(TextFormatter())
+            handlers = [handler]
+            if json_out is not None:
+                json_handler = logging.FileHandler(json_out, encoding='utf-8',
+                                                   mode='w')
+                json_handler.setFormatter(JsonLinesFormatter())
+                handlers.append(json_handler)
+            self._handlers = handlers
+            if background:
+                records = queue.SimpleQueue()
+                self._listener = _RecordsListener(self._logger.name, records,
+                                                  *handlers)
+                self._listener.start()
+                # Write the records left in the queue at exit.
+                atexit.register(self.close)
+                handlers = [_LocalQueueHandler(records)]
+            for handler in handlers:
+                self._logger.addHandler(handler)
 
-    def log(self, message, level=10, exclude_datetime=False, _br=False):
+    def log(self, message, level=10, exclude_datetime=False, _br=False,
+            args=None, **fields):
+        # A misspelled field would be dropped silently from the records.
+        if fields and not FIELDS.issuperset(fields):
+            raise TypeError("Unknown log field(s) : {}".format(
+                ', '.join(sorted(set(fields) - FIELDS))))
         if isinstance(level, str):
             level = LEVELS_STR.get(level, 0)
-        if not exclude_datetime:
-            message = f"{datem()} [{adjust_level(level)}] {message}"
-        if _br:
-            message = "\n" + message
-        self._logger.log(level=level, msg=message)
+        # Nothing is formatted for the filtered records.
+        if not self._logger.isEnabledFor(level):
+            return
+        if args is not None:
+            message = LazyMessage(message, args)
+        extra = {'exclude_datetime': exclude_datetime, 'br': _br,
+                 'fields': fields}
+        # The background writer builds the record itself.
+        if self._records is not None:
+            self._records.put((level, time.time(),
+                               threading.current_thread().name, message,
+                               extra))
+            return
+        # The record is built directly, without looking up the caller's
+        # frame.
+        self._logger.handle(self._logger.makeRecord(
+            self._logger.name, level, '', 0, message, None, None, extra=extra))
+
+    def close(self):
+        """
+        Write the queued records, and stop the background writer.
+        """
+        if self._listener is not None:
+            for handler in list(self._logger.handlers):
+                if isinstance(handler, _LocalQueueHandler):
+                    self._logger.removeHandler(handler)
+            self._listener.stop()
+            self._listener = None
+        for handler in self._handlers:
+            self._logger.removeHandler(handler)
+            handler.close()
+        self._handlers = []
+        self._records = None
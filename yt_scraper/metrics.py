@@ -0,0 +1,246 @@
+import functools
+import json
+import threading
+import time
+from contextlib import contextmanager
+
+from yt_scraper.waits import percentile
+
+
+# The upper bounds (seconds) of the stages' histogram buckets.
+HISTOGRAM_BUCKETS = [0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30, 60]
+
+QUANTILES = [50, 90, 95, 99]
+
+PREFIX = 'yt_scraper'
+
+
+def _label(value):
+    return (str(value).replace('\\', '\\\\').replace('"', '\\"')
+            .replace('\n', '\\n'))
+
+
+def _number(value):
+    return repr(float(value)) if isinstance(value, float) else str(value)
+
+
+class RunMetrics():
+    """
+    Timings of the stages of a run, for every channel, with the channels
+    finished by bucket and the failures by reason:
+
+        with metrics.stage('header', chid):
+            ...
+
+    A stage is timed even when it fails. The stages are:
+
+    - channel : the whole scrapping of a channel (any engine).
+    - search_navigation, result_wait, click_through : the search of a
+      channel, and the click on its first result.
+    - channel_navigation : loading the channel's page directly (cached
+      search, or deduplicated scrapping).
+    - direct_navigation : loading the channel's page with its about dialog
+      open (direct navigation).
+    - about_dialog : opening the about dialog of the channel's page.
+    - header, description, links, stats : reading the about dialog element
+      by element (or script, with one injected script).
+    - snapshot : saving the rendered channel page to the snapshots archive.
+    - clean, save : cleaning and saving the results.
+
+    The report is saved as json, and as a Prometheus text file (histograms
+    of the stages' durations, and their quantiles). With a logger, each
+    timed stage is also logged (DEBUG) with its chid, stage and duration.
+    """
+
+    def __init__(self, logger=None) -> None:
+        self.logger = logger
+        self._durations: dict[str, list[float]] = {}
+        self._failures: dict[str, int] = {}
+        self._buckets: dict[str, int] = {}
+        self._lock = threading.Lock()
+        self.started = None
+        self.finished = None
+        self.driver_commands = 0
+        self.page_loads = 0
+        self._routes: dict[str, int] = {}
+        self.retries = 0
+        # The options of the browsers (with the browser engine).
+        self.browser_profile = None
+
+    def start(self):
+        # The run may scrape several batches.
+        if self.started is None:
+            self.started = time.time()
+
+    def stop(self):
+        self.finished = time.time()
+
+    def record(self, name, duration):
+        with self._lock:
+            self._durations.setdefault(name, []).append(duration)
+
+    @contextmanager
+    def stage(self, name, chid=None):
+        """
+        Time the block as one run of the stage (for the channel chid).
+        """
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            duration = time.perf_counter() - start
+            self.record(name, duration)
+            if self.logger is not None:
+                self.logger.log("Channel {} :: {} took {:.3f} s"
+                                if chid is not None else "{1} took {2:.3f} s",
+                                args=(chid, name, duration), chid=chid,
+                                stage=name, duration=duration)
+
+    def timed(self, name, function):
+        """
+        The function, timed as the stage.
+        """
+        @functools.wraps(function)
+        def wrapper(*args, **kwargs):
+            with self.stage(name):
+                return function(*args, **kwargs)
+        return wrapper
+
+    def count_channel(self, bucket):
+        with self._lock:
+            self._buckets[bucket] = self._buckets.get(bucket, 0) + 1
+
+    def count_failure(self, reason):
+        with self._lock:
+            self._failures[reason] = self._failures.get(reason, 0) + 1
+
+    def count_route(self, route):
+        with self._lock:
+            self._routes[route] = self._routes.get(route, 0) + 1
+
+    def count_retry(self):
+        with self._lock:
+            self.retries += 1
+
+    def report(self) -> dict:
+        """
+        The report of the run (durations in seconds).
+        """
+        with self._lock:
+            durations = {name: list(values)
+                         for name, values in self._durations.items()}
+            buckets = dict(self._buckets)
+            failures = dict(self._failures)
+            routes = dict(self._routes)
+        elapsed = ((self.finished or time.time()) - self.started
+                   if self.started is not None else None)
+        channels = sum(buckets.values())
+        stages = {}
+        for name, values in sorted(durations.items()):
+            stages[name] = {'count': len(values),
+                            'sum': sum(values),
+                            'mean': sum(values) / len(values),
+                            **{f'p{q}': percentile(values, q)
+                               for q in QUANTILES},
+                            'max': max(values)}
+        return {'started': self.started,
+                'scrapping_seconds': elapsed,
+                'channels': channels,
+                'channels_by_bucket': buckets,
+                'channels_per_minute': (channels / elapsed * 60
+                                        if elapsed else None),
+                'driver_commands': self.driver_commands,
+                'page_loads': self.page_loads,
+                'page_loads_per_channel': (self.page_loads / channels
+                                           if channels else None),
+                'navigation_routes': routes,
+                'browser_profile': self.browser_profile,
+                'failures': failures,
+                'retries': self.retries,
+                'stages': stages}
+
+    def save(self, file_name):
+        """
+        Write the report to a json file.
+        """
+        with open(file_name, 'w+', encoding='utf-8') as output_file:
+            json.dump(self.report(), output_file, indent=3)
+
+    def prometheus(self) -> str:
+        """
+        The report in the Prometheus text format.
+        """
+        report = self.report()
+        with self._lock:
+            durations = {name: list(values)
+                         for name, values in self._durations.items()}
+        lines = []
+
+        def metric(name, kind, help_text, samples):
+            lines.append(f"# HELP {PREFIX}_{name} {help_text}")
+            lines.append(f"# TYPE {PREFIX}_{name} {kind}")
+            for suffix, labels, value in samples:
+                labels = ','.join(f'{key}="{_label(label)}"'
+                                  for key, label in labels.items())
+                lines.append(f"{PREFIX}_{name}{suffix}"
+                             f"{'{' + labels + '}' if labels else ''} "
+                             f"{_number(value)}")
+
+        histogram = []
+        for name, values in sorted(durations.items()):
+            for bound in HISTOGRAM_BUCKETS:
+                histogram.append(('_bucket', {'stage': name, 'le': bound},
+                                  sum(value <= bound for value in values)))
+            histogram.append(('_bucket', {'stage': name, 'le': '+Inf'},
+                              len(values)))
+            histogram.append(('_sum', {'stage': name}, sum(values)))
+            histogram.append(('_count', {'stage': name}, len(values)))
+        metric('stage_duration_seconds', 'histogram',
+               'Duration of the stages of the scrapping.', histogram)
+        metric('stage_duration_quantile_seconds', 'gauge',
+               'Quantiles of the durations of the stages.',
+               [('', {'stage': name, 'quantile': q / 100}, stage[f'p{q}'])
+                for name, stage in report['stages'].items()
+                for q in QUANTILES])
+        metric('channels_total', 'counter',
+               'Channels finished, by bucket.',
+               [('', {'bucket': bucket}, count)
+                for bucket, count in sorted(report['channels_by_bucket'].items())])
+        metric('failures_total', 'counter',
+               'Failed channels, by reason.',
+               [('', {'reason': reason}, count)
+                for reason, count in sorted(report['failures'].items())])
+        metric('page_loads_total', 'counter',
+               'Pages loaded by the browsers.',
+               [('', {}, report['page_loads'])])
+        metric('navigation_routes_total', 'counter',
+               'Channel pages opened, by navigation route.',
+               [('', {'route': route}, count)
+                for route, count in sorted(report['navigation_routes'].items())])
+        metric('retries_total', 'counter',
+               'Transient failures retried within the run.',
+               [('', {}, report['retries'])])
+        metric('driver_commands_total', 'counter',
+               'Round-trips to the browsers.',
+               [('', {}, report['driver_commands'])])
+        if report['browser_profile'] is not None:
+            metric('browser_profile_info', 'gauge',
+                   'The browser profile of the run.',
+                   [('', {'profile': report['browser_profile']['name']}, 1)])
+        if report['scrapping_seconds'] is not None:
+            metric('scrapping_seconds', 'gauge',
+                   'Duration of the scrapping.',
+                   [('', {}, report['scrapping_seconds'])])
+        if report['channels_per_minute'] is not None:
+            metric('channels_per_minute', 'gauge',
+                   'Channels finished per minute of scrapping.',
+                   [('', {}, report['channels_per_minute'])])
+        return '\n'.join(lines) + '\n'
+
+    def save_prometheus(self, file_name):
+        """
+        Write the report to a Prometheus text file (e.g. for the node
+        exporter's textfile collector).
+        """
+        with open(file_name, 'w+', encoding='utf-8') as output_file:
+            output_file.write(self.prometheus())
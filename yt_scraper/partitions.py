@@ -0,0 +1,134 @@
+import glob
+import math
+import os
+import uuid
+from typing import TYPE_CHECKING
+
+from yt_scraper.helpers import file_name_timer
+
+# pandas and openpyxl are imported when the partitions are written or read.
+if TYPE_CHECKING:
+    import pandas as pd
+
+
+PARTITION_PREFIX = "output_part_"
+
+PARTITION_FORMATS = ['csv', 'parquet']
+
+# Columns kept as text when reading the partitions back.
+TEXT_COLUMNS = {'Application number': str, 'Contact Number': str,
+                'Channel ID': str}
+
+
+def write_partition(dataframe: 'pd.DataFrame', output_dir, fmt='csv',
+                    part=None, run_id=None):
+    """
+    Save the run's rows as a new partition of the output, and return
+    its path. The parts of a streamed run are numbered.
+
+    The name ends with an id of the run (a new one by default), so that the
+    partitions written in the same second, by other runs or shards, don't
+    overwrite each other.
+    """
+    name = f"{file_name_timer()}_{run_id or uuid.uuid4().hex[:8]}"
+    if part is not None:
+        name = f"{name}_{part:04d}"
+    file_name = os.path.join(output_dir, f"{PARTITION_PREFIX}{name}.{fmt}")
+    if fmt == 'parquet':
+        dataframe.to_parquet(file_name, index=False)
+    else:
+        dataframe.to_csv(file_name, index=False, encoding='utf-8')
+    return file_name
+
+
+class PartitionWriter():
+    """
+    Save the rows of a streamed run as partitions of about
+    `rows_per_partition` rows each.
+    """
+
+    def __init__(self, output_dir, fmt='csv', rows_per_partition=10_000) -> None:
+        self.output_dir = output_dir
+        self.fmt = fmt
+        self.rows_per_partition = rows_per_partition
+        self.file_names = []
+        # The parts of the run are ordered by their number within a second.
+        self.run_id = uuid.uuid4().hex[:8]
+        self._frames = []
+        self._rows = 0
+
+    def write(self, dataframe: 'pd.DataFrame'):
+        self._frames.append(dataframe)
+        self._rows += len(dataframe)
+        if self._rows >= self.rows_per_partition:
+            self.flush()
+
+    def flush(self):
+        if not self._rows:
+            return
+        import pandas as pd
+        self.file_names.append(write_partition(pd.concat(self._frames),
+                                               self.output_dir, self.fmt,
+                                               part=len(self.file_names),
+                                               run_id=self.run_id))
+        self._frames, self._rows = [], 0
+
+    def close(self):
+        """
+        Save the last rows, and return the partitions written.
+        """
+        self.flush()
+        return self.file_names
+
+
+def list_partitions(output_dir):
+    """
+    The partitions of the output, oldest first.
+    """
+    file_names = [file_name
+                  for fmt in PARTITION_FORMATS
+                  for file_name in glob.glob(os.path.join(
+                      output_dir, f"{PARTITION_PREFIX}*.{fmt}"))]
+    return sorted(file_names, key=os.path.basename)
+
+
+def _read_chunks(file_name, chunk_size):
+    import pandas as pd
+    if file_name.endswith('.parquet'):
+        yield pd.read_parquet(file_name)
+    else:
+        yield from pd.read_csv(file_name, dtype=TEXT_COLUMNS,
+                               chunksize=chunk_size, encoding='utf-8')
+
+
+def _cell(value):
+    # Empty cells are read back as NaN.
+    if isinstance(value, float) and math.isnan(value):
+        return None
+    return value
+
+
+def compact_partitions(output_dir, xl_output_file, logger,
+                       chunk_size=10_000):
+    """
+    Build the excel deliverable from all the partitions, in one streaming
+    pass with a write-only workbook.
+    """
+    from openpyxl import Workbook
+    partitions = list_partitions(output_dir)
+    logger.log("Compacting {} partition(s) into {} ...", 'INFO',
+               args=(len(partitions), xl_output_file))
+    workbook = Workbook(write_only=True)
+    sheet = workbook.create_sheet('main')
+    columns, rows = None, 0
+    for file_name in partitions:
+        for chunk in _read_chunks(file_name, chunk_size):
+            if columns is None:
+                columns = list(chunk.columns)
+                sheet.append(columns)
+            for row in chunk.reindex(columns=columns).itertuples(index=False):
+                sheet.append([_cell(value) for value in row])
+                rows += 1
+    workbook.save(xl_output_file)
+    logger.log("{} row(s) saved to {}", 'INFO', args=(rows, xl_output_file))
+    return rows
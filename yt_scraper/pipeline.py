@@ -0,0 +1,110 @@
+import queue
+import threading
+
+
+BUCKETS = ['scrapped', 'unscrapped', 'ignored']
+
+# Ends the stream.
+_END = object()
+
+
+def empty_batch():
+    return {bucket: {} for bucket in BUCKETS}
+
+
+class StreamPipeline():
+    """
+    Stream the finished channels to the outputs while the next ones are
+    still scrapped:
+
+        scrapping --> records queue --> cleaning --> batches queue --> saving
+
+    The cleaning thread groups the records in batches of `batch_size`
+    channels (or whatever arrived within `flush_interval` seconds) and calls
+    clean(batch), which adds the cleaned channels under batch['cleaned'].
+    The saving thread then calls save(batch).
+
+    Both queues are bounded, so a slow stage holds back the ones before it,
+    and at most about `max_batches` batches are held in memory.
+    """
+
+    def __init__(self, clean, save, logger, batch_size=100, max_batches=4,
+                 flush_interval=5.0) -> None:
+        self.clean = clean
+        self.save = save
+        self.logger = logger
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.saved = 0
+        self._records = queue.Queue(maxsize=batch_size * max_batches)
+        self._batches = queue.Queue(maxsize=max_batches)
+        self._error = None
+        self._threads = [threading.Thread(target=self._cleaning,
+                                          name="pipeline-cleaning"),
+                         threading.Thread(target=self._saving,
+                                          name="pipeline-saving")]
+        for thread in self._threads:
+            thread.start()
+
+    def put(self, chid, bucket, channel_data):
+        """
+        Send a finished channel down the pipeline (blocks while the
+        pipeline is full). The failures are raised by close.
+        """
+        self._records.put((chid, bucket, channel_data))
+
+    def _fail(self, e):
+        if self._error is None:
+            self._error = e
+            self.logger.log("Pipeline failure : {!r}", 'ERROR', args=(e,))
+
+    def _cleaning(self):
+        batch, size, ended = empty_batch(), 0, False
+        while not ended:
+            try:
+                record = self._records.get(timeout=self.flush_interval)
+            except queue.Empty:
+                record = None
+            if record is _END:
+                ended = True
+            elif record is not None:
+                chid, bucket, channel_data = record
+                batch[bucket][chid] = channel_data
+                size += 1
+            # Flush a full batch, or what arrived within the interval.
+            if size and (size >= self.batch_size or record is None or ended):
+                if self._error is None:
+                    try:
+                        self.clean(batch)
+                    except Exception as e:
+                        self._fail(e)
+                self._batches.put(batch)
+                batch, size = empty_batch(), 0
+        self._batches.put(_END)
+
+    def _saving(self):
+        while True:
+            batch = self._batches.get()
+            if batch is _END:
+                return
+            # After a failure, the batches are only drained.
+            if self._error is not None:
+                continue
+            try:
+                self.save(batch)
+                self.saved += sum(len(batch[bucket]) for bucket in BUCKETS)
+            except Exception as e:
+                self._fail(e)
+
+    def close(self):
+        """
+        Flush the last batch, wait for the stages to finish, and raise the
+        failure of any stage.
+        """
+        self._records.put(_END)
+        for thread in self._threads:
+            thread.join()
+        self.logger.log("{} channel(s) streamed to the outputs.", 'INFO',
+                        args=(self.saved,))
+        if self._error is not None:
+            raise self._error
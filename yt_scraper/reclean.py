@@ -0,0 +1,66 @@
+import itertools
+import os
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+
+from yt_scraper.compiled_inputs import read_compiled, groups_to_states
+
+
+# The gazetteer of a worker process, built once by _init_worker.
+_gazetteer = None
+_items_separator = '\n'
+
+
+def _init_worker(compiled_states_file, items_separator):
+    """
+    Build the worker's gazetteer from the compiled cities by states, which
+    is read without pandas nor json parsing.
+    """
+    global _gazetteer, _items_separator
+    from yt_scraper.gazetteer import Gazetteer
+    groups = read_compiled(compiled_states_file)
+    if groups is None:
+        raise ValueError("{} is not a compiled input."
+                         "".format(compiled_states_file))
+    _gazetteer = Gazetteer(groups_to_states(groups))
+    _items_separator = items_separator
+
+
+def clean_chunk(chunk: list[tuple[str, dict]]) -> dict[str, dict]:
+    """
+    Clean a chunk of raw channels (in a worker process), as the scrapping
+    does: the raw fields updated with the cleaned ones.
+    """
+    from yt_scraper.batch_cleaning import clean_channels
+    raw_channels = dict(chunk)
+    cleaned = clean_channels(raw_channels, _gazetteer, _items_separator)
+    return {chid: {**channel_data, **cleaned[chid]}
+            for chid, channel_data in raw_channels.items()}
+
+
+def iter_chunks(items, chunk_size):
+    items = iter(items)
+    while chunk := list(itertools.islice(items, chunk_size)):
+        yield chunk
+
+
+def reclean_channels(raw_channels, compiled_states_file, processes=None,
+                     chunk_size=1_000, items_separator='\n'):
+    """
+    Clean the (chid, raw data) pairs in chunks over a pool of processes, and
+    yield the cleaned chunks (chid -> data) in order. At most two chunks per
+    process are in flight, so that the raw channels are read as they are
+    cleaned.
+    """
+    processes = processes or os.cpu_count() or 1
+    with ProcessPoolExecutor(max_workers=processes,
+                             initializer=_init_worker,
+                             initargs=(compiled_states_file,
+                                       items_separator)) as executor:
+        pending = deque()
+        for chunk in iter_chunks(raw_channels, chunk_size):
+            pending.append(executor.submit(clean_chunk, chunk))
+            if len(pending) >= 2 * processes:
+                yield pending.popleft().result()
+        while pending:
+            yield pending.popleft().result()
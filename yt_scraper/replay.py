@@ -0,0 +1,128 @@
+import importlib.util
+import os
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+
+from yt_scraper.exceptions import SnapshotExtractionException
+from yt_scraper.reclean import iter_chunks
+from yt_scraper.snapshots import SnapshotArchive
+
+
+# lxml parses the pages several times faster than the standard parser.
+PARSER = 'lxml' if importlib.util.find_spec('lxml') else 'html.parser'
+
+
+def _displayed(element):
+    """
+    Whether the element is displayed, as far as the markup tells: neither
+    it nor its parents are hidden.
+    """
+    while element is not None and element.name != '[document]':
+        if (element.has_attr('hidden')
+                or 'display: none' in element.get('style', '')
+                or 'display:none' in element.get('style', '')):
+            return False
+        element = element.parent
+    return True
+
+
+def _text(element):
+    """
+    The text of a displayed element, its whitespace collapsed as in the
+    browser's rendering (or an empty string).
+    """
+    if element is None or not _displayed(element):
+        return ""
+    lines = (' '.join(line.split()) for line in element.get_text().split('\n'))
+    return '\n'.join(line for line in lines if line)
+
+
+def _find(parent, selector, part):
+    element = parent.select_one(selector)
+    if element is None:
+        raise SnapshotExtractionException(
+            message=f"{part} extraction failure")
+    return element
+
+
+def extract_page(html) -> dict:
+    """
+    The channel_data fields of a saved channel page (with its about dialog
+    open), read as Scrapper._read_channel_page reads them in the browser.
+    """
+    from bs4 import BeautifulSoup
+    soup = BeautifulSoup(html, PARSER)
+
+    # The header.
+    header = _find(soup, 'div#inner-header-container', 'Metadata')
+    handles = [element for element in header.select('#channel-handle')
+               if _displayed(element)]
+    channel_data = {
+        'channel_name': _text(_find(header, '#text.style-scope.ytd-channel-name',
+                                    'Metadata')),
+        'subscriber_count': _text(_find(soup, '#subscriber-count', 'Metadata')),
+        'videos_count': _text(_find(soup, '#videos-count', 'Metadata')),
+        'channel_handle': _text(handles[0]) if handles else ""}
+
+    # The description.
+    channel_data['description'] = _text(
+        _find(soup, 'div#description-container', 'Description'))
+
+    # The links.
+    links = _find(soup, 'div#links-container', 'Links')
+    channel_data['other_links'] = (
+        [anchor.get('href') for anchor in links.select('a.yt-simple-endpoint')]
+        if _displayed(links) else [])
+
+    # The stats : the joined date, and the total views.
+    strings = _find(soup, 'div#right-column', 'Stats').select(
+        'yt-formatted-string')
+    if len(strings) < 3 or not strings[1].select('span'):
+        raise SnapshotExtractionException(message="Stats extraction failure")
+    channel_data['joined_on'] = _text(strings[1].select('span')[-1])
+    channel_data['total_views'] = _text(strings[2])
+    return channel_data
+
+
+# The archive of a worker process.
+_archive = None
+
+
+def _init_worker(archive_path):
+    global _archive
+    _archive = SnapshotArchive(archive_path)
+
+
+def extract_chunk(digests: list[str]) -> dict[str, tuple]:
+    """
+    Extract a chunk of saved pages (in a worker process): digest ->
+    (channel_data, None), or (None, the failure's message).
+    """
+    results = {}
+    for digest in digests:
+        try:
+            results[digest] = (extract_page(_archive.get(digest)), None)
+        except SnapshotExtractionException as e:
+            results[digest] = (None, e.message)
+        except (OSError, ValueError) as e:
+            results[digest] = (None, type(e).__name__)
+    return results
+
+
+def replay_snapshots(archive_path, digests, processes=None, chunk_size=100):
+    """
+    Extract the saved pages (each digest once) in chunks over a pool of
+    processes, and yield the extracted chunks (see extract_chunk) in order.
+    """
+    processes = processes or os.cpu_count() or 1
+    digests = list(dict.fromkeys(digests))
+    with ProcessPoolExecutor(max_workers=processes,
+                             initializer=_init_worker,
+                             initargs=(archive_path,)) as executor:
+        pending = deque()
+        for chunk in iter_chunks(digests, chunk_size):
+            pending.append(executor.submit(extract_chunk, chunk))
+            if len(pending) >= 2 * processes:
+                yield pending.popleft().result()
+        while pending:
+            yield pending.popleft().result()
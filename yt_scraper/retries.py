@@ -0,0 +1,94 @@
+import heapq
+import itertools
+import random
+import threading
+import time
+
+
+def backoff_delay(attempt, base=2.0, maximum=60.0, rnd=random):
+    """
+    The delay before the retry following the attempt-th failure (0 for the
+    first one): exponential, capped at maximum, with a random jitter so that
+    the failed channels are not all retried at once.
+    """
+    delay = min(maximum, base * 2 ** attempt)
+    return delay * rnd.uniform(0.5, 1.0)
+
+
+class RetryScheduler():
+    """
+    The items to scrape, shared by the workers, with the failed ones put
+    back after a backoff:
+
+        item = scheduler.get()          # (key, value, attempt) or None
+        try:
+            ...
+            if transient failure and scheduler.retry(*item):
+                continue
+        finally:
+            scheduler.task_done()
+
+    The items are kept in a heap ordered by the time they are ready. get
+    blocks until an item is ready, and returns None when no item is left and
+    none is being handled (a handled item may still be retried).
+    """
+
+    def __init__(self, items: dict, max_attempts=3, base=2.0, maximum=60.0,
+                 rnd=None) -> None:
+        self.max_attempts = max_attempts
+        self.base = base
+        self.maximum = maximum
+        self.retries = 0
+        self._rnd = rnd or random.Random()
+        self._counter = itertools.count()
+        self._heap = [(0.0, next(self._counter), key, value, 0)
+                      for key, value in items.items()]
+        self._in_flight = 0
+        self._condition = threading.Condition()
+
+    def __len__(self):
+        with self._condition:
+            return len(self._heap) + self._in_flight
+
+    def get(self):
+        """
+        The next ready item as (key, value, attempt), or None when they are
+        all done.
+        """
+        with self._condition:
+            while True:
+                if self._heap:
+                    wait = self._heap[0][0] - time.monotonic()
+                    if wait <= 0:
+                        _, _, key, value, attempt = heapq.heappop(self._heap)
+                        self._in_flight += 1
+                        return key, value, attempt
+                    self._condition.wait(wait)
+                elif self._in_flight:
+                    self._condition.wait()
+                else:
+                    return None
+
+    def retry(self, key, value, attempt):
+        """
+        Put the item back after its backoff, unless it reached the maximum
+        number of attempts. Return the delay, or None if it's not retried.
+        """
+        if attempt + 1 >= self.max_attempts:
+            return None
+        delay = backoff_delay(attempt, self.base, self.maximum, self._rnd)
+        with self._condition:
+            heapq.heappush(self._heap, (time.monotonic() + delay,
+                                        next(self._counter), key, value,
+                                        attempt + 1))
+            self.retries += 1
+            self._condition.notify_all()
+        return delay
+
+    def task_done(self):
+        """
+        The item returned by get is handled (or put back with retry).
+        """
+        with self._condition:
+            self._in_flight -= 1
+            self._condition.notify_all()
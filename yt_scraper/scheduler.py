@@ -0,0 +1,163 @@
+import asyncio
+import time
+from concurrent.futures import ThreadPoolExecutor
+from urllib import parse
+
+from yt_scraper.exceptions import NoResultsException, PageRequestException
+from yt_scraper.search_cache import NO_RESULTS
+from yt_scraper.http_engine import (HttpEngine, parse_search_page,
+                                    parse_about_page, search_link)
+
+
+class TokenBucket():
+    """
+    Token-bucket rate limit: `rate` requests per second, with bursts of
+    up to `capacity` requests.
+    """
+
+    def __init__(self, rate: float, capacity: float = None) -> None:
+        self.rate = rate
+        self.capacity = capacity or max(1.0, rate)
+        self._tokens = self.capacity
+        self._updated = time.monotonic()
+        self._lock = asyncio.Lock()
+
+    async def acquire(self):
+        async with self._lock:
+            while True:
+                now = time.monotonic()
+                self._tokens = min(self.capacity,
+                                   self._tokens + (now - self._updated) * self.rate)
+                self._updated = now
+                if self._tokens >= 1:
+                    self._tokens -= 1
+                    return
+                await asyncio.sleep((1 - self._tokens) / self.rate)
+
+
+class FetchScheduler():
+    """
+    Keep many channel lookups in flight, with a per-host concurrency cap
+    (the number of lookups in flight by default, all the pages being on one
+    host), a token-bucket rate limit and a deadline for each request.
+
+    The pages are fetched with the HttpEngine keep-alive pool, each request
+    running in a thread of the scheduler's executor.
+    """
+
+    def __init__(self, logger, concurrency=200, per_host=None, rate=20.0,
+                 search_deadline=10, about_deadline=10,
+                 base_url=None, search_cache=None) -> None:
+        self.logger = logger
+        self.concurrency = concurrency
+        self.per_host = per_host or concurrency
+        self.rate = rate
+        self.search_deadline = search_deadline
+        self.about_deadline = about_deadline
+        engine_kwargs = {'base_url': base_url} if base_url else {}
+        self.engine = HttpEngine(logger, pool_size=self.per_host,
+                                 timeout=max(search_deadline, about_deadline),
+                                 search_cache=search_cache,
+                                 **engine_kwargs)
+        # Created within the event loop.
+        self._executor = None
+        self._bucket = None
+        self._host_semaphores = {}
+
+    def _host_semaphore(self, url):
+        host = parse.urlparse(url).netloc
+        if host not in self._host_semaphores:
+            self._host_semaphores[host] = asyncio.Semaphore(self.per_host)
+        return self._host_semaphores[host]
+
+    async def fetch(self, url, deadline) -> str:
+        """
+        GET a page, within the host's cap, the rate limit and the deadline.
+        """
+        loop = asyncio.get_running_loop()
+        async with self._host_semaphore(url):
+            await self._bucket.acquire()
+            try:
+                return await asyncio.wait_for(
+                    loop.run_in_executor(self._executor, self.engine.fetch, url),
+                    deadline)
+            except asyncio.TimeoutError:
+                raise PageRequestException(message="Time out", transient=True)
+
+    async def resolve_channel(self, chid, channel) -> str:
+        """
+        Return the link of the channel found when searching for channel, as
+        HttpEngine.resolve_channel does.
+        """
+        channel_link = self.engine.cached_link(chid, channel)
+        if channel_link is None:
+            try:
+                search_html = await self.fetch(
+                    search_link(channel, self.engine.base_url),
+                    self.search_deadline)
+                channel_link = parse_search_page(search_html, chid,
+                                                 self.engine.base_url)
+            except PageRequestException as e:
+                e.message = "Channel searching failure ( {} )".format(e.message)
+                raise e
+            except NoResultsException:
+                self.engine.cache_search(channel, NO_RESULTS)
+                raise
+            self.engine.cache_search(channel, channel_link)
+        self.logger.log("Channel {} :: Targeting link : {}",
+                        args=(chid, channel_link), chid=chid)
+        return channel_link
+
+    async def extract_channel_page(self, chid, channel_link) -> dict:
+        """
+        Extract the data of the channel from its about page.
+        """
+        channel_data = {'channel_link': channel_link}
+        try:
+            about_html = await self.fetch(channel_link + '/about',
+                                          self.about_deadline)
+            channel_data.update(parse_about_page(about_html, chid,
+                                                 channel_link, self.logger))
+        except PageRequestException as e:
+            e.message = "Metadata extraction failure ( {} )".format(e.message)
+            raise e
+        return channel_data
+
+    async def extract_channel(self, chid, channel) -> dict:
+        """
+        Search for the channel and extract its data, as
+        HttpEngine.extract_channel does.
+        """
+        # Save the channel name and the search link.
+        channel_data = {'application_name': channel,
+                        'application_link': search_link(channel,
+                                                        self.engine.base_url)}
+        channel_link = await self.resolve_channel(chid, channel)
+        channel_data.update(await self.extract_channel_page(chid, channel_link))
+        return channel_data
+
+    async def run(self, items: dict, on_item):
+        """
+        Go through all the items (key -> value). on_item(key, value) is
+        awaited for each one, and must handle the failures.
+        """
+        self._executor = ThreadPoolExecutor(max_workers=self.concurrency)
+        self._bucket = TokenBucket(self.rate)
+        self._host_semaphores = {}
+        items_queue = asyncio.Queue()
+        for key, value in items.items():
+            items_queue.put_nowait((key, value))
+
+        async def worker():
+            while True:
+                try:
+                    key, value = items_queue.get_nowait()
+                except asyncio.QueueEmpty:
+                    return
+                await on_item(key, value)
+
+        try:
+            workers = max(1, min(self.concurrency, len(items)))
+            await asyncio.gather(*(worker() for _ in range(workers)))
+        finally:
+            self._executor.shutdown(wait=False, cancel_futures=True)
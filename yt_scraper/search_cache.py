@@ -0,0 +1,107 @@
+import sqlite3
+import threading
+import time
+
+
+# Cached result of a search that found no channel.
+NO_RESULTS = "NO_RESULTS"
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS search_cache (
+    name TEXT PRIMARY KEY,
+    channel_link TEXT,
+    resolved_at REAL,
+    last_used REAL
+);
+CREATE INDEX IF NOT EXISTS search_cache_last_used ON search_cache (last_used);
+"""
+
+
+def normalize_name(application_name: str) -> str:
+    """
+    The cache key of an application name.
+    """
+    return ' '.join(application_name.lower().split())
+
+
+class SearchCache():
+    """
+    Persistent cache of the searches: application name -> channel link (or
+    NO_RESULTS), with a time to live and a size cap (the least recently
+    used names are evicted).
+
+    With refresh, the cache is not read, but it's still updated.
+    """
+
+    def __init__(self, path, ttl_days=30, max_entries=100_000,
+                 refresh=False) -> None:
+        self.path = path
+        self.ttl = ttl_days * 24 * 3600
+        self.max_entries = max_entries
+        self.refresh = refresh
+        self.hits = 0
+        self.misses = 0
+        self._puts = 0
+        self._lock = threading.Lock()
+        # Shared by the processes of a work queue, as the results store.
+        self.connection = sqlite3.connect(path, timeout=30,
+                                          check_same_thread=False)
+        self.connection.execute("PRAGMA journal_mode=WAL")
+        self.connection.executescript(SCHEMA)
+
+    def get(self, application_name):
+        """
+        The cached channel link, NO_RESULTS, or None if not cached.
+        """
+        if self.refresh:
+            with self._lock:
+                self.misses += 1
+            return None
+        key = normalize_name(application_name)
+        now = time.time()
+        with self._lock:
+            row = self.connection.execute(
+                "SELECT channel_link, resolved_at FROM search_cache "
+                "WHERE name = ?", (key,)).fetchone()
+            if row is None or now - row[1] > self.ttl:
+                self.misses += 1
+                return None
+            with self.connection:
+                self.connection.execute(
+                    "UPDATE search_cache SET last_used = ? WHERE name = ?",
+                    (now, key))
+            self.hits += 1
+        return row[0] if row[0] is not None else NO_RESULTS
+
+    def put(self, application_name, channel_link):
+        """
+        Cache a resolved link, or NO_RESULTS.
+        """
+        key = normalize_name(application_name)
+        link = None if channel_link == NO_RESULTS else channel_link
+        now = time.time()
+        with self._lock:
+            with self.connection:
+                self.connection.execute(
+                    "INSERT INTO search_cache (name, channel_link, resolved_at, "
+                    "last_used) VALUES (?, ?, ?, ?) "
+                    "ON CONFLICT (name) DO UPDATE SET "
+                    "channel_link = excluded.channel_link, "
+                    "resolved_at = excluded.resolved_at, "
+                    "last_used = excluded.last_used",
+                    (key, link, now, now))
+            self._puts += 1
+            if self._puts % 100 == 0:
+                self._evict()
+
+    def _evict(self):
+        with self.connection:
+            self.connection.execute(
+                "DELETE FROM search_cache WHERE name IN ("
+                "SELECT name FROM search_cache ORDER BY last_used DESC "
+                "LIMIT -1 OFFSET ?)", (self.max_entries,))
+
+    def close(self):
+        with self._lock:
+            self._evict()
+            self.connection.close()
@@ -0,0 +1,42 @@
+import argparse
+import zlib
+
+
+def parse_shard(text):
+    """
+    The (index, count) of a shard given as "i/N", with 0 <= i < N (the type
+    of the --shard argument).
+    """
+    try:
+        index, count = (int(part) for part in text.split('/'))
+    except ValueError:
+        raise argparse.ArgumentTypeError(
+            "A shard is given as i/N (e.g. 0/4), not {!r}".format(text))
+    if count < 1 or not 0 <= index < count:
+        raise argparse.ArgumentTypeError(
+            "The shard index must be in [0, {}), not {}".format(count, index))
+    return index, count
+
+
+def shard_of(chid, count):
+    """
+    The shard of a channel: a stable hash of its id (the same on every
+    process and machine, unlike hash()).
+    """
+    return zlib.crc32(str(chid).encode('utf-8')) % count
+
+
+def shard_channels(channels: dict, index, count) -> dict:
+    """
+    The channels of the shard, in the same order.
+    """
+    return {chid: channel for chid, channel in channels.items()
+            if shard_of(chid, count) == index}
+
+
+def shard_output_dir(output_dir, index, count):
+    """
+    The output directory of a shard, next to the output directory (the
+    input and cache directories are found from it the same way).
+    """
+    return f"{output_dir}_shard_{index}_of_{count}"
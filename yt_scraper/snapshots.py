@@ -0,0 +1,96 @@
+import gzip
+import hashlib
+import json
+import os
+import threading
+import time
+
+
+class SnapshotArchive():
+    """
+    Archive of the rendered channel pages, to extract them again offline
+    (see replay). Each page is saved once, gzipped, under its sha256:
+
+        objects/ab/ab12...ef.html.gz
+
+    and index.jsonl maps each channel to its snapshots, one JSON line each
+    (the last snapshot of a channel wins):
+
+        {"key": "3", "url": "https://www.youtube.com/@x",
+         "digest": "ab12...ef", "time": 1700000000.0}
+
+    The key is the channel's number, or its link when the channels are
+    deduplicated. The url is the channel's link (without /about), as in the
+    scrapped channel_link.
+    """
+
+    def __init__(self, path, compresslevel=6) -> None:
+        self.path = path
+        self.compresslevel = compresslevel
+        self.index_path = os.path.join(path, 'index.jsonl')
+        # The pages saved, and the ones already in the archive.
+        self.saved = 0
+        self.deduplicated = 0
+        self._lock = threading.Lock()
+        os.makedirs(os.path.join(path, 'objects'), exist_ok=True)
+
+    def object_path(self, digest):
+        return os.path.join(self.path, 'objects', digest[:2],
+                            f"{digest}.html.gz")
+
+    def put(self, key, url, html: str):
+        """
+        Save the page of a channel, and return its digest. The page is
+        written only if it's not in the archive yet.
+        """
+        data = html.encode('utf-8')
+        digest = hashlib.sha256(data).hexdigest()
+        object_path = self.object_path(digest)
+        # The page is compressed out of the lock, unless it's archived.
+        compressed = (None if os.path.exists(object_path)
+                      else gzip.compress(data, self.compresslevel))
+        line = json.dumps({'key': key, 'url': url, 'digest': digest,
+                           'time': time.time()}, ensure_ascii=False)
+        with self._lock:
+            if os.path.exists(object_path):
+                self.deduplicated += 1
+            else:
+                compressed = compressed or gzip.compress(data,
+                                                         self.compresslevel)
+                os.makedirs(os.path.dirname(object_path), exist_ok=True)
+                # Written under a temporary name, so that a reader (or
+                # another process saving the same page) never sees a partial
+                # object.
+                temp_path = f"{object_path}.{os.getpid()}.tmp"
+                with open(temp_path, 'wb') as object_file:
+                    object_file.write(compressed)
+                os.replace(temp_path, object_path)
+                self.saved += 1
+            with open(self.index_path, 'a', encoding='utf-8') as index_file:
+                index_file.write(line + '\n')
+        return digest
+
+    def get(self, digest) -> str:
+        """
+        The page saved under digest.
+        """
+        with open(self.object_path(digest), 'rb') as object_file:
+            return gzip.decompress(object_file.read()).decode('utf-8')
+
+    def latest(self) -> dict[str, dict]:
+        """
+        The last snapshot of each channel: key -> {'url', 'digest', 'time'}.
+        A line cut by a crash is ignored.
+        """
+        snapshots = {}
+        try:
+            with open(self.index_path, 'r', encoding='utf-8') as index_file:
+                for line in index_file:
+                    try:
+                        record = json.loads(line)
+                    except json.JSONDecodeError:
+                        continue
+                    snapshots[record.pop('key')] = record
+        except FileNotFoundError:
+            pass
+        return snapshots
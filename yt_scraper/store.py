@@ -0,0 +1,229 @@
+import json
+import sqlite3
+
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS channels (
+    chid TEXT PRIMARY KEY,
+    application_name TEXT,
+    channel_link TEXT,
+    channel_name TEXT,
+    channel_handle TEXT,
+    city TEXT,
+    state TEXT,
+    raw TEXT,
+    cleaned TEXT
+);
+CREATE INDEX IF NOT EXISTS channels_channel_link ON channels (channel_link);
+CREATE INDEX IF NOT EXISTS channels_state ON channels (state);
+
+CREATE TABLE IF NOT EXISTS contacts (
+    chid TEXT,
+    phone_number TEXT,
+    position INTEGER,
+    PRIMARY KEY (chid, position)
+);
+
+CREATE TABLE IF NOT EXISTS links (
+    chid TEXT,
+    kind TEXT,
+    url TEXT,
+    position INTEGER,
+    PRIMARY KEY (chid, kind, position)
+);
+
+CREATE TABLE IF NOT EXISTS queue (
+    chid TEXT PRIMARY KEY,
+    channel TEXT,
+    status TEXT,
+    reason TEXT
+);
+CREATE INDEX IF NOT EXISTS queue_status ON queue (status);
+"""
+
+LINK_KINDS = ['telegram_links', 'instagram_links', 'other_links']
+
+BATCH_SIZE = 500
+
+
+def _batches(rows, size=BATCH_SIZE):
+    batch = []
+    for row in rows:
+        batch.append(row)
+        if len(batch) >= size:
+            yield batch
+            batch = []
+    if batch:
+        yield batch
+
+
+class ResultStore():
+    """
+    SQLite store of the scrapping results, and of the channels queue.
+
+    The channels are upserted in batches, each batch in one transaction.
+    The raw (uncleaned) and the cleaned records are kept as JSON, and the
+    phone numbers and links are also split into their own tables.
+    """
+
+    def __init__(self, path) -> None:
+        self.path = path
+        # The streamed batches are saved from the pipeline's thread. The
+        # processes sharing a work queue write to the same store: they wait
+        # for its lock up to 30 s, and read while another one writes (WAL).
+        self.connection = sqlite3.connect(path, timeout=30,
+                                          check_same_thread=False)
+        self.connection.execute("PRAGMA journal_mode=WAL")
+        self.connection.executescript(SCHEMA)
+
+    def close(self):
+        self.connection.close()
+
+    # Queue ##################################################################
+
+    def enqueue(self, channels: dict[str, dict]):
+        """
+        Add channels (chid -> {'channel': name}) to be scrapped.
+        """
+        rows = ((chid, channel.get('channel'), 'todo')
+                for chid, channel in channels.items())
+        for batch in _batches(rows):
+            with self.connection:
+                self.connection.executemany(
+                    "INSERT OR IGNORE INTO queue (chid, channel, status) "
+                    "VALUES (?, ?, ?)", batch)
+
+    def pending_channels(self) -> dict[str, dict]:
+        """
+        The channels not scrapped yet, or that failed.
+        """
+        cursor = self.connection.execute(
+            "SELECT chid, channel FROM queue "
+            "WHERE status IN ('todo', 'unscrapped') ORDER BY rowid")
+        return {chid: {'channel': channel} for chid, channel in cursor}
+
+    def mark(self, channels: dict[str, dict], status):
+        """
+        Set the status (and the reason, if any) of channels in the queue.
+        """
+        rows = ((chid, channel.get('channel'), status, channel.get('reason'))
+                for chid, channel in channels.items())
+        for batch in _batches(rows):
+            with self.connection:
+                self.connection.executemany(
+                    "INSERT INTO queue (chid, channel, status, reason) "
+                    "VALUES (?, ?, ?, ?) "
+                    "ON CONFLICT (chid) DO UPDATE SET status = excluded.status, "
+                    "reason = excluded.reason", batch)
+
+    # Channels ###############################################################
+
+    def upsert_raw(self, channels: dict[str, dict]):
+        """
+        Save the scrapped (uncleaned) channels.
+        """
+        rows = ((chid,
+                 channel_data.get('application_name'),
+                 channel_data.get('channel_link'),
+                 channel_data.get('channel_name'),
+                 channel_data.get('channel_handle'),
+                 json.dumps(channel_data, ensure_ascii=False))
+                for chid, channel_data in channels.items())
+        for batch in _batches(rows):
+            with self.connection:
+                self.connection.executemany(
+                    "INSERT INTO channels (chid, application_name, channel_link, "
+                    "channel_name, channel_handle, raw) VALUES (?, ?, ?, ?, ?, ?) "
+                    "ON CONFLICT (chid) DO UPDATE SET "
+                    "application_name = excluded.application_name, "
+                    "channel_link = excluded.channel_link, "
+                    "channel_name = excluded.channel_name, "
+                    "channel_handle = excluded.channel_handle, "
+                    "raw = excluded.raw", batch)
+                self.connection.executemany(
+                    "INSERT INTO queue (chid, channel, status) VALUES (?, ?, 'scrapped') "
+                    "ON CONFLICT (chid) DO UPDATE SET status = 'scrapped', reason = NULL",
+                    [(row[0], row[1]) for row in batch])
+
+    def upsert_cleaned(self, channels: dict[str, dict]):
+        """
+        Save the cleaned channels, with their phone numbers and links.
+        """
+        for batch in _batches(channels.items()):
+            chids = [(chid,) for chid, _ in batch]
+            with self.connection:
+                self.connection.executemany(
+                    "UPDATE channels SET city = ?, state = ?, cleaned = ? "
+                    "WHERE chid = ?",
+                    [(channel_data.get('city'), channel_data.get('state'),
+                      json.dumps(channel_data, ensure_ascii=False), chid)
+                     for chid, channel_data in batch])
+                self.connection.executemany(
+                    "DELETE FROM contacts WHERE chid = ?", chids)
+                self.connection.executemany(
+                    "INSERT INTO contacts (chid, phone_number, position) "
+                    "VALUES (?, ?, ?)",
+                    [(chid, phone_number, position)
+                     for chid, channel_data in batch
+                     for position, phone_number
+                     in enumerate(channel_data.get('phone_numbers') or [])])
+                self.connection.executemany(
+                    "DELETE FROM links WHERE chid = ?", chids)
+                self.connection.executemany(
+                    "INSERT INTO links (chid, kind, url, position) "
+                    "VALUES (?, ?, ?, ?)",
+                    [(chid, kind, url, position)
+                     for chid, channel_data in batch
+                     for kind in LINK_KINDS
+                     for position, url in enumerate(channel_data.get(kind) or [])])
+
+    # Exports ################################################################
+
+    def iter_channels(self, cleaned=True):
+        """
+        Yield (chid, channel_data), raw or cleaned, in insertion order.
+        """
+        column = 'cleaned' if cleaned else 'raw'
+        cursor = self.connection.execute(
+            "SELECT chid, {0} FROM channels WHERE {0} IS NOT NULL "
+            "ORDER BY rowid".format(column))
+        for chid, data in cursor:
+            yield chid, json.loads(data)
+
+    def status_counts(self) -> dict[str, int]:
+        """
+        The number of channels of each status in the queue.
+        """
+        return dict(self.connection.execute(
+            "SELECT status, COUNT(*) FROM queue GROUP BY status"))
+
+    def iter_queue(self, *statuses):
+        """
+        Yield (chid, {'channel', ['reason']}) of the channels with a status.
+        """
+        cursor = self.connection.execute(
+            "SELECT chid, channel, reason FROM queue WHERE status IN ({}) "
+            "ORDER BY rowid".format(', '.join('?' * len(statuses))), statuses)
+        for chid, channel, reason in cursor:
+            item = {'channel': channel}
+            if reason is not None:
+                item['reason'] = reason
+            yield chid, item
+
+
+def dump_json_object(items, file_name):
+    """
+    Write (key, value) pairs as one JSON object (indent=3), one item at
+    a time, and return the number of items written.
+    """
+    count = 0
+    with open(file_name, 'w', encoding='utf-8') as output_file:
+        output_file.write('{')
+        separator = '\n'
+        for key, value in items:
+            item = json.dumps({key: value}, indent=3, ensure_ascii=False)
+            output_file.write(separator + item[1:-1].strip('\n'))
+            separator = ',\n'
+            count += 1
+        output_file.write('\n}' if separator != '\n' else '}')
+    return count
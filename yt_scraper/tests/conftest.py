@@ -0,0 +1,21 @@
+import os
+import sys
+
+import pytest
+
+
+# The modules import each other as yt_scraper.<module>, and the logger
+# imports helpers directly.
+PACKAGE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path[:0] = [os.path.dirname(PACKAGE_DIR), PACKAGE_DIR]
+
+FIXTURES_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)),
+                            'fixtures')
+
+
+@pytest.fixture
+def logger(tmp_path):
+    from yt_scraper.logger import Logger
+    logger = Logger(str(tmp_path / 'log.log'), background=False)
+    yield logger
+    logger.close()
@@ -0,0 +1,38 @@
+import json
+
+from yt_scraper.compiled_inputs import load_channels, load_states
+
+
+def test_load_channels(tmp_path, logger):
+    source = tmp_path / 'data.json'
+    source.write_text('{}', encoding='utf-8')
+    channels = {'0': {'channel': 'Unique Civil'}, '1': {'channel': 2048},
+                '2': {'channel': 2048.0}, '3': {'channel': float('nan')},
+                '4': {'channel': None}, '5': {}}
+    expected = {'0': {'channel': 'Unique Civil'}, '1': {'channel': '2048'},
+                '2': {'channel': '2048'}, '3': {'channel': None},
+                '4': {'channel': None}, '5': {'channel': None}}
+    cache_dir = str(tmp_path / 'cache')
+    # Compiled from the source, then read from the cache.
+    assert load_channels(str(source), cache_dir, lambda: channels,
+                         logger) == expected
+    assert load_channels(str(source), cache_dir, lambda: {},
+                         logger) == expected
+
+
+def test_load_states_cache_refreshed(tmp_path, logger):
+    source = tmp_path / 'cities_by_states.json'
+    source.write_text(json.dumps({'uttar pradesh': ['lucknow']}),
+                      encoding='utf-8')
+    cache_dir = str(tmp_path / 'cache')
+
+    def read_source():
+        return json.loads(source.read_text(encoding='utf-8'))
+
+    assert load_states(str(source), cache_dir, read_source,
+                       logger) == {'uttar pradesh': ['lucknow']}
+    # A changed source is compiled again.
+    source.write_text(json.dumps({'bihar': ['patna', 'gaya']}),
+                      encoding='utf-8')
+    assert load_states(str(source), cache_dir, read_source,
+                       logger) == {'bihar': ['patna', 'gaya']}
@@ -0,0 +1,214 @@
+import asyncio
+import contextlib
+import os
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs
+
+import pytest
+
+from conftest import FIXTURES_DIR
+from yt_scraper.exceptions import NoResultsException
+from yt_scraper.http_engine import HttpEngine, parse_about_page, search_link
+from yt_scraper.scheduler import FetchScheduler
+
+
+# The saved pages served by the stub server, by search query or path.
+SEARCH_PAGES = {'Unique+Civil': 'search_page.html',
+                'Nothing+Here': 'no_results_page.html'}
+PAGES = {'/@UniqueCivil/about': 'about_page.html'}
+
+CHANNEL_FIELDS = {'application_name', 'application_link', 'channel_link',
+                  'channel_name', 'subscriber_count', 'videos_count',
+                  'channel_handle', 'description', 'other_links',
+                  'joined_on', 'total_views'}
+
+INSTAGRAM_LINK = ('https://www.youtube.com/redirect?event=channel_description'
+                  '&q=https%3A%2F%2Fwww.instagram.com%2Funiquecivil')
+
+
+def read_fixture(name):
+    with open(os.path.join(FIXTURES_DIR, name), 'r', encoding='utf-8') as file:
+        return file.read()
+
+
+class SavedPagesHandler(BaseHTTPRequestHandler):
+
+    def do_GET(self):
+        path, _, query = self.path.partition('?')
+        if path == '/results':
+            params = dict(param.split('=', 1) for param in query.split('&'))
+            name = SEARCH_PAGES.get(params.get('search_query'))
+        else:
+            name = PAGES.get(path)
+        if name is None:
+            self.send_error(404)
+            return
+        body = read_fixture(name).encode('utf-8')
+        self.send_response(200)
+        self.send_header('Content-Type', 'text/html; charset=utf-8')
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass
+
+
+class SlowPagesHandler(SavedPagesHandler):
+    """
+    Serve the saved pages after a delay (the delays of the successive
+    requests, the last one repeated), and record the requests in flight.
+    """
+
+    def do_GET(self):
+        cls = type(self)
+        with cls.lock:
+            cls.times.append(time.monotonic())
+            delay = cls.delays[min(len(cls.times), len(cls.delays)) - 1]
+            cls.in_flight += 1
+            cls.peak = max(cls.peak, cls.in_flight)
+        try:
+            time.sleep(delay)
+            super().do_GET()
+        finally:
+            with cls.lock:
+                cls.in_flight -= 1
+
+
+@contextlib.contextmanager
+def serving(handler):
+    server = ThreadingHTTPServer(('127.0.0.1', 0), handler)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    try:
+        yield 'http://127.0.0.1:{}'.format(server.server_address[1])
+    finally:
+        server.shutdown()
+        server.server_close()
+
+
+@pytest.fixture
+def base_url():
+    with serving(SavedPagesHandler) as url:
+        yield url
+
+
+@pytest.fixture
+def slow_pages():
+    """
+    Serve the saved pages with the given delays, and return the server's url
+    and its handler.
+    """
+    with contextlib.ExitStack() as stack:
+
+        def serve(*delays):
+            handler = type('SlowPagesHandler', (SlowPagesHandler,),
+                           {'delays': delays, 'lock': threading.Lock(),
+                            'times': [], 'in_flight': 0, 'peak': 0})
+            return stack.enter_context(serving(handler)), handler
+
+        yield serve
+
+
+def fetch_all(scheduler, url, count):
+    async def on_item(key, value):
+        await scheduler.fetch(url, 5)
+
+    asyncio.run(scheduler.run({str(key): None for key in range(count)},
+                              on_item))
+
+
+@pytest.mark.parametrize('channel', ['AT&T News', 'C# + C++ #1', '100% Hindi',
+                                     'हिंदी समाचार'])
+def test_search_link_quoted(channel):
+    _, _, query = search_link(channel).partition('?')
+    params = parse_qs(query)
+    assert params['search_query'] == [channel]
+    assert params['sp'] == ['EgIQAg%3D%3D']
+
+
+def test_parse_about_page_links(logger):
+    channel_data = parse_about_page(read_fixture('about_page.html'), '1',
+                                    'https://www.youtube.com/@UniqueCivil',
+                                    logger)
+    # Each link once, without the favicons.
+    assert channel_data['other_links'] == [INSTAGRAM_LINK,
+                                           'https://uniquecivil.in/']
+
+
+def test_extract_channel(logger, base_url):
+    engine = HttpEngine(logger, base_url=base_url)
+    channel_data = engine.extract_channel('1', 'Unique Civil')
+    assert set(channel_data) == CHANNEL_FIELDS
+    assert channel_data['channel_link'] == base_url + '/@UniqueCivil'
+    assert channel_data['application_link'].startswith(
+        base_url + '/results?search_query=Unique+Civil')
+    assert channel_data['channel_name'] == 'Unique Civil'
+    assert channel_data['channel_handle'] == '@UniqueCivil'
+    assert channel_data['subscriber_count'] == '34.7K subscribers'
+    assert channel_data['videos_count'] == '336 videos'
+    assert channel_data['joined_on'] == 'Dec 22, 2020'
+    assert channel_data['total_views'] == '893,591 views'
+    assert channel_data['description'].startswith('Civil engineering')
+    assert channel_data['other_links'] == [INSTAGRAM_LINK,
+                                           'https://uniquecivil.in/']
+
+
+def test_extract_channel_no_results(logger, base_url):
+    engine = HttpEngine(logger, base_url=base_url)
+    with pytest.raises(NoResultsException):
+        engine.extract_channel('2', 'Nothing Here')
+
+
+def test_scrapper_base_url(logger, base_url):
+    from yt_scraper.locator import Scrapper
+    scrapper = Scrapper({'1': {'channel': 'Unique Civil'},
+                         '2': {'channel': 'Missing Channel'}},
+                        {'Uttar Pradesh': ['Lucknow']}, logger=logger,
+                        engine='http', base_url=base_url, max_attempts=1)
+    scrapper.scrape()
+    assert set(scrapper.scrapped_channels['1']) == CHANNEL_FIELDS
+    # The search page of the second channel is missing (HTTP 404).
+    assert set(scrapper.unscrapped_channels) == {'2'}
+
+
+@pytest.mark.parametrize('concurrency, per_host, peak', [(4, None, 4),
+                                                         (4, 2, 2)])
+def test_scheduler_requests_in_flight(logger, slow_pages, concurrency,
+                                      per_host, peak):
+    url, handler = slow_pages(0.1)
+    scheduler = FetchScheduler(logger, concurrency=concurrency,
+                               per_host=per_host, rate=1000, base_url=url)
+    fetch_all(scheduler, url + '/@UniqueCivil/about', 12)
+    assert len(handler.times) == 12
+    assert handler.peak == peak
+
+
+def test_scheduler_rate(logger, slow_pages):
+    url, handler = slow_pages(0)
+    scheduler = FetchScheduler(logger, concurrency=8, rate=5, base_url=url)
+    start = time.monotonic()
+    fetch_all(scheduler, url + '/@UniqueCivil/about', 8)
+    # A burst of 5 requests, then one request every 0.2 second.
+    times = sorted(handler.times)
+    assert all(times[number] - start >= (number - 4) * 0.2
+               for number in range(5, 8))
+
+
+@pytest.mark.parametrize('max_attempts, scrapped', [(1, False), (2, True)])
+def test_scheduler_deadline(logger, slow_pages, max_attempts, scrapped):
+    from yt_scraper.locator import Scrapper
+    # The first search is too slow, the next requests are not.
+    url, handler = slow_pages(1, 0)
+    scrapper = Scrapper({'1': {'channel': 'Unique Civil'}},
+                        {'Uttar Pradesh': ['Lucknow']}, logger=logger,
+                        engine='async', base_url=url,
+                        max_attempts=max_attempts, backoff=0.001)
+    scrapper.scheduler.search_deadline = 0.2
+    scrapper.scrape()
+    # The timed out search is retried, until the last attempt.
+    assert ('1' in scrapper.scrapped_channels) is scrapped
+    assert ('1' in scrapper.unscrapped_channels) is not scrapped
+    assert len(handler.times) == (3 if scrapped else 1)
@@ -0,0 +1,112 @@
+import json
+
+import pytest
+
+from yt_scraper.journal import (Journal, append_to_json_object,
+                                iter_json_object)
+
+
+@pytest.fixture
+def appended_file(tmp_path):
+    file_name = str(tmp_path / 'channels.json')
+    append_to_json_object(file_name, {'1': {'channel': 'a'},
+                                      '2': {'links': ['x"}', 2.5e3]}})
+    append_to_json_object(file_name, {'1': {'channel': 'b'},
+                                      '3': 12345678901234567890})
+    return file_name
+
+
+@pytest.mark.parametrize('chunk_size', [1, 2, 7, 1 << 20])
+def test_iter_json_object_last_value_wins(appended_file, chunk_size):
+    items = list(iter_json_object(appended_file, chunk_size))
+    with open(appended_file, 'r', encoding='utf-8') as json_file:
+        expected = json.load(json_file)
+    assert len(items) == len(expected) == 3
+    assert dict(items) == expected
+    assert dict(items)['1'] == {'channel': 'b'}
+
+
+@pytest.mark.parametrize('chunk_size', [1, 2, 3, 7, 9, 1 << 20])
+def test_iter_json_object_numbers(tmp_path, chunk_size):
+    file_name = tmp_path / 'numbers.json'
+    text = ('{"a": 12.5, "b": 1e-3, "c": [-2.5E+10, 0.125], '
+            '"d": 7, "e": 3.0e2}')
+    file_name.write_text(text, encoding='utf-8')
+    assert dict(iter_json_object(str(file_name), chunk_size)) == json.loads(
+        text)
+
+
+def test_iter_json_object_empty(tmp_path):
+    file_name = tmp_path / 'empty.json'
+    file_name.write_text('{ }', encoding='utf-8')
+    assert list(iter_json_object(str(file_name), 1)) == []
+
+
+def test_iter_json_object_truncated(tmp_path):
+    file_name = tmp_path / 'truncated.json'
+    file_name.write_text('{"1": {"channel": "a"}', encoding='utf-8')
+    with pytest.raises(ValueError):
+        list(iter_json_object(str(file_name), 4))
+
+
+def test_journal_truncated_line(tmp_path):
+    path = str(tmp_path / 'journal.jsonl')
+    journal = Journal(path)
+    journal.append('1', 'scrapped', {'channel_link': 'l'})
+    journal.append('2', 'unscrapped', {'channel': 'b'})
+    journal.close()
+    # A crash while writing the third record.
+    with open(path, 'a', encoding='utf-8') as journal_file:
+        journal_file.write('{"chid": "3", "bucket": "scr')
+    journal = Journal(path)
+    assert journal.load() == {'1': ('scrapped', {'channel_link': 'l'}),
+                              '2': ('unscrapped', {'channel': 'b'})}
+    # The records of the resumed run are kept, the last one winning.
+    journal.append('2', 'scrapped', {'channel_link': 'm'})
+    journal.close()
+    assert journal.load() == {'1': ('scrapped', {'channel_link': 'l'}),
+                              '2': ('scrapped', {'channel_link': 'm'})}
+
+
+def test_resumed_run(tmp_path, logger, monkeypatch):
+    from yt_scraper.locator import Scrapper
+
+    class Driver():
+
+        def execute(self, *args):
+            pass
+
+        def quit(self):
+            pass
+
+    extracted = []
+
+    def extract_channel(scrapper, chid, channel, driver):
+        extracted.append(chid)
+        return {'application_name': channel, 'channel_link': chid,
+                'description': '', 'subscriber_count': '1 subscriber',
+                'videos_count': '1 video', 'total_views': '1 view',
+                'other_links': []}
+
+    monkeypatch.setattr(Scrapper, '_new_driver',
+                        lambda scrapper: scrapper.command_counter.wrap(
+                            Driver()))
+    monkeypatch.setattr(Scrapper, '_extract_channel', extract_channel)
+    journal = Journal(str(tmp_path / 'journal.jsonl'))
+    journal.append('1', 'scrapped', {'application_name': 'a',
+                                     'channel_link': 'journaled'})
+    journal.append('2', 'ignored', {'channel': 'b'})
+    journal.append('3', 'unscrapped', {'channel': 'c', 'reason': 'Time out'})
+    journal.close()
+    scrapper = Scrapper({chid: {'channel': channel}
+                         for chid, channel in zip('1234', 'abcd')},
+                        {'Uttar Pradesh': ['Lucknow']}, logger=logger,
+                        journal=journal)
+    scrapper.scrape()
+    # The scrapped and ignored channels are skipped, the unscrapped one is
+    # scrapped again.
+    assert extracted == ['3', '4']
+    assert scrapper.scrapped_channels['1']['channel_link'] == 'journaled'
+    assert set(scrapper.scrapped_channels) == {'1', '3', '4'}
+    assert set(scrapper.ignored_channels) == {'2'}
+    assert scrapper.unscrapped_channels == {}
@@ -0,0 +1,33 @@
+import json
+
+import pytest
+
+from yt_scraper.logger import Logger
+
+
+@pytest.fixture
+def json_logger(tmp_path):
+    logger = Logger(str(tmp_path / 'log.log'), json_out=str(tmp_path / 'log.jsonl'),
+                    background=False)
+    yield logger
+    logger.close()
+
+
+def test_lazy_message_and_fields(json_logger, tmp_path):
+    json_logger.log("Channel {} :: {} page load(s)", 'INFO', args=('3', 2),
+                    chid='3', page_loads=2)
+    json_logger.close()
+    assert (tmp_path / 'log.log').read_text(encoding='utf-8').endswith(
+        "Channel 3 :: 2 page load(s)\n")
+    record = json.loads((tmp_path / 'log.jsonl').read_text(encoding='utf-8'))
+    assert record['message'] == "Channel 3 :: 2 page load(s)"
+    assert (record['chid'], record['page_loads']) == ('3', 2)
+
+
+def test_unknown_field(json_logger):
+    with pytest.raises(TypeError, match='excluded_datetime'):
+        json_logger.log("Channel {} :: skipped", args=('3',),
+                        excluded_datetime=True)
+    # Even when the record is filtered out.
+    with pytest.raises(TypeError):
+        json_logger.log("Channel {} :: skipped", 0, args=('3',), chd='3')
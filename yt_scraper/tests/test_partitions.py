@@ -0,0 +1,20 @@
+import pandas as pd
+
+from yt_scraper.partitions import PartitionWriter, list_partitions, write_partition
+
+
+def test_partitions_of_the_same_second(tmp_path):
+    output_dir = str(tmp_path)
+    dataframe = pd.DataFrame({'Application number': ['1']})
+    # Two runs (or shards) saving their rows at once.
+    file_names = [write_partition(dataframe, output_dir) for _ in range(2)]
+    writer = PartitionWriter(output_dir, rows_per_partition=1)
+    for _ in range(2):
+        writer.write(dataframe)
+    file_names += writer.close()
+    assert len(set(file_names)) == 4
+    assert sorted(list_partitions(output_dir)) == sorted(file_names)
+    # The parts of a streamed run stay in order.
+    parts = [name for name in list_partitions(output_dir)
+             if name in writer.file_names]
+    assert parts == writer.file_names
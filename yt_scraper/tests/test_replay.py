@@ -0,0 +1,53 @@
+import pytest
+
+from test_http_engine import INSTAGRAM_LINK, read_fixture
+from yt_scraper.replay import extract_chunk, replay_snapshots
+from yt_scraper.snapshots import SnapshotArchive
+
+
+# The fields Scrapper._read_channel_page reads from a channel page.
+CHANNEL_PAGE_FIELDS = {'channel_link', 'channel_name', 'subscriber_count',
+                       'videos_count', 'channel_handle', 'description',
+                       'other_links', 'joined_on', 'total_views'}
+
+CHANNEL_LINK = 'https://www.youtube.com/@UniqueCivil'
+
+
+@pytest.fixture
+def archive(tmp_path):
+    archive = SnapshotArchive(str(tmp_path / 'snapshots'))
+    archive.put('1', CHANNEL_LINK, read_fixture('channel_page.html'))
+    archive.put('2', 'https://www.youtube.com/@Broken', '<html></html>')
+    return archive
+
+
+def test_replay_snapshots(archive):
+    snapshots = archive.latest()
+    # The snapshot's url is the channel_link of the scrapped channel.
+    assert snapshots['1']['url'] == CHANNEL_LINK
+    digest, broken_digest = snapshots['1']['digest'], snapshots['2']['digest']
+    chunks = list(replay_snapshots(archive.path, [digest, broken_digest,
+                                                  digest], processes=1))
+    assert [set(chunk) for chunk in chunks] == [{digest, broken_digest}]
+    channel_data, reason = chunks[0][digest]
+    assert reason is None
+    channel_data = {'channel_link': snapshots['1']['url'], **channel_data}
+    assert set(channel_data) == CHANNEL_PAGE_FIELDS
+    assert channel_data == {
+        'channel_link': CHANNEL_LINK,
+        'channel_name': 'Unique Civil',
+        'subscriber_count': '34.7K subscribers',
+        'videos_count': '336 videos',
+        'channel_handle': '@UniqueCivil',
+        'description': 'Civil engineering classes\nCall 9876543210',
+        'other_links': [INSTAGRAM_LINK, 'https://uniquecivil.in/'],
+        'joined_on': 'Dec 22, 2020',
+        'total_views': '893,591 views'}
+    # A page without the about dialog is reported, not raised.
+    assert chunks[0][broken_digest] == (None, "Metadata extraction failure")
+
+
+def test_extract_chunk_missing_object(archive, monkeypatch):
+    import yt_scraper.replay as replay
+    monkeypatch.setattr(replay, '_archive', archive)
+    assert extract_chunk(['0' * 64]) == {'0' * 64: (None, 'FileNotFoundError')}
@@ -0,0 +1,163 @@
+import threading
+import time
+
+import pytest
+from selenium.common.exceptions import (InvalidSessionIdException,
+                                        SessionNotCreatedException,
+                                        WebDriverException)
+
+from yt_scraper.retries import RetryScheduler, backoff_delay
+
+
+class NoJitter():
+
+    def uniform(self, low, high):
+        return high
+
+
+def drain(scheduler):
+    """
+    Get the ready items, each handled at once.
+    """
+    items = []
+    while (item := scheduler.get()) is not None:
+        items.append(item)
+        scheduler.task_done()
+    return items
+
+
+def test_backoff_delay():
+    rnd = NoJitter()
+    assert [backoff_delay(attempt, 1.0, 5.0, rnd)
+            for attempt in range(5)] == [1.0, 2.0, 4.0, 5.0, 5.0]
+
+
+def test_items_in_order():
+    scheduler = RetryScheduler({'1': 'a', '2': 'b', '3': 'c'})
+    assert drain(scheduler) == [('1', 'a', 0), ('2', 'b', 0), ('3', 'c', 0)]
+    assert len(scheduler) == 0
+
+
+def test_retried_items_by_ready_time():
+    scheduler = RetryScheduler({'1': 'a', '2': 'b', '3': 'c'}, base=0.02,
+                               rnd=NoJitter())
+    first, second, third = (scheduler.get() for _ in range(3))
+    start = time.monotonic()
+    # The first failure waits longer than the second one.
+    assert scheduler.retry('1', 'a', 1) == pytest.approx(0.04)
+    assert scheduler.retry('2', 'b', 0) == pytest.approx(0.02)
+    for _ in range(3):
+        scheduler.task_done()
+    assert drain(scheduler) == [('2', 'b', 1), ('1', 'a', 2)]
+    assert time.monotonic() - start >= 0.04
+    assert scheduler.retries == 2
+
+
+def test_attempts_cap():
+    scheduler = RetryScheduler({'1': 'a'}, max_attempts=2, base=0.001)
+    key, value, attempt = scheduler.get()
+    assert scheduler.retry(key, value, attempt) is not None
+    scheduler.task_done()
+    key, value, attempt = scheduler.get()
+    assert attempt == 1
+    # The last attempt is never retried.
+    assert scheduler.retry(key, value, attempt) is None
+    scheduler.task_done()
+    assert scheduler.get() is None
+    assert scheduler.retries == 1
+
+
+def test_get_waits_for_the_items_in_flight():
+    scheduler = RetryScheduler({'1': 'a'}, base=0.001)
+    item = scheduler.get()
+    got = []
+    waiter = threading.Thread(target=lambda: got.append(scheduler.get()))
+    waiter.start()
+    # No item is ready, but the one in flight may still be retried.
+    waiter.join(0.1)
+    assert waiter.is_alive()
+    scheduler.retry(*item)
+    scheduler.task_done()
+    waiter.join(1)
+    assert got == [('1', 'a', 1)]
+    scheduler.task_done()
+    assert scheduler.get() is None
+
+
+def test_worker_browser_launch_failure(logger, monkeypatch):
+    from yt_scraper.locator import Scrapper
+
+    class Driver():
+
+        def execute(self, *args):
+            pass
+
+        def quit(self):
+            pass
+
+    launches = []
+
+    def new_driver(scrapper):
+        launches.append(len(launches))
+        if len(launches) == 1:
+            raise SessionNotCreatedException("no browser")
+        return scrapper.command_counter.wrap(Driver())
+
+    def extract_channel(scrapper, chid, channel, driver):
+        return {'application_name': channel, 'channel_link': 'l',
+                'description': '', 'subscriber_count': '1 subscriber',
+                'videos_count': '1 video', 'total_views': '1 view',
+                'other_links': []}
+
+    monkeypatch.setattr(Scrapper, '_new_driver', new_driver)
+    monkeypatch.setattr(Scrapper, '_extract_channel', extract_channel)
+    scrapper = Scrapper({'1': {'channel': 'a'}, '2': {'channel': 'b'}},
+                        {'Uttar Pradesh': ['Lucknow']}, logger=logger,
+                        backoff=0.001)
+    scrapper.scrape()
+    # The channel of the failed launch is retried with the next browser.
+    assert len(launches) == 2
+    assert set(scrapper.scrapped_channels) == {'1', '2'}
+    assert scrapper.unscrapped_channels == {}
+
+
+@pytest.mark.parametrize('error', [
+    InvalidSessionIdException("invalid session id"),
+    WebDriverException("unknown error: chrome not reachable"),
+    WebDriverException("disconnected: not connected to DevTools")])
+def test_worker_dead_browser_replaced(logger, monkeypatch, error):
+    from yt_scraper.locator import Scrapper
+
+    class Driver():
+
+        def execute(self, *args):
+            pass
+
+        def quit(self):
+            pass
+
+    launches = []
+
+    def new_driver(scrapper):
+        launches.append(len(launches))
+        return scrapper.command_counter.wrap(Driver())
+
+    def extract_channel(scrapper, chid, channel, driver):
+        # The first browser dies while extracting the first channel.
+        if len(launches) == 1:
+            raise error
+        return {'application_name': channel, 'channel_link': 'l',
+                'description': '', 'subscriber_count': '1 subscriber',
+                'videos_count': '1 video', 'total_views': '1 view',
+                'other_links': []}
+
+    monkeypatch.setattr(Scrapper, '_new_driver', new_driver)
+    monkeypatch.setattr(Scrapper, '_extract_channel', extract_channel)
+    scrapper = Scrapper({'1': {'channel': 'a'}, '2': {'channel': 'b'}},
+                        {'Uttar Pradesh': ['Lucknow']}, logger=logger,
+                        backoff=0.001)
+    scrapper.scrape()
+    # The dead browser is replaced, and its channel retried.
+    assert len(launches) == 2
+    assert set(scrapper.scrapped_channels) == {'1', '2'}
+    assert scrapper.unscrapped_channels == {}
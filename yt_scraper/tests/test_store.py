@@ -0,0 +1,96 @@
+import json
+
+import pytest
+
+from yt_scraper.store import ResultStore
+
+
+CHANNELS = {chid: {'channel': channel} for chid, channel in zip('1234', 'abcd')}
+
+
+def raw_channel(chid, channel):
+    return {'application_name': channel, 'channel_link': 'link ' + chid,
+            'channel_name': channel.upper(), 'channel_handle': '@' + channel,
+            'description': 'Call 9876543210', 'subscriber_count': '1 subscriber',
+            'videos_count': '1 video', 'total_views': '1 view',
+            'other_links': ['https://t.me/' + channel]}
+
+
+def cleaned_channel(chid, channel):
+    return {**raw_channel(chid, channel), 'city': 'Lucknow',
+            'state': 'Uttar Pradesh', 'phone_numbers': ['9876543210'],
+            'telegram_links': ['https://t.me/' + channel],
+            'instagram_links': [], 'other_links': []}
+
+
+@pytest.fixture
+def store(tmp_path):
+    store = ResultStore(str(tmp_path / 'store.sqlite3'))
+    yield store
+    store.close()
+
+
+def test_upsert_moves_the_channel(store):
+    store.mark({'1': {'channel': 'a', 'reason': 'Time out'}}, 'unscrapped')
+    assert dict(store.iter_queue('unscrapped')) == {
+        '1': {'channel': 'a', 'reason': 'Time out'}}
+    # Saved twice, the channel is scrapped once, without the failure reason.
+    for _ in range(2):
+        store.upsert_raw({'1': raw_channel('1', 'a')})
+        store.upsert_cleaned({'1': cleaned_channel('1', 'a')})
+    assert store.status_counts() == {'scrapped': 1}
+    assert dict(store.iter_queue('scrapped')) == {'1': {'channel': 'a'}}
+    assert list(store.iter_channels()) == [('1', cleaned_channel('1', 'a'))]
+    assert store.connection.execute(
+        "SELECT COUNT(*) FROM contacts").fetchone() == (1,)
+    # Marked again, it moves to the other bucket.
+    store.mark({'1': {'channel': 'a'}}, 'ignored')
+    assert store.status_counts() == {'ignored': 1}
+
+
+def test_pending_channels_after_a_partial_run(store):
+    store.enqueue(CHANNELS)
+    store.upsert_raw({'1': raw_channel('1', 'a')})
+    store.mark({'2': {'channel': 'b', 'reason': 'Time out'}}, 'unscrapped')
+    store.mark({'3': {'channel': 'c'}}, 'ignored')
+    # Enqueued again, the channels keep their status.
+    store.enqueue(CHANNELS)
+    assert store.pending_channels() == {'2': {'channel': 'b'},
+                                        '4': {'channel': 'd'}}
+
+
+def test_export_round_trip(store, tmp_path, logger):
+    from yt_scraper.locator import export_store, read_unscrapped_channels
+    store.enqueue(CHANNELS)
+    scrapped = {chid: raw_channel(chid, CHANNELS[chid]['channel'])
+                for chid in '12'}
+    cleaned = {chid: cleaned_channel(chid, CHANNELS[chid]['channel'])
+               for chid in '12'}
+    store.upsert_raw(scrapped)
+    store.upsert_cleaned(cleaned)
+    store.mark({'3': {'channel': 'c', 'reason': 'Time out'}}, 'unscrapped')
+    output_dir = str(tmp_path / 'output')
+    export_store(store, output_dir, logger)
+
+    def read(file_name):
+        with open(f"{output_dir}\\{file_name}", 'r',
+                  encoding='utf-8') as json_file:
+            return json.load(json_file)
+
+    assert read('uncleaned_scrapped_channels.json') == scrapped
+    assert read('cleaned_scrapped_channels.json') == cleaned
+    assert read('ignored_channels.json') == {}
+    # A row for each phone number of the cleaned channels.
+    import pandas as pd
+    assert len(pd.read_excel(f"{output_dir}\\output.xlsx")) == 2
+    # The channels left are read back by the next run.
+    unscrapped = read_unscrapped_channels(output_dir, logger)
+    assert unscrapped == {'3': {'channel': 'c', 'reason': 'Time out'},
+                          '4': {'channel': 'd'}}
+    next_store = ResultStore(str(tmp_path / 'next.sqlite3'))
+    try:
+        next_store.enqueue(unscrapped)
+        assert next_store.pending_channels() == {'3': {'channel': 'c'},
+                                                 '4': {'channel': 'd'}}
+    finally:
+        next_store.close()
@@ -0,0 +1,165 @@
+import time
+
+import pytest
+
+from yt_scraper.work_queue import WorkQueue
+
+
+CHANNELS = {'1': {'channel': 'a'}, '2': {'channel': 'b'}}
+
+
+@pytest.fixture
+def queue_file(tmp_path):
+    return str(tmp_path / 'work_queue.sqlite3')
+
+
+@pytest.fixture
+def new_queue(queue_file, logger):
+    queues = []
+
+    def new_queue(owner, lease_seconds=0.05, max_leases=5):
+        work_queue = WorkQueue(queue_file, lease_seconds, owner=owner,
+                               max_leases=max_leases, logger=logger)
+        queues.append(work_queue)
+        return work_queue
+
+    yield new_queue
+    for work_queue in queues:
+        work_queue.close()
+
+
+def test_lease_and_ack(new_queue):
+    first = new_queue('first', lease_seconds=60)
+    first.enqueue(CHANNELS)
+    # Enqueued again by another process, nothing changes.
+    second = new_queue('second', lease_seconds=60)
+    second.enqueue(CHANNELS)
+    assert first.lease(1) == {'1': {'channel': 'a'}}
+    assert second.lease(10) == {'2': {'channel': 'b'}}
+    assert second.lease(10) == {}
+    assert first.ack(['1']) == 1
+    assert first.counts() == {'done': 1, 'leased': 1}
+
+
+def test_expired_lease_reclaimed(new_queue):
+    crashed = new_queue('crashed')
+    crashed.enqueue(CHANNELS)
+    assert set(crashed.lease(10)) == {'1', '2'}
+    other = new_queue('other')
+    assert other.lease(10) == {}
+    time.sleep(0.1)
+    assert set(other.lease(10)) == {'1', '2'}
+    assert other.reclaimed == 2
+    # The channels taken over are acknowledged by their new owner only.
+    assert crashed.ack(['1', '2']) == 0
+    assert other.ack(['1', '2']) == 2
+    assert other.counts() == {'done': 2}
+
+
+def test_abandoned_after_max_leases(new_queue):
+    work_queue = new_queue('owner', max_leases=2)
+    work_queue.enqueue({'1': {'channel': 'a'}})
+    for _ in range(2):
+        assert work_queue.lease(10) == {'1': {'channel': 'a'}}
+        time.sleep(0.1)
+    assert work_queue.lease(10) == {}
+    assert work_queue.counts() == {'abandoned': 1}
+
+
+def test_release(new_queue):
+    work_queue = new_queue('owner', lease_seconds=60)
+    work_queue.enqueue(CHANNELS)
+    work_queue.lease(10)
+    work_queue.release()
+    assert work_queue.counts() == {'todo': 2}
+    # A released lease doesn't count toward max_leases.
+    assert set(new_queue('other', lease_seconds=60).lease(10)) == {'1', '2'}
+
+
+def test_heartbeat_keeps_the_leases(new_queue, monkeypatch, tmp_path):
+    owner = new_queue('owner', lease_seconds=0.3)
+    owner.enqueue(CHANNELS)
+    owner.lease(10)
+    heartbeat = owner.heartbeat
+    failures = []
+
+    def failing_heartbeat():
+        # The first renewal fails, the next ones are still done.
+        if not failures:
+            failures.append(1)
+            raise RuntimeError("database is locked")
+        return heartbeat()
+
+    monkeypatch.setattr(owner, 'heartbeat', failing_heartbeat)
+    owner.start_heartbeat(0.05)
+    time.sleep(0.6)
+    assert new_queue('other').lease(10) == {}
+    assert failures
+    log = (tmp_path / 'log.log').read_text(encoding='utf-8')
+    assert "The leases of owner could not be renewed." in log
+
+
+def test_failed_leased_again_by_the_next_run(new_queue):
+    work_queue = new_queue('owner', lease_seconds=60)
+    work_queue.enqueue(CHANNELS)
+    assert set(work_queue.lease(10)) == {'1', '2'}
+    assert work_queue.ack(['1']) + work_queue.fail(['2']) == 2
+    # The failed channel isn't leased again in the same pass ...
+    assert work_queue.lease(10) == {}
+    assert work_queue.counts() == {'done': 1, 'failed': 1}
+    # ... but once enqueued again by the next run, the done one staying done.
+    next_run = new_queue('next', lease_seconds=60)
+    next_run.enqueue(CHANNELS)
+    assert next_run.lease(10) == {'2': {'channel': 'b'}}
+    assert next_run.counts() == {'done': 1, 'leased': 1}
+
+
+def test_scrape_work_queue(new_queue, logger, monkeypatch, tmp_path):
+    from yt_scraper.locator import Scrapper, scrape_work_queue
+    from yt_scraper.store import ResultStore
+    from yt_scraper.waits import AdaptiveWaits
+
+    class Driver():
+
+        def execute(self, *args):
+            pass
+
+        def quit(self):
+            pass
+
+    def extract_channel(scrapper, chid, channel, driver):
+        if channel == 'b':
+            raise ValueError("no channel")
+        return {'application_name': channel, 'channel_link': 'l',
+                'description': '', 'subscriber_count': '1 subscriber',
+                'videos_count': '1 video', 'total_views': '1 view',
+                'other_links': []}
+
+    monkeypatch.setattr(Scrapper, '_new_driver',
+                        lambda scrapper: scrapper.command_counter.wrap(
+                            Driver()))
+    monkeypatch.setattr(Scrapper, '_extract_channel', extract_channel)
+    scrappers = []
+
+    def new_scrapper(**kwargs):
+        scrappers.append(Scrapper(
+            cities_by_states={'Uttar Pradesh': ['Lucknow']}, logger=logger,
+            max_attempts=1, waits=waits, **kwargs))
+        return scrappers[-1]
+
+    waits = AdaptiveWaits()
+    store = ResultStore(str(tmp_path / 'store.sqlite3'))
+    work_queue = new_queue('owner', lease_seconds=60)
+    work_queue.enqueue(CHANNELS)
+    try:
+        assert scrape_work_queue(work_queue, store, new_scrapper, logger,
+                                 1) == 2
+        assert store.status_counts() == {'scrapped': 1, 'unscrapped': 1}
+    finally:
+        store.close()
+    # The waits are shared by the scrappers of the batches.
+    assert [scrapper.waits for scrapper in scrappers] == [waits, waits]
+    # The unscrapped channel is leased again by the next run.
+    next_run = new_queue('next', lease_seconds=60)
+    next_run.enqueue(CHANNELS)
+    assert next_run.lease(10) == {'2': {'channel': 'b'}}
@@ -0,0 +1,133 @@
+import json
+import threading
+import time
+from collections import deque
+
+from selenium.common.exceptions import NoSuchElementException, TimeoutException
+
+
+# The timeouts used until enough durations are recorded (the former
+# long and short waits).
+DEFAULT_TIMEOUTS = {'search_results': 10,
+                    'no_results': 2,
+                    'tagline': 10,
+                    'about_dialog': 10,
+                    'direct_about': 10,
+                    'channel_page': 10}
+
+
+def percentile(values, q):
+    """
+    The q-th percentile of values (nearest rank).
+    """
+    ordered = sorted(values)
+    rank = max(0, min(len(ordered) - 1, round(q / 100 * len(ordered)) - 1))
+    return ordered[rank]
+
+
+def all_present(*locators):
+    """
+    Condition met when all the locators are present, returning the elements.
+    """
+    def _predicate(driver):
+        try:
+            return [driver.find_element(*locator) for locator in locators]
+        except NoSuchElementException:
+            return False
+    return _predicate
+
+
+class AdaptiveWaits():
+    """
+    Waits that record how long each readiness condition takes, and set its
+    timeout to a rolling high percentile of the recorded durations.
+
+    The timeout of a condition is `factor` times the `q`-th percentile of
+    its last `window` durations, kept within [min_timeout, max_timeout].
+    Until `min_samples` durations are recorded, the default timeout is used.
+    """
+
+    def __init__(self, defaults=None, q=95, factor=2.0, window=200,
+                 min_samples=20, min_timeout=1.0, max_timeout=30.0,
+                 poll_frequency=0.1) -> None:
+        self.defaults = {**DEFAULT_TIMEOUTS, **(defaults or {})}
+        self.q = q
+        self.factor = factor
+        self.window = window
+        self.min_samples = min_samples
+        self.min_timeout = min_timeout
+        self.max_timeout = max_timeout
+        self.poll_frequency = poll_frequency
+        self._durations: dict[str, deque] = {}
+        self._timeouts: dict[str, int] = {}
+        self._lock = threading.Lock()
+
+    def timeout(self, name):
+        """
+        The current timeout of a condition.
+        """
+        with self._lock:
+            durations = list(self._durations.get(name, []))
+        if len(durations) < self.min_samples:
+            return self.defaults.get(name, 10)
+        adapted = percentile(durations, self.q) * self.factor
+        return min(self.max_timeout, max(self.min_timeout, adapted))
+
+    def _record(self, name, duration, timed_out=False):
+        # A timed out wait is recorded with its timeout, so that the
+        # timeout grows when the condition gets slower.
+        with self._lock:
+            if timed_out:
+                self._timeouts[name] = self._timeouts.get(name, 0) + 1
+            (self._durations.setdefault(name, deque(maxlen=self.window))
+                            .append(duration))
+
+    def until(self, driver, name, condition):
+        """
+        Wait for the condition, and record how long it took.
+        """
+        from selenium.webdriver.support.ui import WebDriverWait
+        timeout = self.timeout(name)
+        wait = WebDriverWait(driver, timeout,
+                             poll_frequency=self.poll_frequency)
+        start = time.perf_counter()
+        try:
+            result = wait.until(condition)
+        except TimeoutException:
+            self._record(name, timeout, timed_out=True)
+            raise
+        self._record(name, time.perf_counter() - start)
+        return result
+
+    def until_all(self, driver, name, *locators):
+        """
+        Wait for several locators together, and return their elements.
+        """
+        return self.until(driver, name, all_present(*locators))
+
+    def stats(self) -> dict:
+        """
+        The statistics of each condition (durations in seconds).
+        """
+        with self._lock:
+            names = set(self._durations) | set(self._timeouts)
+            durations = {name: list(self._durations.get(name, []))
+                         for name in names}
+            timeouts = dict(self._timeouts)
+        stats = {}
+        for name in sorted(names):
+            values = durations[name]
+            stats[name] = {'count': len(values),
+                           'timeouts': timeouts.get(name, 0),
+                           'p50': percentile(values, 50) if values else None,
+                           'p95': percentile(values, 95) if values else None,
+                           'max': max(values) if values else None,
+                           'timeout': self.timeout(name)}
+        return stats
+
+    def save(self, file_name):
+        """
+        Write the statistics to a json file.
+        """
+        with open(file_name, 'w+', encoding='utf-8') as output_file:
+            json.dump(self.stats(), output_file, indent=3)
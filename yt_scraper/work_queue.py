@@ -0,0 +1,206 @@
+import os
+import socket
+import sqlite3
+import threading
+import time
+import traceback
+
+from yt_scraper.logger import Logger
+
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS work (
+    chid TEXT PRIMARY KEY,
+    channel TEXT,
+    status TEXT,
+    owner TEXT,
+    expires REAL,
+    leases INTEGER DEFAULT 0
+);
+CREATE INDEX IF NOT EXISTS work_status ON work (status, expires);
+"""
+
+
+def default_owner():
+    """
+    The name of this scrapper process in the queue.
+    """
+    return f"{socket.gethostname()}-{os.getpid()}"
+
+
+class WorkQueue():
+    """
+    Queue of the channels shared by any number of scrapper processes,
+    through a SQLite file. The channels are leased in batches:
+
+        channels = queue.lease(100)     # chid -> {'channel': name}
+        ...                             # scrape and save them
+        queue.ack(channels)
+
+    A lease expires after lease_seconds, unless it's renewed by the
+    heartbeat thread (see start_heartbeat), and its channels are then
+    leased again by the next process asking for some: a crashed or stuck
+    process doesn't hold up the others. A channel leased max_leases times
+    without being acknowledged is set aside ('abandoned').
+
+    The channels that failed are set aside too ('failed', see fail) for the
+    rest of the pass, and put back in the queue when they're enqueued again
+    (by the next run).
+
+    The file may be shared by several machines through a network file
+    system, if its locks are reliable.
+    """
+
+    def __init__(self, path, lease_seconds=300.0, owner=None,
+                 max_leases=5, logger=None) -> None:
+        self.path = path
+        self.logger = logger or Logger()
+        self.lease_seconds = lease_seconds
+        self.owner = owner or default_owner()
+        self.max_leases = max_leases
+        # The expired leases taken over by this process.
+        self.reclaimed = 0
+        self._lock = threading.Lock()
+        self._heartbeat = None
+        self._stop = threading.Event()
+        # The transactions are opened explicitly (BEGIN IMMEDIATE), and the
+        # other processes wait for the lock up to 30 s.
+        self.connection = sqlite3.connect(path, timeout=30,
+                                          isolation_level=None,
+                                          check_same_thread=False)
+        self.connection.execute("PRAGMA journal_mode=WAL")
+        self.connection.executescript(SCHEMA)
+
+    def _transaction(self, function, *args):
+        with self._lock:
+            self.connection.execute("BEGIN IMMEDIATE")
+            try:
+                result = function(*args)
+            except BaseException:
+                self.connection.execute("ROLLBACK")
+                raise
+            self.connection.execute("COMMIT")
+            return result
+
+    def enqueue(self, channels: dict[str, dict]):
+        """
+        Add channels (chid -> {'channel': name}) to the queue. The failed
+        and abandoned channels already in it are put back, the others are
+        left as they are.
+        """
+        rows = [(chid, channel.get('channel'), 'todo')
+                for chid, channel in channels.items()]
+        self._transaction(
+            self.connection.executemany,
+            "INSERT INTO work (chid, channel, status) VALUES (?, ?, ?) "
+            "ON CONFLICT (chid) DO UPDATE SET status = 'todo', owner = NULL, "
+            "expires = NULL, leases = 0 "
+            "WHERE status IN ('failed', 'abandoned')", rows)
+
+    def lease(self, size) -> dict[str, dict]:
+        """
+        Lease up to size channels (chid -> {'channel': name}), the ones
+        never leased and the expired ones. Empty when none is left.
+        """
+        def lease():
+            now = time.time()
+            # Set aside the channels of too many expired leases.
+            self.connection.execute(
+                "UPDATE work SET status = 'abandoned', owner = NULL "
+                "WHERE status = 'leased' AND expires < ? AND leases >= ?",
+                (now, self.max_leases))
+            rows = self.connection.execute(
+                "SELECT chid, channel, status FROM work "
+                "WHERE status = 'todo' OR (status = 'leased' AND expires < ?) "
+                "ORDER BY rowid LIMIT ?", (now, size)).fetchall()
+            self.connection.executemany(
+                "UPDATE work SET status = 'leased', owner = ?, expires = ?, "
+                "leases = leases + 1 WHERE chid = ?",
+                [(self.owner, now + self.lease_seconds, chid)
+                 for chid, _, _ in rows])
+            self.reclaimed += sum(status == 'leased' for _, _, status in rows)
+            return {chid: {'channel': channel} for chid, channel, _ in rows}
+        return self._transaction(lease)
+
+    def heartbeat(self):
+        """
+        Renew the leases of this process, and return their number.
+        """
+        return self._transaction(
+            lambda: self.connection.execute(
+                "UPDATE work SET expires = ? "
+                "WHERE owner = ? AND status = 'leased'",
+                (time.time() + self.lease_seconds, self.owner)).rowcount)
+
+    def ack(self, chids):
+        """
+        Set the channels leased by this process as done (their results are
+        saved), and return their number. A channel whose lease expired and
+        was taken over by another process is left to it.
+        """
+        return self._transaction(
+            lambda: self.connection.executemany(
+                "UPDATE work SET status = 'done', owner = NULL, expires = NULL "
+                "WHERE chid = ? AND owner = ? AND status = 'leased'",
+                [(chid, self.owner) for chid in chids]).rowcount)
+
+    def fail(self, chids):
+        """
+        Set aside the channels leased by this process that failed (they're
+        saved as unscrapped) until the next run enqueues them, and return
+        their number.
+        """
+        return self._transaction(
+            lambda: self.connection.executemany(
+                "UPDATE work SET status = 'failed', owner = NULL, "
+                "expires = NULL WHERE chid = ? AND owner = ? "
+                "AND status = 'leased'",
+                [(chid, self.owner) for chid in chids]).rowcount)
+
+    def release(self):
+        """
+        Put the channels leased by this process back to the queue.
+        """
+        self._transaction(
+            self.connection.execute,
+            "UPDATE work SET status = 'todo', owner = NULL, expires = NULL, "
+            "leases = leases - 1 WHERE owner = ? AND status = 'leased'",
+            (self.owner,))
+
+    def counts(self) -> dict[str, int]:
+        """
+        The number of channels of each status.
+        """
+        with self._lock:
+            return dict(self.connection.execute(
+                "SELECT status, COUNT(*) FROM work GROUP BY status"))
+
+    def start_heartbeat(self, interval=None):
+        """
+        Renew the leases every interval seconds (a third of the lease by
+        default) from a background thread, until close.
+        """
+        interval = interval or self.lease_seconds / 3
+
+        def beat():
+            while not self._stop.wait(interval):
+                # A failed renewal (e.g. the file locked for too long) is
+                # tried again at the next beat, before the leases expire.
+                try:
+                    self.heartbeat()
+                except Exception:
+                    self.logger.log(traceback.format_exc(limit=10), 'ERROR',
+                                    True)
+                    self.logger.log("The leases of {} could not be renewed.",
+                                    'WARNING', args=(self.owner,))
+
+        self._heartbeat = threading.Thread(target=beat, daemon=True,
+                                           name='work-queue-heartbeat')
+        self._heartbeat.start()
+
+    def close(self):
+        self._stop.set()
+        if self._heartbeat is not None:
+            self._heartbeat.join()
+            self._heartbeat = None
+        self.connection.close()